@@ -0,0 +1,222 @@
+"""
+Amazon HTTP Fetcher
+Reads the search results and product page with a pooled requests session
+(cookies persisted between runs) and lxml, so most Amazon lookups don't
+need a browser. Raises AmazonBlocked on a CAPTCHA/robot check so the
+caller can fall back to Selenium.
+"""
+import os
+import re
+import threading
+from http.cookiejar import LWPCookieJar
+from urllib.parse import quote_plus, urljoin, urlparse
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from bulk_extract import finalize_row, html_select, read_html_fields
+from host_rate_limiter import host_limiter
+
+AMAZON_BASE_URL = os.getenv('AMAZON_BASE_URL', 'https://www.amazon.com').rstrip('/')
+AMAZON_COOKIE_FILE = os.getenv('AMAZON_COOKIE_FILE',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), '.amazon_cookies'))
+AMAZON_HTTP_TIMEOUT = 10  # Seconds per page request
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+_ROBOT_CHECK_MARKERS = (
+    '/errors/validatecaptcha',
+    'enter the characters you see below',
+    'to discuss automated access to amazon data',
+    'sorry, we just need to make sure you\'re not a robot'
+)
+
+def _parse_rating(text):
+    """"4.0 out of 5 stars" -> 4.0"""
+    rating_match = re.search(r'(\d+\.?\d*)', text)
+    return float(rating_match.group(1)) if rating_match else 0
+
+# Where each field lives inside a review card (selectors tried in order)
+AMAZON_REVIEW_FIELDS = {
+    'rating': {
+        'selectors': ["i[data-hook='review-star-rating'] span", "i.review-rating span", "span.a-icon-alt"],
+        'read': 'content',
+        'parse': _parse_rating,
+        'default': 0
+    },
+    'title': {
+        'selectors': ["a[data-hook='review-title'] span", "a[data-hook='review-title']", "div[data-hook='review-title'] span"],
+        'default': ""
+    },
+    'text': {
+        'selectors': ["span[data-hook='review-body'] span", "span[data-hook='review-body']", "div.reviewText span"],
+        'default': ""
+    },
+    'author': {
+        'selectors': ["span.a-profile-name", "div.a-profile-name"],
+        'default': "Anonymous"
+    },
+    'date': {
+        'selectors': ["span[data-hook='review-date']"],
+        'default': "Unknown"
+    },
+    'verified': {
+        'selectors': ["span[data-hook='avp-badge']"],
+        'read': 'exists'
+    }
+}
+
+# First search result link, tried in order
+PRODUCT_LINK_SELECTORS = [
+    "h2 a.a-link-normal",
+    "h2.a-size-mini a",
+    "div.s-product-image-container a",
+    "a.s-link-style"
+]
+
+# Review card containers on the product page, tried in order
+REVIEW_CARD_SELECTORS = [
+    "div[data-hook='review']",
+    "div[data-hook='review-collapsed']",
+    "div.review",
+    "div[id^='customer_review']"
+]
+
+class AmazonBlocked(Exception):
+    """Amazon served a CAPTCHA / robot check page"""
+
+class AmazonParseError(Exception):
+    """The page did not have the expected layout"""
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=1)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(_HEADERS)
+    session.cookies = LWPCookieJar(AMAZON_COOKIE_FILE)
+    try:
+        session.cookies.load(ignore_discard=True, ignore_expires=False)
+    except (OSError, ValueError):
+        pass  # First run or unreadable file: start with a fresh session
+    return session
+
+# Shared session; its cookies (session-id, i18n prefs) are saved to AMAZON_COOKIE_FILE
+session = _create_session()
+_cookie_lock = threading.Lock()
+
+def _save_cookies(http):
+    if not isinstance(getattr(http, 'cookies', None), LWPCookieJar):
+        return
+    with _cookie_lock:
+        try:
+            http.cookies.save(ignore_discard=True)
+        except OSError as e:
+            print(f"⚠️ Could not save Amazon cookies: {e}")
+
+def is_robot_check(html):
+    lower = html[:50000].lower()
+    return any(marker in lower for marker in _ROBOT_CHECK_MARKERS)
+
+def _get_document(url, http):
+    """GET url (after a token from amazon.com's rate limit) and parse it, raising AmazonBlocked on a robot check"""
+    host_limiter.acquire(urlparse(url).netloc)
+    response = http.get(url, timeout=AMAZON_HTTP_TIMEOUT)
+    if response.status_code == 503 or is_robot_check(response.text):
+        raise AmazonBlocked(f"robot check at {url}")
+    if response.status_code != 200:
+        raise AmazonParseError(f"HTTP {response.status_code} for {url}")
+    return lxml.html.fromstring(response.text)
+
+def _has_session_cookie(http):
+    return any(cookie.name == 'session-id' for cookie in getattr(http, 'cookies', []))
+
+def parse_search_results(document):
+    """
+    First product link on a search results page
+
+    Returns:
+        (href, title)
+    """
+    if not html_select(document, "div[data-component-type='s-search-result']"):
+        raise AmazonParseError("no search results")
+    for selector in PRODUCT_LINK_SELECTORS:
+        links = html_select(document, selector)
+        if links and links[0].get('href'):
+            return links[0].get('href'), ' '.join(links[0].text_content().split())
+    raise AmazonParseError("no product link in search results")
+
+def parse_product_page(document, product_info, max_reviews):
+    """
+    Fill product_info (rating, total_ratings) and return the reviews shown on a product page
+    """
+    rating_elements = html_select(document, "span.a-icon-alt")
+    if rating_elements:
+        rating_match = re.search(r'(\d+\.?\d*)', rating_elements[0].text_content())
+        if rating_match:
+            product_info['rating'] = float(rating_match.group(1))
+
+    count_elements = html_select(document, "#acrCustomerReviewText")
+    if count_elements:
+        count_match = re.search(r'([\d,]+)', count_elements[0].text_content())
+        if count_match:
+            product_info['total_ratings'] = int(count_match.group(1).replace(',', ''))
+
+    cards = []
+    for selector in REVIEW_CARD_SELECTORS:
+        cards = html_select(document, selector)
+        if cards:
+            break
+
+    reviews = []
+    for card in cards:
+        if len(reviews) >= max_reviews:
+            break
+        review_data = finalize_row(read_html_fields(card, AMAZON_REVIEW_FIELDS), AMAZON_REVIEW_FIELDS)
+        # Only add reviews with text
+        if review_data['text'] and len(review_data['text']) > 10:
+            reviews.append(review_data)
+    return reviews
+
+def fetch_amazon_reviews(product_name, max_reviews=20, http=None):
+    """
+    Search Amazon and read the first product's page without a browser
+
+    Args:
+        product_name: Name of the product (e.g., "Dr. Martens 1460 boots")
+        max_reviews: Maximum number of reviews to return (the product page shows ~8-10)
+        http: requests.Session-like object (default: the shared session)
+
+    Returns:
+        Tuple of (product_info dict, reviews list), same shape as scrape_amazon_reviews
+
+    Raises:
+        AmazonBlocked: CAPTCHA / robot check
+        AmazonParseError: Unexpected layout or no results
+    """
+    http = http or session
+    product_info = {
+        'name': product_name,
+        'url': '',
+        'rating': 0,
+        'total_ratings': 0
+    }
+
+    # Same as the browser path: a homepage visit hands out the session cookies
+    if not _has_session_cookie(http):
+        _get_document(f"{AMAZON_BASE_URL}/", http)
+
+    search_url = f"{AMAZON_BASE_URL}/s?k={quote_plus(product_name)}"
+    href, title = parse_search_results(_get_document(search_url, http))
+    product_info['url'] = urljoin(AMAZON_BASE_URL + '/', href)
+    if title:
+        product_info['name'] = title
+        print(f"✅ Found product: {title[:60]}...")
+
+    reviews = parse_product_page(_get_document(product_info['url'], http), product_info, max_reviews)
+    _save_cookies(http)
+    return product_info, reviews
@@ -9,9 +9,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import os
 import time
 import re
+import requests
+from driver_pool import get_pool, chromedriver_path
+from page_readiness import PERFORMANCE_LOGGING, load_page, wait_for_selector, scroll_and_wait
+from bulk_extract import extract_reviews
+from amazon_http import (AMAZON_BASE_URL, AMAZON_REVIEW_FIELDS, PRODUCT_LINK_SELECTORS, REVIEW_CARD_SELECTORS,
+                         AmazonBlocked, AmazonParseError, fetch_amazon_reviews)
 
 def setup_driver():
     """Setup Chrome driver with optimal options for Amazon"""
@@ -34,6 +40,7 @@ def setup_driver():
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.set_capability('goog:loggingPrefs', PERFORMANCE_LOGGING)
     
     # Realistic user agent
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36')
@@ -47,7 +54,7 @@ def setup_driver():
     chrome_options.add_experimental_option("prefs", prefs)
     
     try:
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
         
         # Enhanced anti-detection scripts
@@ -68,6 +75,12 @@ def setup_driver():
         print(f"❌ Error setting up Chrome driver: {e}")
         raise
 
+# Warm browsers shared by all Amazon scrapes
+driver_pool = get_pool('amazon', setup_driver)
+AMAZON_HOST = 'amazon.com'
+
+AMAZON_HTTP_FETCH = os.getenv('AMAZON_HTTP_FETCH', 'true').lower() not in ('0', 'false', 'no')  # Browser only as fallback
+
 def scrape_amazon_reviews(product_name, max_reviews=20):
     """
     Scrape reviews from Amazon by searching for a product
@@ -80,7 +93,18 @@ def scrape_amazon_reviews(product_name, max_reviews=20):
     Returns:
         Tuple of (product_info dict, reviews list)
     """
-    driver = setup_driver()
+    # Plain HTTP + lxml first; a browser is only needed when Amazon asks for a CAPTCHA
+    if AMAZON_HTTP_FETCH:
+        try:
+            fetch_start = time.time()
+            product_info, reviews = fetch_amazon_reviews(product_name, max_reviews)
+            print(f"✅ Fetched {len(reviews)} Amazon reviews over HTTP in {time.time() - fetch_start:.1f}s")
+            return product_info, reviews
+        except (AmazonBlocked, AmazonParseError, requests.RequestException) as e:
+            print(f"⚠️ HTTP fetch failed ({str(e)[:100]}) - falling back to browser")
+    
+    driver = driver_pool.acquire(AMAZON_HOST)
+    failed = False
     reviews = []
     product_info = {
         'name': product_name,
@@ -93,8 +117,7 @@ def scrape_amazon_reviews(product_name, max_reviews=20):
         # Visit Amazon homepage first to establish session
         print(f"🏠 Visiting Amazon homepage to establish session...")
         try:
-            driver.get("https://www.amazon.com")
-            time.sleep(2)
+            load_page(driver, AMAZON_BASE_URL, timeout=6, name='amazon_home')
             print("✅ Session established")
         except Exception as e:
             print(f"❌ Failed to load Amazon homepage: {e}")
@@ -102,19 +125,17 @@ def scrape_amazon_reviews(product_name, max_reviews=20):
         
         # Search for product on Amazon
         search_query = product_name.replace(' ', '+')
-        search_url = f"https://www.amazon.com/s?k={search_query}"
+        search_url = f"{AMAZON_BASE_URL}/s?k={search_query}"
         
         print(f"🔍 Searching Amazon for: {product_name}")
         
         try:
-            driver.get(search_url)
+            load_page(driver, search_url, timeout=8, name='amazon_search')
             print("✅ Loaded Amazon search page")
         except Exception as e:
             print(f"❌ Failed to load Amazon search: {e}")
             raise Exception(f"Could not access Amazon search.")
         
-        time.sleep(3)
-        
         # Check if page loaded correctly
         try:
             driver.find_element(By.TAG_NAME, "body")
@@ -130,14 +151,7 @@ def scrape_amazon_reviews(product_name, max_reviews=20):
             print("✅ Search results loaded")
             
             first_product = None
-            selectors = [
-                "h2 a.a-link-normal",
-                "h2.a-size-mini a",
-                "div.s-product-image-container a",
-                "a.s-link-style"
-            ]
-            
-            for selector in selectors:
+            for selector in PRODUCT_LINK_SELECTORS:
                 try:
                     first_product = driver.find_element(By.CSS_SELECTOR, selector)
                     if first_product:
@@ -162,8 +176,8 @@ def scrape_amazon_reviews(product_name, max_reviews=20):
                 print("⚠️ Could not extract product title from link")
             
             print(f"🔗 Navigating to product page...")
-            driver.get(product_url)
-            time.sleep(3)
+            load_page(driver, product_url, ready_selectors=["#productTitle", "span.a-icon-alt"],
+                      timeout=10, name='amazon_product')
             
             # Get overall rating
             try:
@@ -187,161 +201,53 @@ def scrape_amazon_reviews(product_name, max_reviews=20):
             
         except Exception as e:
             print(f"❌ Could not find product: {str(e)[:200]}")
-            driver.quit()
             raise Exception(f"Amazon search failed: {str(e)[:200]}")
         
         # Scrape reviews from product page (avoid login page)
         print("📜 Scraping reviews from product page...")
-        time.sleep(2)
         
-        # Scroll down to load reviews section
+        # Try multiple selectors for review containers
+        review_elements = []
+        review_selectors = REVIEW_CARD_SELECTORS
+        
+        # Scroll down to load reviews section, then wait for review cards
         try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            time.sleep(2)
+            scroll_and_wait(driver, fraction=0.5, name='amazon_scroll')
+            wait_for_selector(driver, review_selectors, timeout=5, name='amazon_reviews')
         except:
             pass
         
-        # Try multiple selectors for review containers
-        review_elements = []
-        review_selectors = [
-            "div[data-hook='review']",
-            "div[data-hook='review-collapsed']",
-            "div.review",
-            "div[id^='customer_review']"
-        ]
-        
+        card_selector = None
         for selector in review_selectors:
             try:
                 review_elements = driver.find_elements(By.CSS_SELECTOR, selector)
                 if review_elements:
                     print(f"   ✅ Found {len(review_elements)} reviews with selector: {selector}")
+                    card_selector = selector
                     break
             except:
                 continue
         
-        # Process found reviews
-        for element in review_elements:
-            if len(reviews) >= max_reviews:
-                break
-            
-            try:
-                review_data = {}
-                
-                # Extract rating
-                try:
-                    rating_selectors = [
-                        "i[data-hook='review-star-rating'] span",
-                        "i.review-rating span",
-                        "span.a-icon-alt"
-                    ]
-                    rating_text = None
-                    for sel in rating_selectors:
-                        try:
-                            rating_element = element.find_element(By.CSS_SELECTOR, sel)
-                            rating_text = rating_element.get_attribute('textContent') or rating_element.text
-                            if rating_text:
-                                break
-                        except:
-                            continue
-                    
-                    if rating_text:
-                        rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                        review_data['rating'] = float(rating_match.group(1)) if rating_match else 0
-                    else:
-                        review_data['rating'] = 0
-                except:
-                    review_data['rating'] = 0
-                
-                # Extract review title
-                try:
-                    title_selectors = [
-                        "a[data-hook='review-title'] span",
-                        "a[data-hook='review-title']",
-                        "div[data-hook='review-title'] span"
-                    ]
-                    review_data['title'] = ""
-                    for sel in title_selectors:
-                        try:
-                            title_element = element.find_element(By.CSS_SELECTOR, sel)
-                            title = title_element.text.strip()
-                            if title:
-                                review_data['title'] = title
-                                break
-                        except:
-                            continue
-                except:
-                    review_data['title'] = ""
-                
-                # Extract review text
-                try:
-                    text_selectors = [
-                        "span[data-hook='review-body'] span",
-                        "span[data-hook='review-body']",
-                        "div.reviewText span"
-                    ]
-                    review_data['text'] = ""
-                    for sel in text_selectors:
-                        try:
-                            text_element = element.find_element(By.CSS_SELECTOR, sel)
-                            text = text_element.text.strip()
-                            if text:
-                                review_data['text'] = text
-                                break
-                        except:
-                            continue
-                except:
-                    review_data['text'] = ""
-                
-                # Extract author name
-                try:
-                    author_selectors = [
-                        "span.a-profile-name",
-                        "div.a-profile-name"
-                    ]
-                    review_data['author'] = "Anonymous"
-                    for sel in author_selectors:
-                        try:
-                            author_element = element.find_element(By.CSS_SELECTOR, sel)
-                            author = author_element.text.strip()
-                            if author:
-                                review_data['author'] = author
-                                break
-                        except:
-                            continue
-                except:
-                    review_data['author'] = "Anonymous"
-                
-                # Extract date
-                try:
-                    date_element = element.find_element(By.CSS_SELECTOR, "span[data-hook='review-date']")
-                    review_data['date'] = date_element.text.strip()
-                except:
-                    review_data['date'] = "Unknown"
-                
-                # Extract verified purchase status
-                try:
-                    verified = element.find_element(By.CSS_SELECTOR, "span[data-hook='avp-badge']")
-                    review_data['verified'] = True
-                except:
-                    review_data['verified'] = False
+        # Read every review card in one script round trip
+        if card_selector:
+            for review_data in extract_reviews(driver, card_selector, AMAZON_REVIEW_FIELDS, limit=len(review_elements)):
+                if len(reviews) >= max_reviews:
+                    break
                 
                 # Only add reviews with text
                 if review_data['text'] and len(review_data['text']) > 10:
                     reviews.append(review_data)
-                    
-            except Exception as e:
-                print(f"   ⚠️ Error extracting review: {e}")
-                continue
         
         print(f"✅ Successfully scraped {len(reviews)} reviews from product page")
         
     except Exception as e:
+        failed = True
         print(f"❌ Error during scraping: {e}")
         import traceback
         traceback.print_exc()
     
     finally:
-        driver.quit()
+        driver_pool.release(driver, discard=failed)
     
     return product_info, reviews
 
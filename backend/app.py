@@ -1,17 +1,29 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
 import requests
-from textblob import TextBlob
 from datetime import datetime
 from openai import OpenAI
 import json
+import queue
+import threading
 import time
 from amazon_scraper import scrape_amazon_reviews
 from reddit_scraper import scrape_reddit_reviews
-from youtube_scraper import scrape_youtube_reviews
+from youtube_scraper import scrape_youtube_reviews, youtube_cache
 from trustpilot_scraper import scrape_trustpilot_reviews
+from sentiment_cache import SentimentCache, make_cache_key
+from sentiment_executor import ConcurrentSentimentExecutor
+from keyword_matcher import count_keywords, count_keywords_batch
+from lexicon_polarity import polarity_batch
+from review_dedupe import cluster_near_duplicates, dedupe_reviews
+from driver_pool import pool_stats, warm_pools
+from page_readiness import readiness_metrics
+from client_registry import ClientProxy, client_stats, register_client, registry
+from review_sources import fan_out, get_source, get_sources, review_store, scrape_cache
+from review_store import make_product_id
+from host_rate_limiter import host_limiter
 
 load_dotenv()
 
@@ -20,86 +32,96 @@ CORS(app)
 
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+# Optional OpenAI-compatible endpoint (e.g., fake_openai_server.py for benchmarks)
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# Initialize OpenAI client (built once, shared by all requests; re-created if the registry drops it).
+# The SDK client is thread-safe and retries on its own, so it has no health check; the bulk
+# sentiment path uses the executor's own AsyncOpenAI client below.
+client = None
+if OPENAI_API_KEY:
+    register_client('openai', lambda: OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL))
+    client = ClientProxy(registry, 'openai')
 
-def analyze_sentiment(text, rating=None, use_ai=True):
+# Concurrent, rate-limited fan-out for sentiment requests (shared by all Flask threads)
+sentiment_executor = ConcurrentSentimentExecutor(
+    OPENAI_API_KEY,
+    base_url=OPENAI_BASE_URL,
+    max_in_flight=int(os.getenv('OPENAI_MAX_IN_FLIGHT', '8')),
+    requests_per_minute=int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', '500')),
+    tokens_per_minute=int(os.getenv('OPENAI_TOKENS_PER_MINUTE', '200000')),
+    max_retries=int(os.getenv('OPENAI_MAX_RETRIES', '5'))
+) if OPENAI_API_KEY else None
+
+SENTIMENT_MODEL = "gpt-4o-mini"  # Faster, cheaper model for sentiment
+SENTIMENT_BATCH_SIZE = int(os.getenv('SENTIMENT_BATCH_SIZE', '25'))
+FALLBACK_METHOD = "keyword+lexicon"
+
+# Sentiment mode: "ai" sends every review to the AI, "cascade" (opt-in) scores locally and
+# only sends uncertain reviews to the AI, "local" never calls the AI
+SENTIMENT_MODE = os.getenv('SENTIMENT_MODE', 'ai').lower()
+# Local results with |polarity| below this are treated as uncertain in cascade mode
+SENTIMENT_ESCALATION_THRESHOLD = float(os.getenv('SENTIMENT_ESCALATION_THRESHOLD', '0.1'))
+
+# Near-duplicate reviews (SimHash Hamming distance <= max distance) are scored once
+REVIEW_DEDUPE_ENABLED = os.getenv('REVIEW_DEDUPE', 'true').lower() not in ('0', 'false', 'no')
+REVIEW_DEDUPE_MAX_DISTANCE = int(os.getenv('REVIEW_DEDUPE_MAX_DISTANCE', '3'))
+REVIEW_STORE_CONTEXT_LIMIT = int(os.getenv('REVIEW_STORE_CONTEXT_LIMIT', '500'))  # Stored reviews loaded per insights/chat request
+
+# Which tier decided each review, across all requests (reported by /api/metrics)
+sentiment_tier_lock = threading.Lock()
+sentiment_tier_counts = {'local': 0, 'llm': 0, 'escalated': 0}
+
+# Cache sentiment results so repeat queries don't re-score the same texts
+sentiment_cache = SentimentCache(
+    os.getenv('SENTIMENT_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sentiment_cache.db')),
+    max_memory_entries=int(os.getenv('SENTIMENT_CACHE_MAX_MEMORY', '5000')),
+    max_disk_entries=int(os.getenv('SENTIMENT_CACHE_MAX_DISK', '100000'))
+)
+
+SENTIMENT_SYSTEM_PROMPT = "You are a sentiment analyzer. Analyze the overall sentiment of product reviews considering context, sarcasm, and mixed emotions. Respond with ONLY a JSON object: {\"sentiment\": \"positive\"|\"negative\"|\"neutral\", \"confidence\": 0.0-1.0, \"reasoning\": \"brief explanation\"}"
+
+SENTIMENT_BATCH_SYSTEM_PROMPT = "You are a sentiment analyzer. Analyze the overall sentiment of each numbered product review considering context, sarcasm, and mixed emotions. Respond with ONLY a JSON object: {\"results\": [{\"index\": <review number>, \"sentiment\": \"positive\"|\"negative\"|\"neutral\", \"confidence\": 0.0-1.0, \"reasoning\": \"brief explanation\"}]} containing exactly one entry per review."
+
+def _ai_sentiment_result(result):
+    """Convert a parsed AI sentiment JSON object into our sentiment dict"""
+    sentiment = result.get('sentiment', 'neutral')
+    if sentiment not in ('positive', 'negative', 'neutral'):
+        raise ValueError(f"Unexpected sentiment label: {sentiment!r}")
+    confidence = float(result.get('confidence', 0.5))
+    
+    # Calculate polarity based on sentiment and confidence
+    if sentiment == 'positive':
+        polarity = 0.3 + (confidence * 0.7)
+    elif sentiment == 'negative':
+        polarity = -0.3 - (confidence * 0.7)
+    else:
+        polarity = 0.0
+    
+    return {
+        "sentiment": sentiment,
+        "polarity": round(polarity, 2),
+        "subjectivity": 0.5,  # Not calculated by AI
+        "confidence": round(confidence, 2),
+        "method": "ai"
+    }
+
+def _fallback_sentiment(text, rating=None, keyword_counts=None, lexicon_scores=None):
     """
-    Analyze sentiment using AI (GPT-4o) for accurate multi-language context understanding
-    Falls back to keyword + TextBlob if AI unavailable
+    Keyword + lexicon sentiment analysis used when AI is unavailable
+    keyword_counts and lexicon_scores may be precomputed in bulk by
+    count_keywords_batch and polarity_batch
     """
-    # Try AI-based sentiment analysis first (multilingual + context-aware)
-    if use_ai and client:
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # Faster, cheaper model for sentiment
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a sentiment analyzer. Analyze the overall sentiment of product reviews considering context, sarcasm, and mixed emotions. Respond with ONLY a JSON object: {\"sentiment\": \"positive\"|\"negative\"|\"neutral\", \"confidence\": 0.0-1.0, \"reasoning\": \"brief explanation\"}"
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this review sentiment:\n\n{text}"
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=100,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            sentiment = result.get('sentiment', 'neutral')
-            confidence = result.get('confidence', 0.5)
-            
-            # Calculate polarity based on sentiment and confidence
-            if sentiment == 'positive':
-                polarity = 0.3 + (confidence * 0.7)
-            elif sentiment == 'negative':
-                polarity = -0.3 - (confidence * 0.7)
-            else:
-                polarity = 0.0
-            
-            return {
-                "sentiment": sentiment,
-                "polarity": round(polarity, 2),
-                "subjectivity": 0.5,  # Not calculated by AI
-                "confidence": round(confidence, 2),
-                "method": "ai"
-            }
-        except Exception as e:
-            print(f"⚠️ AI sentiment analysis failed, using fallback: {e}")
-    
-    # Fallback: Keyword + TextBlob analysis
     try:
-        # Enhanced keyword lists for better detection
-        negative_keywords = [
-            'disappointed', 'frustrat', 'terrible', 'awful', 'horrible', 'worst',
-            'broken', 'defective', 'poor', 'bad', 'never', 'waste', 'useless',
-            'angry', 'annoying', 'annoyed', 'upset', 'unhappy', 'unsatisfied',
-            'misleading', 'lied', 'fake', 'scam', 'fraud', 'avoid', 'warning',
-            'regret', 'hate', 'disappoint', 'not recommend', 'don\'t buy',
-            'cheap', 'poorly made', 'fell apart', 'uncomfortable', 'painful'
-        ]
-        
-        positive_keywords = [
-            'excellent', 'amazing', 'love', 'perfect', 'great', 'awesome',
-            'fantastic', 'wonderful', 'best', 'recommend', 'happy', 'satisfied',
-            'quality', 'comfortable', 'beautiful', 'impressed', 'exceeded',
-            'worth', 'favorite', 'highly recommend', 'outstanding', 'superb',
-            'pleased', 'delighted', 'brilliant', 'sturdy', 'durable', 'stylish'
-        ]
-        
-        text_lower = text.lower()
+        # Count keyword matches in a single pass
+        if keyword_counts is None:
+            keyword_counts = count_keywords(text)
+        negative_count, positive_count = keyword_counts
         
-        # Count keyword matches
-        negative_count = sum(1 for word in negative_keywords if word in text_lower)
-        positive_count = sum(1 for word in positive_keywords if word in text_lower)
-        
-        # Use TextBlob for polarity
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+        # TextBlob's pattern lexicon for polarity (vectorized engine)
+        if lexicon_scores is None:
+            lexicon_scores = polarity_batch([text])[0]
+        polarity, subjectivity = lexicon_scores
         
         # Decision logic (prioritize text content over rating)
         # 1. Strong keyword signal wins
@@ -137,8 +159,9 @@ def analyze_sentiment(text, rating=None, use_ai=True):
         return {
             "sentiment": sentiment,
             "polarity": round(polarity, 2),
-            "subjectivity": round(blob.sentiment.subjectivity, 2),
-            "method": "keyword+textblob"
+            "subjectivity": round(subjectivity, 2),
+            "keyword_hits": {"negative": negative_count, "positive": positive_count},
+            "method": FALLBACK_METHOD
         }
     except Exception as e:
         return {
@@ -149,6 +172,361 @@ def analyze_sentiment(text, rating=None, use_ai=True):
             "method": "error"
         }
 
+def _ai_cache_key(text, rating):
+    """Cache key for an AI sentiment result"""
+    return make_cache_key(text, rating, method="ai", model=SENTIMENT_MODEL)
+
+def _cached_fallback_sentiment(text, rating=None):
+    """Fallback sentiment, served from the cache when this text was scored before"""
+    return _cached_fallback_sentiment_batch([(text, rating)])[0]
+
+def _cached_fallback_sentiment_batch(pairs):
+    """Fallback sentiment for many (text, rating) pairs, scored together in bulk"""
+    keys = [make_cache_key(text, rating, method=FALLBACK_METHOD) for text, rating in pairs]
+    cached = sentiment_cache.get_many(keys)
+    pending = [idx for idx, key in enumerate(keys) if key not in cached]
+    pending_texts = [pairs[idx][0] for idx in pending]
+    keyword_counts = count_keywords_batch(pending_texts)
+    lexicon_scores = polarity_batch(pending_texts) if pending_texts else []
+    
+    results = [cached.get(key) for key in keys]
+    scored = {}
+    for idx, counts, scores in zip(pending, keyword_counts, lexicon_scores):
+        text, rating = pairs[idx]
+        result = _fallback_sentiment(text, rating, keyword_counts=counts, lexicon_scores=scores)
+        results[idx] = result
+        if result.get('method') != 'error':
+            scored[keys[idx]] = result
+    sentiment_cache.set_many(scored)
+    return results
+
+def _escalation_reason(result, rating=None, threshold=None):
+    """
+    Why a local sentiment result is too uncertain to keep, or None if it is confident
+    
+    Escalates when positive and negative keywords are both present without a clear
+    winner, when the polarity is close to zero, or when the star rating says the
+    opposite of the text
+    """
+    if threshold is None:
+        threshold = SENTIMENT_ESCALATION_THRESHOLD
+    if result.get('method') == 'error':
+        return 'local_error'
+    
+    hits = result.get('keyword_hits') or {}
+    negative_count = hits.get('negative', 0)
+    positive_count = hits.get('positive', 0)
+    if negative_count and positive_count and abs(positive_count - negative_count) <= 2:
+        return 'keyword_conflict'
+    
+    if abs(result.get('polarity', 0)) < threshold:
+        return 'low_polarity'
+    
+    if rating:
+        sentiment = result.get('sentiment')
+        if (rating <= 2 and sentiment == 'positive') or (rating >= 4 and sentiment == 'negative'):
+            return 'rating_conflict'
+    return None
+
+def _record_sentiment_tiers(results):
+    """Add a request's results to the process-wide tier counters"""
+    llm = sum(1 for r in results if r.get('tier') == 'llm')
+    escalated = sum(1 for r in results if r.get('escalated'))
+    with sentiment_tier_lock:
+        sentiment_tier_counts['local'] += len(results) - llm
+        sentiment_tier_counts['llm'] += llm
+        sentiment_tier_counts['escalated'] += escalated
+
+def summarize_sentiment_tiers(sentiments):
+    """
+    Summarize which tier decided a list of sentiment results
+    
+    Returns:
+        Dict with the mode, local/llm counts and the escalation rate
+    """
+    total = len(sentiments)
+    llm = sum(1 for s in sentiments if s.get('tier') == 'llm')
+    escalated = sum(1 for s in sentiments if s.get('escalated'))
+    return {
+        'mode': SENTIMENT_MODE,
+        'local': total - llm,
+        'llm': llm,
+        'escalated': escalated,
+        'escalation_rate': round(escalated / total, 3) if total else 0
+    }
+
+def analyze_sentiment(text, rating=None, use_ai=True, mode=None):
+    """
+    Analyze sentiment using AI (GPT-4o) for accurate multi-language context understanding
+    In cascade mode the keyword + lexicon result is kept unless it is uncertain,
+    and keyword + lexicon is also the fallback when AI is unavailable
+    """
+    mode = mode or SENTIMENT_MODE
+    local = None
+    escalated = False
+    if mode != 'ai' or not (use_ai and client):
+        local = _cached_fallback_sentiment(text, rating)
+        local['tier'] = 'local'
+        reason = None
+        if mode != 'local' and use_ai and client:
+            reason = _escalation_reason(local, rating)
+        if reason is None:
+            _record_sentiment_tiers([local])
+            return local
+        escalated = True
+    
+    # AI-based sentiment analysis (multilingual + context-aware)
+    key = _ai_cache_key(text, rating)
+    result = sentiment_cache.get(key)
+    if result is None:
+        try:
+            response = client.chat.completions.create(
+                model=SENTIMENT_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": SENTIMENT_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Analyze this review sentiment:\n\n{text}"
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=100,
+                response_format={"type": "json_object"}
+            )
+            
+            result = _ai_sentiment_result(json.loads(response.choices[0].message.content))
+            sentiment_cache.set(key, result)
+        except Exception as e:
+            print(f"⚠️ AI sentiment analysis failed, using fallback: {e}")
+    
+    if result is not None:
+        result['tier'] = 'llm'
+    else:
+        # Fallback: Keyword + lexicon analysis
+        result = local if local is not None else _cached_fallback_sentiment(text, rating)
+        result['tier'] = 'local'
+    if escalated:
+        result['escalated'] = True
+        result['escalation_reason'] = reason
+    _record_sentiment_tiers([result])
+    return result
+
+def _sentiment_chunk_request(chunk):
+    """Build the JSON-mode chat request that scores one chunk of (text, rating) pairs"""
+    numbered_reviews = "\n\n".join(
+        f"Review {idx}:\n{text}" for idx, (text, _) in enumerate(chunk)
+    )
+    return {
+        "model": SENTIMENT_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": SENTIMENT_BATCH_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Analyze the sentiment of these {len(chunk)} reviews:\n\n{numbered_reviews}"
+            }
+        ],
+        "temperature": 0.3,
+        "max_tokens": 60 * len(chunk) + 50,
+        "response_format": {"type": "json_object"}
+    }
+
+def _parse_sentiment_chunk(content, size):
+    """
+    Map a batch response back onto its chunk by index
+    Returns a list of length size; entries are None where the AI result
+    for that review was missing or could not be parsed
+    """
+    payload = json.loads(content)
+    entries = payload.get('results', []) if isinstance(payload, dict) else []
+    
+    results = [None] * size
+    for entry in entries:
+        try:
+            idx = int(entry['index'])
+            if 0 <= idx < size and results[idx] is None:
+                results[idx] = _ai_sentiment_result(entry)
+        except Exception:
+            # Only this review falls back, the rest of the batch is kept
+            continue
+    return results
+
+def _run_sentiment_requests(requests_to_send):
+    """
+    Send sentiment chat requests, concurrently when the executor is available
+    Returns response contents (or Exceptions) in request order
+    """
+    if sentiment_executor is not None:
+        try:
+            return sentiment_executor.map(requests_to_send)
+        except Exception as e:
+            print(f"⚠️ Concurrent sentiment executor failed, sending requests serially: {e}")
+    
+    contents = []
+    for payload in requests_to_send:
+        try:
+            response = client.chat.completions.create(**payload)
+            contents.append(response.choices[0].message.content)
+        except Exception as e:
+            contents.append(e)
+    return contents
+
+def _ai_sentiment_batch(pairs, batch_size=SENTIMENT_BATCH_SIZE):
+    """
+    Score (text, rating) pairs with one AI request per batch
+    Batches are sent concurrently through the sentiment executor
+    
+    Returns:
+        List aligned with pairs; entries are None where the AI did not score the review
+    """
+    results = [None] * len(pairs)
+    
+    # Serve previously scored texts from the cache; only misses go to the AI
+    keys = [_ai_cache_key(text, rating) for text, rating in pairs]
+    cached = sentiment_cache.get_many(keys)
+    pending = []
+    for idx, key in enumerate(keys):
+        if key in cached:
+            results[idx] = cached[key]
+        else:
+            pending.append(idx)
+    
+    chunks = [pending[offset:offset + batch_size] for offset in range(0, len(pending), batch_size)]
+    contents = _run_sentiment_requests([
+        _sentiment_chunk_request([pairs[idx] for idx in chunk_indices]) for chunk_indices in chunks
+    ])
+    
+    for chunk_indices, content in zip(chunks, contents):
+        try:
+            if isinstance(content, Exception):
+                raise content
+            chunk_results = _parse_sentiment_chunk(content, len(chunk_indices))
+        except Exception as e:
+            print(f"⚠️ AI batch sentiment analysis failed, using fallback for {len(chunk_indices)} reviews: {e}")
+            continue
+        
+        missing = sum(1 for r in chunk_results if r is None)
+        if missing:
+            print(f"⚠️ {missing}/{len(chunk_indices)} reviews missing from AI batch, using fallback for those")
+        
+        scored = {}
+        for idx, result in zip(chunk_indices, chunk_results):
+            if result is not None:
+                results[idx] = result
+                scored[keys[idx]] = result
+        sentiment_cache.set_many(scored)
+    
+    return results
+
+def _score_sentiment_pairs(pairs, use_ai, batch_size, mode, escalation_threshold):
+    """Score unique (text, rating) pairs with the configured tiers"""
+    results = [None] * len(pairs)
+    ai_indices = []
+    if use_ai and client and mode != 'local':
+        if mode == 'cascade':
+            # Local tier first; keep the confident results
+            results = _cached_fallback_sentiment_batch(pairs)
+            for idx, (result, (_, rating)) in enumerate(zip(results, pairs)):
+                reason = _escalation_reason(result, rating, escalation_threshold)
+                if reason is not None:
+                    result['escalated'] = True
+                    result['escalation_reason'] = reason
+                    ai_indices.append(idx)
+        else:
+            ai_indices = list(range(len(pairs)))
+    
+    if ai_indices:
+        ai_results = _ai_sentiment_batch([pairs[idx] for idx in ai_indices], batch_size)
+        for idx, result in zip(ai_indices, ai_results):
+            if result is None:
+                continue
+            local = results[idx]
+            if local is not None and local.get('escalated'):
+                result['escalated'] = True
+                result['escalation_reason'] = local['escalation_reason']
+            result['tier'] = 'llm'
+            results[idx] = result
+    
+    # Fallback: Keyword + lexicon for anything the AI did not score
+    fallback_indices = [idx for idx, result in enumerate(results) if result is None]
+    if fallback_indices:
+        fallback_results = _cached_fallback_sentiment_batch([pairs[idx] for idx in fallback_indices])
+        for idx, result in zip(fallback_indices, fallback_results):
+            results[idx] = result
+    
+    for result in results:
+        result.setdefault('tier', 'local')
+    return results
+
+def analyze_sentiment_batch(items, use_ai=True, batch_size=SENTIMENT_BATCH_SIZE, mode=None,
+                            escalation_threshold=None, dedupe=True):
+    """
+    Analyze sentiment for many reviews
+    
+    In cascade mode every review is scored locally (keyword + lexicon) and only
+    the uncertain ones are sent to the AI; in ai mode every review goes to the AI.
+    Each result carries a 'tier' ("local" or "llm") saying which one decided it.
+    Near-duplicate reviews are scored once and the result is copied to every
+    copy, which is marked 'duplicate' so callers can report a duplicate count.
+    
+    Args:
+        items: List of review dicts (using 'text' and 'rating') or (text, rating) tuples
+        use_ai: Use the AI model when available
+        batch_size: Number of reviews sent in each AI request
+        mode: "cascade", "ai" or "local" (defaults to SENTIMENT_MODE)
+        escalation_threshold: |polarity| below which a local result is escalated
+        dedupe: Score near-duplicate reviews once per cluster
+    
+    Returns:
+        List of sentiment dicts in the same order as items
+    """
+    mode = mode or SENTIMENT_MODE
+    pairs = []
+    for item in items:
+        if isinstance(item, dict):
+            pairs.append((item.get('text') or '', item.get('rating')))
+        else:
+            text, rating = item
+            pairs.append((text or '', rating))
+    
+    # Collapse near-duplicates (same cluster and same rating) onto their first copy
+    if dedupe and REVIEW_DEDUPE_ENABLED:
+        clusters = cluster_near_duplicates([text for text, _ in pairs], max_distance=REVIEW_DEDUPE_MAX_DISTANCE)
+    else:
+        clusters = list(range(len(pairs)))
+    unique_positions = {}
+    unique_pairs = []
+    members = []
+    for cluster, (text, rating) in zip(clusters, pairs):
+        key = (cluster, None if rating is None else float(rating))
+        if key not in unique_positions:
+            unique_positions[key] = len(unique_pairs)
+            unique_pairs.append((text, rating))
+        members.append(unique_positions[key])
+    
+    unique_results = _score_sentiment_pairs(unique_pairs, use_ai, batch_size, mode, escalation_threshold)
+    
+    results = []
+    seen = set()
+    for position in members:
+        result = dict(unique_results[position])
+        if position in seen:
+            result['duplicate'] = True
+        seen.add(position)
+        results.append(result)
+    
+    _record_sentiment_tiers(results)
+    return results
+
+def count_duplicates(sentiments):
+    """Number of results that were copied from an earlier near-duplicate review"""
+    return sum(1 for s in sentiments if s.get('duplicate'))
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -157,6 +535,33 @@ def health_check():
         "timestamp": datetime.now().isoformat()
     })
 
+def _sentiment_tier_metrics():
+    """Process-wide tier counters with the overall escalation rate"""
+    with sentiment_tier_lock:
+        counts = dict(sentiment_tier_counts)
+    total = counts['local'] + counts['llm']
+    counts['mode'] = SENTIMENT_MODE
+    counts['escalation_threshold'] = SENTIMENT_ESCALATION_THRESHOLD
+    counts['escalation_rate'] = round(counts['escalated'] / total, 3) if total else 0
+    return counts
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Performance counters for the sentiment pipeline"""
+    return jsonify({
+        "sentiment_cache": sentiment_cache.stats(),
+        "sentiment_executor": sentiment_executor.stats() if sentiment_executor else None,
+        "sentiment_tiers": _sentiment_tier_metrics(),
+        "driver_pools": pool_stats(),
+        "page_readiness": readiness_metrics.stats(),
+        "api_clients": client_stats(),
+        "youtube_cache": youtube_cache.stats(),
+        "host_rate_limits": host_limiter.stats(),
+        "scrape_cache": scrape_cache.stats(),
+        "review_store": review_store.stats(),
+        "timestamp": datetime.now().isoformat()
+    })
+
 @app.route('/api/youtube/search', methods=['POST'])
 def search_youtube():
     """Search YouTube for product review videos and extract comments"""
@@ -170,7 +575,7 @@ def search_youtube():
         
         print(f"🎥 YouTube search for: {query}")
         
-        reviews = scrape_youtube_reviews(query, max_reviews=max_reviews)
+        reviews, cache_age = get_source('youtube').fetch_cached(query, max_reviews)
         
         if not reviews:
             return jsonify({
@@ -181,10 +586,11 @@ def search_youtube():
                 'error': 'No YouTube reviews found'
             })
         
-        # Analyze sentiment for each review
+        # Analyze sentiment for all reviews in batches
+        sentiments = analyze_sentiment_batch([(review.get('text', ''), None) for review in reviews])
+        review_store.upsert_reviews(make_product_id(query), 'youtube', reviews, sentiments)
         analyzed_reviews = []
-        for review in reviews:
-            sentiment_data = analyze_sentiment(review.get('text', ''))
+        for review, sentiment_data in zip(reviews, sentiments):
             review['sentiment'] = sentiment_data
             analyzed_reviews.append(review)
         
@@ -192,7 +598,11 @@ def search_youtube():
             'success': True,
             'reviews': analyzed_reviews,
             'total': len(analyzed_reviews),
-            'source': 'youtube'
+            'source': 'youtube',
+            'product_id': make_product_id(query),
+            'cache_age_seconds': round(cache_age, 1),
+            'sentiment_tiers': summarize_sentiment_tiers(sentiments),
+            'duplicate_count': count_duplicates(sentiments)
         })
         
     except Exception as e:
@@ -217,7 +627,7 @@ def search_trustpilot():
         
         print(f"🔍 Trustpilot search for: {query}")
         
-        reviews = scrape_trustpilot_reviews(query, max_reviews=max_reviews)
+        reviews, cache_age = get_source('trustpilot').fetch_cached(query, max_reviews)
         
         if not reviews:
             return jsonify({
@@ -228,10 +638,11 @@ def search_trustpilot():
                 'error': 'No Trustpilot reviews found'
             })
         
-        # Analyze sentiment for each review
+        # Analyze sentiment for all reviews in batches
+        sentiments = analyze_sentiment_batch(reviews)
+        review_store.upsert_reviews(make_product_id(query), 'trustpilot', reviews, sentiments)
         analyzed_reviews = []
-        for review in reviews:
-            sentiment_data = analyze_sentiment(review.get('text', ''), rating=review.get('rating'))
+        for review, sentiment_data in zip(reviews, sentiments):
             review['sentiment'] = sentiment_data
             analyzed_reviews.append(review)
         
@@ -239,7 +650,11 @@ def search_trustpilot():
             'success': True,
             'reviews': analyzed_reviews,
             'total': len(analyzed_reviews),
-            'source': 'trustpilot'
+            'source': 'trustpilot',
+            'product_id': make_product_id(query),
+            'cache_age_seconds': round(cache_age, 1),
+            'sentiment_tiers': summarize_sentiment_tiers(sentiments),
+            'duplicate_count': count_duplicates(sentiments)
         })
         
     except Exception as e:
@@ -296,10 +711,13 @@ def analyze():
 
 @app.route('/api/ai-insights', methods=['POST'])
 def get_ai_insights():
-    """Generate comprehensive AI insights from reviews using OpenAI"""
+    """Generate comprehensive AI insights from reviews (sent, or stored under product_id) using OpenAI"""
     try:
         data = request.json
         reviews = data.get('reviews', [])
+        product_id = data.get('product_id')
+        if not reviews and product_id:
+            reviews = review_store.get_reviews(product_id, source=data.get('source'), limit=REVIEW_STORE_CONTEXT_LIMIT)
         
         if not reviews:
             return jsonify({'error': 'No reviews provided'}), 400
@@ -308,8 +726,9 @@ def get_ai_insights():
             return jsonify({'error': 'OpenAI API key not configured'}), 500
         
         # Prepare reviews text - handle both sentiment formats
+        # Near-duplicates are listed once with a copy count so the 30 slots cover distinct reviews
         reviews_text = []
-        for r in reviews[:30]:
+        for r, copies in dedupe_reviews(reviews, REVIEW_DEDUPE_MAX_DISTANCE)[:30]:
             rating = r.get('rating', 'N/A')
             text = r.get('text', 'No text')
             
@@ -322,7 +741,10 @@ def get_ai_insights():
             else:
                 sentiment = 'unknown'
             
-            reviews_text.append(f"Rating: {rating}/5\nReview: {text}\nSentiment: {sentiment}")
+            entry = f"Rating: {rating}/5\nReview: {text}\nSentiment: {sentiment}"
+            if copies > 1:
+                entry += f"\nPosted {copies} times"
+            reviews_text.append(entry)
         
         reviews_text = "\n\n".join(reviews_text)
         
@@ -395,24 +817,39 @@ Be specific, data-driven, and actionable. Use customer language where relevant.
         print(f"Error generating insights: {e}")
         return jsonify({'error': str(e)}), 500
 
+def _stored_chat_reviews(product_id, question, source=None):
+    """Stored reviews for a chat question: full-text matches first, then the newest reviews"""
+    reviews = review_store.search(product_id, question, source=source, limit=60)
+    seen = {review['review_id'] for review in reviews}
+    for review in review_store.get_reviews(product_id, source=source, limit=REVIEW_STORE_CONTEXT_LIMIT):
+        if review['review_id'] not in seen:
+            seen.add(review['review_id'])
+            reviews.append(review)
+    return reviews
+
 @app.route('/api/chat', methods=['POST'])
 def chat_with_reviews():
-    """Chat assistant for asking questions about reviews using OpenAI"""
+    """Chat assistant for asking questions about reviews (sent, or stored under product_id) using OpenAI"""
     try:
         data = request.json
         question = data.get('question', '')
         reviews = data.get('reviews', [])
         chat_history = data.get('history', [])
+        product_id = data.get('product_id')
         
         if not question:
             return jsonify({'error': 'No question provided'}), 400
         
+        if not reviews and product_id:
+            reviews = _stored_chat_reviews(product_id, question, data.get('source'))
+        
         if not client:
             return jsonify({'error': 'OpenAI API key not configured'}), 500
         
         reviews_text = "\n\n".join([
             f"Rating: {r.get('rating', 'N/A')}/5\nReview: {r.get('text', 'No text')}"
-            for r in reviews[:30]
+            + (f"\nPosted {copies} times" if copies > 1 else "")
+            for r, copies in dedupe_reviews(reviews, REVIEW_DEDUPE_MAX_DISTANCE)[:30]
         ])
         
         messages = [
@@ -448,6 +885,22 @@ Answer questions based on these reviews. Be specific, cite examples when relevan
         print(f"Error in chat: {e}")
         return jsonify({'error': str(e)}), 500
 
+def _format_reddit_review(review, sentiment_result):
+    """Reddit review as returned by the search endpoints"""
+    return {
+        'author': review.get('author'),
+        'text': review.get('text'),
+        'title': review.get('title'),
+        'date': review.get('date'),
+        'score': review.get('score'),
+        'url': review.get('url'),
+        'subreddit': review.get('subreddit'),
+        'type': review.get('type'),
+        'sentiment': sentiment_result['sentiment'],
+        'polarity': sentiment_result['polarity'],
+        'subjectivity': sentiment_result.get('subjectivity', 0.5)
+    }
+
 @app.route('/api/reddit/search', methods=['POST'])
 def reddit_search():
     """Search Reddit for product/place discussions"""
@@ -462,7 +915,7 @@ def reddit_search():
         print(f"🔍 Reddit search for: {query}")
         
         # Scrape Reddit reviews
-        reviews = scrape_reddit_reviews(query, max_reviews=max_reviews)
+        reviews, cache_age = get_source('reddit').fetch_cached(query, max_reviews)
         
         if not reviews:
             return jsonify({
@@ -471,29 +924,23 @@ def reddit_search():
                 'reviews': []
             }), 200
         
-        # Analyze sentiment for each review using AI
-        analyzed_reviews = []
-        for review in reviews:
-            sentiment_result = analyze_sentiment(review.get('text', ''))
-            analyzed_reviews.append({
-                'author': review.get('author'),
-                'text': review.get('text'),
-                'title': review.get('title'),
-                'date': review.get('date'),
-                'score': review.get('score'),
-                'url': review.get('url'),
-                'subreddit': review.get('subreddit'),
-                'type': review.get('type'),
-                'sentiment': sentiment_result['sentiment'],
-                'polarity': sentiment_result['polarity'],
-                'subjectivity': sentiment_result.get('subjectivity', 0.5)
-            })
+        # Analyze sentiment for all reviews in batches using AI
+        sentiments = analyze_sentiment_batch([(review.get('text', ''), None) for review in reviews])
+        review_store.upsert_reviews(make_product_id(query), 'reddit', reviews, sentiments)
+        analyzed_reviews = [
+            _format_reddit_review(review, sentiment_result)
+            for review, sentiment_result in zip(reviews, sentiments)
+        ]
         
         return jsonify({
             'success': True,
             'reviews': analyzed_reviews,
             'total': len(analyzed_reviews),
-            'source': 'reddit'
+            'source': 'reddit',
+            'product_id': make_product_id(query),
+            'cache_age_seconds': round(cache_age, 1),
+            'sentiment_tiers': summarize_sentiment_tiers(sentiments),
+            'duplicate_count': count_duplicates(sentiments)
         })
         
     except Exception as e:
@@ -506,6 +953,197 @@ def reddit_search():
             'reviews': []
         }), 200
 
+SSE_CHUNK_SIZE = int(os.getenv('SSE_CHUNK_SIZE', '10'))
+
+def _sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class StreamCancelled(BaseException):
+    """
+    Raised from a stream's on_review callback once the client has gone away,
+    to stop the scraper (a BaseException so the scrapers' `except Exception`
+    handlers don't swallow it; their finally blocks still release browsers)
+    """
+
+def _stream_scored_reviews(source, scrape, use_rating=True, format_review=None, product_id=None):
+    """
+    Stream reviews as Server-Sent Events while they are scraped and scored
+    
+    The scraper runs in a background thread and hands each review over through
+    its on_review callback. Whatever has arrived is scored together (up to
+    SSE_CHUNK_SIZE reviews) and sent as 'review' events, so the first result
+    arrives after about one review's latency. Only running totals are kept, and
+    a final 'statistics' event carries them. If the client disconnects, the
+    scraper is aborted at its next review.
+    
+    Args:
+        source: Source name reported in the events
+        scrape: Callable taking an on_review callback and running the scraper
+        use_rating: Pass the review's rating to the sentiment analyzer
+        format_review: Optional callable (review, sentiment) -> event payload
+        product_id: Save each scored chunk to the review store under this product ID
+    """
+    pending = queue.Queue()
+    finished = object()
+    cancelled = threading.Event()
+    
+    def on_review(review):
+        if cancelled.is_set():
+            raise StreamCancelled()
+        pending.put(review)
+    
+    def run_scraper():
+        try:
+            scrape(on_review)
+        except StreamCancelled:
+            print(f"🛑 {source} stream closed by client, scraper stopped")
+        except Exception as e:
+            pending.put(e)
+        finally:
+            pending.put(finished)
+    
+    def generate():
+        started = time.perf_counter()
+        first_review_seconds = None
+        error = None
+        sentiment_counts = {'positive': 0, 'neutral': 0, 'negative': 0}
+        tier_counts = {'local': 0, 'llm': 0, 'escalated': 0}
+        total = 0
+        total_polarity = 0.0
+        total_subjectivity = 0.0
+        duplicate_count = 0
+        
+        threading.Thread(target=run_scraper, name=f"{source}-stream", daemon=True).start()
+        yield _sse_event('start', {'source': source})
+        try:
+            done = False
+            while not done:
+                # Block for the next review, then take whatever else is already waiting
+                items = [pending.get()]
+                while len(items) < SSE_CHUNK_SIZE:
+                    try:
+                        items.append(pending.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                reviews = []
+                for item in items:
+                    if item is finished:
+                        done = True
+                    elif isinstance(item, Exception):
+                        error = str(item)
+                    else:
+                        reviews.append(item)
+                if not reviews:
+                    continue
+                
+                sentiments = analyze_sentiment_batch([
+                    (review.get('text', ''), review.get('rating') if use_rating else None) for review in reviews
+                ])
+                if product_id:
+                    review_store.upsert_reviews(product_id, source, reviews, sentiments)
+                for review, sentiment_data in zip(reviews, sentiments):
+                    if first_review_seconds is None:
+                        first_review_seconds = round(time.perf_counter() - started, 3)
+                    total += 1
+                    sentiment_counts[sentiment_data['sentiment']] += 1
+                    total_polarity += sentiment_data.get('polarity', 0)
+                    total_subjectivity += sentiment_data.get('subjectivity', 0)
+                    tier_counts['llm' if sentiment_data.get('tier') == 'llm' else 'local'] += 1
+                    tier_counts['escalated'] += 1 if sentiment_data.get('escalated') else 0
+                    duplicate_count += 1 if sentiment_data.get('duplicate') else 0
+                    
+                    if format_review:
+                        payload = format_review(review, sentiment_data)
+                    else:
+                        payload = dict(review, sentiment=sentiment_data)
+                    yield _sse_event('review', payload)
+            
+            statistics = {
+                'source': source,
+                'product_id': product_id,
+                'total': total,
+                'sentiment_distribution': sentiment_counts,
+                'average_polarity': round(total_polarity / total, 2) if total else 0,
+                'average_subjectivity': round(total_subjectivity / total, 2) if total else 0,
+                'sentiment_tiers': {
+                    'mode': SENTIMENT_MODE,
+                    'local': tier_counts['local'],
+                    'llm': tier_counts['llm'],
+                    'escalated': tier_counts['escalated'],
+                    'escalation_rate': round(tier_counts['escalated'] / total, 3) if total else 0
+                },
+                'duplicate_count': duplicate_count,
+                'time_to_first_review': first_review_seconds,
+                'elapsed_seconds': round(time.perf_counter() - started, 3)
+            }
+            if error:
+                statistics['error'] = error
+            elif not total:
+                statistics['error'] = f"No {source} reviews found"
+            yield _sse_event('statistics', statistics)
+        finally:
+            # Client went away (or we finished): abort the scraper at its next review
+            cancelled.set()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def _stream_request_params(default_query=''):
+    """Read query/max_reviews from a JSON body (POST) or the query string (GET, for EventSource)"""
+    data = request.get_json(silent=True) or request.args
+    try:
+        max_reviews = int(data.get('max_reviews', 50))
+    except (TypeError, ValueError):
+        max_reviews = 50
+    return data.get('query', default_query), max_reviews
+
+@app.route('/api/youtube/search/stream', methods=['GET', 'POST'])
+def search_youtube_stream():
+    """Stream YouTube comments with sentiment as Server-Sent Events"""
+    query, max_reviews = _stream_request_params()
+    if not query:
+        return jsonify({'error': 'Query is required'}), 400
+    
+    print(f"🎥 YouTube stream for: {query}")
+    return _stream_scored_reviews(
+        'youtube',
+        lambda on_review: scrape_youtube_reviews(query, max_reviews=max_reviews, on_review=on_review),
+        use_rating=False,
+        product_id=make_product_id(query)
+    )
+
+@app.route('/api/trustpilot/search/stream', methods=['GET', 'POST'])
+def search_trustpilot_stream():
+    """Stream Trustpilot reviews with sentiment as Server-Sent Events"""
+    query, max_reviews = _stream_request_params('Dr Martens')
+    
+    print(f"🔍 Trustpilot stream for: {query}")
+    return _stream_scored_reviews(
+        'trustpilot',
+        lambda on_review: scrape_trustpilot_reviews(query, max_reviews=max_reviews, on_review=on_review),
+        product_id=make_product_id(query)
+    )
+
+@app.route('/api/reddit/search/stream', methods=['GET', 'POST'])
+def reddit_search_stream():
+    """Stream Reddit discussions with sentiment as Server-Sent Events"""
+    query, max_reviews = _stream_request_params()
+    if not query:
+        return jsonify({'error': 'Query is required'}), 400
+    
+    print(f"🔍 Reddit stream for: {query}")
+    return _stream_scored_reviews(
+        'reddit',
+        lambda on_review: scrape_reddit_reviews(query, max_reviews=max_reviews, on_review=on_review),
+        use_rating=False,
+        format_review=_format_reddit_review,
+        product_id=make_product_id(query)
+    )
+
 @app.route('/api/generate-report', methods=['POST'])
 def generate_report():
     """Generate a professional PDF-ready report using OpenAI"""
@@ -566,99 +1204,13 @@ def combined_analysis():
                 'error': 'Query is required'
             }), 400
         
-        youtube_reviews = []
-        amazon_reviews = []
-        reddit_reviews = []
-        trustpilot_reviews = []
-        
-        # Fetch YouTube reviews
-        try:
-            print(f"🎥 Fetching YouTube reviews for: {query}")
-            youtube_data = scrape_youtube_reviews(query, max_reviews=max_reviews)
-            
-            for review in youtube_data:
-                sentiment_data = analyze_sentiment(review.get('text', ''))
-                youtube_reviews.append({
-                    'author': review.get('author', 'Anonymous'),
-                    'text': review.get('text', ''),
-                    'date': review.get('date', 'Unknown'),
-                    'likes': review.get('likes', 0),
-                    'video_title': review.get('video_title', ''),
-                    'video_url': review.get('video_url', ''),
-                    'sentiment': sentiment_data['sentiment'],
-                    'polarity': sentiment_data['polarity'],
-                    'subjectivity': sentiment_data['subjectivity'],
-                    'source': 'youtube'
-                })
-        except Exception as e:
-            print(f"⚠️ YouTube fetching failed: {e}")
-        
-        # Fetch Amazon reviews
-        try:
-            print(f"🛒 Fetching Amazon reviews for: {query}")
-            product_info, reviews = scrape_amazon_reviews(query, max_reviews=max_reviews)
-            
-            for review in reviews:
-                rating = review.get('rating')
-                sentiment_data = analyze_sentiment(review.get('text', ''), rating=rating)
-                amazon_reviews.append({
-                    'author': review.get('author', 'Anonymous'),
-                    'rating': rating or 0,
-                    'title': review.get('title', ''),
-                    'text': review.get('text', ''),
-                    'date': review.get('date', 'Unknown'),
-                    'verified': review.get('verified', False),
-                    'sentiment': sentiment_data['sentiment'],
-                    'polarity': sentiment_data['polarity'],
-                    'subjectivity': sentiment_data['subjectivity'],
-                    'source': 'amazon'
-                })
-        except Exception as e:
-            print(f"⚠️ Amazon scraping failed: {e}")
-        
-        # Fetch Reddit reviews
-        try:
-            print(f"📱 Fetching Reddit reviews for: {query}")
-            reddit_data = scrape_reddit_reviews(query, max_reviews=max_reviews)
-            
-            for post in reddit_data:
-                sentiment_data = analyze_sentiment(post.get('text', ''))
-                reddit_reviews.append({
-                    'author': post.get('author', 'Anonymous'),
-                    'title': post.get('title', ''),
-                    'text': post.get('text', ''),
-                    'score': post.get('score', 0),
-                    'subreddit': post.get('subreddit', ''),
-                    'date': post.get('date', 'Unknown'),
-                    'sentiment': sentiment_data['sentiment'],
-                    'polarity': sentiment_data['polarity'],
-                    'subjectivity': sentiment_data['subjectivity'],
-                    'source': 'reddit'
-                })
-        except Exception as e:
-            print(f"⚠️ Reddit fetching failed: {e}")
-        
-        # Fetch Trustpilot reviews
-        try:
-            print(f"� Fetching Trustpilot reviews for: {query}")
-            trustpilot_data = scrape_trustpilot_reviews(query, max_reviews=max_reviews)
-            
-            for review in trustpilot_data:
-                sentiment_data = analyze_sentiment(review.get('text', ''), rating=review.get('rating'))
-                trustpilot_reviews.append({
-                    'author': review.get('author', 'Anonymous'),
-                    'rating': review.get('rating', 0),
-                    'title': review.get('title', ''),
-                    'text': review.get('text', ''),
-                    'date': review.get('date', 'Unknown'),
-                    'verified': review.get('verified', False),
-                    'sentiment': sentiment_data['sentiment'],
-                    'polarity': sentiment_data['polarity'],
-                    'subjectivity': sentiment_data['subjectivity'],
-                    'source': 'trustpilot'
-                })
-        except Exception as e:
-            print(f"⚠️ Trustpilot fetching failed: {e}")
+        # All sources at once; each is scored as soon as it finishes
+        results = fan_out(query, max_reviews, analyze_sentiment_batch)
+        youtube_reviews = results['youtube']['reviews']
+        amazon_reviews = results['amazon']['reviews']
+        reddit_reviews = results['reddit']['reviews']
+        trustpilot_reviews = results['trustpilot']['reviews']
+        all_sentiments = [sentiment for result in results.values() for sentiment in result['sentiments']]
         
         # Combine all reviews for overall statistics
         all_reviews = youtube_reviews + amazon_reviews + reddit_reviews + trustpilot_reviews
@@ -714,6 +1266,12 @@ def combined_analysis():
                 'count': len(trustpilot_reviews)
             },
             'combined_statistics': statistics,
+            'product_id': make_product_id(query),
+            'sources': {name: {key: result[key] for key in ('status', 'error', 'fetch_seconds', 'seconds',
+                                                            'cache_age_seconds')}
+                        for name, result in results.items()},
+            'sentiment_tiers': summarize_sentiment_tiers(all_sentiments),
+            'duplicate_count': count_duplicates(all_sentiments),
             'all_reviews': all_reviews  # For AI insights
         })
         
@@ -740,9 +1298,10 @@ def amazon_search():
         # Try real scraping first, fallback to demo data if blocked
         product_info = None
         reviews = []
+        cache_age = None
         
         try:
-            product_info, reviews = scrape_amazon_reviews(product_query, max_reviews=max_reviews)
+            (product_info, reviews), cache_age = get_source('amazon').fetch_cached(product_query, max_reviews)
             print(f"✅ Found {len(reviews)} Amazon reviews")
         except Exception as scrape_error:
             print(f"⚠️ Amazon scraping error: {scrape_error}")
@@ -754,11 +1313,12 @@ def amazon_search():
                 'error': 'No reviews found for this product'
             }), 404
         
-        # Analyze sentiment for each review
+        # Analyze sentiment for all reviews in batches
+        sentiments = analyze_sentiment_batch([(review.get('text', ''), review.get('rating', 0)) for review in reviews])
+        review_store.upsert_reviews(make_product_id(product_query), 'amazon', reviews, sentiments)
         analyzed_reviews = []
-        for review in reviews:
+        for review, sentiment_data in zip(reviews, sentiments):
             rating = review.get('rating', 0)
-            sentiment_data = analyze_sentiment(review.get('text', ''), rating=rating)
             analyzed_reviews.append({
                 'author': review.get('author', 'Anonymous'),
                 'rating': rating,
@@ -776,7 +1336,11 @@ def amazon_search():
             'product_info': product_info,
             'reviews': analyzed_reviews,
             'total': len(analyzed_reviews),
-            'is_demo_data': use_demo
+            'is_demo_data': use_demo,
+            'product_id': make_product_id(product_query),
+            'cache_age_seconds': round(cache_age, 1),
+            'sentiment_tiers': summarize_sentiment_tiers(sentiments),
+            'duplicate_count': count_duplicates(sentiments)
         })
         
     except Exception as e:
@@ -841,90 +1405,45 @@ def competitive_analysis():
         print(f"📊 Product 1: {product_1}")
         print(f"📊 Product 2: {product_2}")
         
-        # Parallel data collection for both products
+        # Every product x source at once; the per-host rate limiter spaces out
+        # repeat hits on the same site (e.g., both products' Trustpilot scrapes)
         from concurrent.futures import ThreadPoolExecutor
         
-        def fetch_all_reviews(product_name):
-            """Fetch reviews from all sources for a product"""
-            product_reviews = {
-                'product_name': product_name,
-                'youtube': [],
-                'amazon': [],
-                'reddit': [],
-                'trustpilot': []
-            }
-            
+        # (query, max_reviews) each source is scraped with
+        competitive_requests = {
+            'youtube': lambda product_name: (f"{product_name} review", 30),
+            'amazon': lambda product_name: (product_name, 20),
+            'reddit': lambda product_name: (product_name, 30),
+            'trustpilot': lambda product_name: (product_name, 30)
+        }
+        sources = get_sources(list(competitive_requests))
+        
+        def fetch_source(product_name, source):
+            """Fetch one source's reviews for a product; returns (reviews, cache age) ([] and None on failure)"""
             try:
-                # YouTube
-                try:
-                    print(f"🎥 Fetching YouTube for: {product_name}")
-                    youtube_reviews = scrape_youtube_reviews(f"{product_name} review", max_reviews=30)
-                    product_reviews['youtube'] = youtube_reviews or []
-                    print(f"✅ YouTube: {len(product_reviews['youtube'])} reviews")
-                except Exception as e:
-                    print(f"⚠️ YouTube error for {product_name}: {e}")
-                
-                # Add delay before next source
-                print("⏳ Waiting 2 seconds before next source...")
-                time.sleep(2)
-                
-                # Amazon
-                try:
-                    print(f"🛒 Fetching Amazon for: {product_name}")
-                    product_info, amazon_reviews = scrape_amazon_reviews(product_name, max_reviews=20)
-                    product_reviews['amazon'] = amazon_reviews or []
-                    print(f"✅ Amazon: {len(product_reviews['amazon'])} reviews")
-                except Exception as e:
-                    print(f"⚠️ Amazon error for {product_name}: {e}")
-                
-                # Add delay before next source
-                print("⏳ Waiting 2 seconds before next source...")
-                time.sleep(2)
-                
-                # Reddit
-                try:
-                    print(f"💬 Fetching Reddit for: {product_name}")
-                    reddit_reviews = scrape_reddit_reviews(product_name, max_reviews=30)
-                    product_reviews['reddit'] = reddit_reviews or []
-                    print(f"✅ Reddit: {len(product_reviews['reddit'])} discussions")
-                except Exception as e:
-                    print(f"⚠️ Reddit error for {product_name}: {e}")
-                
-                # Add longer delay before Trustpilot (Selenium is more sensitive)
-                print("⏳ Waiting 3 seconds before Trustpilot...")
-                time.sleep(3)
-                
-                # Trustpilot (for all supported brands) with retry and fallback
-                print(f"⭐ Fetching Trustpilot for: {product_name}")
-                trustpilot_reviews = []
-                try:
-                    trustpilot_reviews = scrape_trustpilot_reviews(product_name, max_reviews=30, max_retries=2)
-                    
-                    if len(trustpilot_reviews) == 0:
-                        print(f"⚠️ Trustpilot returned 0 reviews for {product_name}")
-                        print(f"   Analysis will continue with other sources")
-                    else:
-                        product_reviews['trustpilot'] = trustpilot_reviews
-                        print(f"✅ Trustpilot: {len(trustpilot_reviews)} reviews")
-                        
-                except Exception as e:
-                    print(f"⚠️ Trustpilot scraping failed completely for {product_name}: {str(e)[:100]}")
-                    print(f"   Continuing with other review sources...")
-                    product_reviews['trustpilot'] = []
-                
+                print(f"{source.label} Fetching {source.name} for: {product_name}")
+                result, age = source.fetch_cached(*competitive_requests[source.name](product_name))
+                reviews = source.reviews_from(result) or []
+                print(f"✅ {source.name}: {len(reviews)} reviews for {product_name}")
+                return reviews, round(age, 1)
             except Exception as e:
-                print(f"❌ Error fetching reviews for {product_name}: {e}")
-            
-            return product_reviews
+                print(f"⚠️ {source.name} error for {product_name}: {str(e)[:100]}")
+                print(f"   Continuing with other review sources...")
+                return [], None
         
-        # Fetch reviews for both products in parallel
         print("🔄 Starting parallel data collection...")
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_product1 = executor.submit(fetch_all_reviews, product_1)
-            future_product2 = executor.submit(fetch_all_reviews, product_2)
-            
-            product1_data = future_product1.result()
-            product2_data = future_product2.result()
+        product_names = [product_1, product_2]
+        collected = [{'product_name': product_name, 'cache_age_seconds': {}, **{source.name: [] for source in sources}}
+                     for product_name in product_names]
+        with ThreadPoolExecutor(max_workers=len(product_names) * len(sources)) as executor:
+            futures = {
+                (index, source.name): executor.submit(fetch_source, product_name, source)
+                for index, product_name in enumerate(product_names)
+                for source in sources
+            }
+            for (index, name), future in futures.items():
+                collected[index][name], collected[index]['cache_age_seconds'][name] = future.result()
+        product1_data, product2_data = collected
         
         print("✅ Data collection complete")
         
@@ -937,13 +1456,18 @@ def competitive_analysis():
             all_reviews.extend(product_data['reddit'])
             all_reviews.extend(product_data['trustpilot'])
             
-            # Analyze sentiment for each review
-            for review in all_reviews:
-                if 'text' in review and review['text']:
-                    sentiment_data = analyze_sentiment(review['text'], review.get('rating'))
-                    review['sentiment'] = sentiment_data['sentiment']
-                    review['polarity'] = sentiment_data.get('polarity', 0)
-                    review['confidence'] = sentiment_data.get('confidence', 0.5)
+            # Analyze sentiment for all reviews with text in batches
+            reviews_with_text = [review for review in all_reviews if 'text' in review and review['text']]
+            sentiments = analyze_sentiment_batch(reviews_with_text)
+            sentiment_by_review = {id(review): sentiment_data for review, sentiment_data in zip(reviews_with_text, sentiments)}
+            for source in sources:
+                review_store.upsert_reviews(make_product_id(product_data['product_name']), source.name,
+                                            product_data[source.name],
+                                            [sentiment_by_review.get(id(review)) for review in product_data[source.name]])
+            for review, sentiment_data in zip(reviews_with_text, sentiments):
+                review['sentiment'] = sentiment_data['sentiment']
+                review['polarity'] = sentiment_data.get('polarity', 0)
+                review['confidence'] = sentiment_data.get('confidence', 0.5)
             
             # Calculate aggregate metrics
             total_reviews = len(all_reviews)
@@ -966,6 +1490,8 @@ def competitive_analysis():
                     'negative_percentage': round((negative_count / total_reviews) * 100, 1),
                     'neutral_percentage': round((neutral_count / total_reviews) * 100, 1),
                     'average_rating': round(avg_rating, 2),
+                    'sentiment_tiers': summarize_sentiment_tiers(sentiments),
+                    'duplicate_count': count_duplicates(sentiments),
                     'sources': {
                         'youtube': len(product_data['youtube']),
                         'amazon': len(product_data['amazon']),
@@ -984,12 +1510,18 @@ def competitive_analysis():
                 'negative_percentage': 0,
                 'neutral_percentage': 0,
                 'average_rating': 0,
+                'sentiment_tiers': summarize_sentiment_tiers([]),
+                'duplicate_count': 0,
                 'sources': {'youtube': 0, 'amazon': 0, 'reddit': 0, 'trustpilot': 0}
             }
         
         print("🔄 Analyzing sentiments...")
-        product1_analysis = analyze_product_reviews(product1_data)
-        product2_analysis = analyze_product_reviews(product2_data)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_analysis1 = executor.submit(analyze_product_reviews, product1_data)
+            future_analysis2 = executor.submit(analyze_product_reviews, product2_data)
+            
+            product1_analysis = future_analysis1.result()
+            product2_analysis = future_analysis2.result()
         
         print(f"✅ Product 1 ({product_1}): {product1_analysis['total_reviews']} reviews")
         print(f"✅ Product 2 ({product_2}): {product2_analysis['total_reviews']} reviews")
@@ -1001,8 +1533,8 @@ def competitive_analysis():
                 print("🤖 Generating AI competitive insights...")
                 
                 # Sample reviews for prompt (max 10 per product)
-                product1_sample = [r['text'][:200] for r in product1_analysis['reviews'][:10] if r.get('text')]
-                product2_sample = [r['text'][:200] for r in product2_analysis['reviews'][:10] if r.get('text')]
+                product1_sample = [r['text'][:200] for r, _ in dedupe_reviews([r for r in product1_analysis['reviews'] if r.get('text')])[:10]]
+                product2_sample = [r['text'][:200] for r, _ in dedupe_reviews([r for r in product2_analysis['reviews'] if r.get('text')])[:10]]
                 
                 # Detect which product is Dr. Martens
                 dr_martens_is_product_1 = 'dr' in product_1.lower() and 'mart' in product_1.lower()
@@ -1187,11 +1719,15 @@ These sentiment metrics MUST be based on the actual review data provided, not es
             'query': query,
             'product_1': {
                 'name': product_1,
-                'analysis': product1_analysis
+                'analysis': product1_analysis,
+                'product_id': make_product_id(product_1),
+                'cache_age_seconds': product1_data['cache_age_seconds']
             },
             'product_2': {
                 'name': product_2,
-                'analysis': product2_analysis
+                'analysis': product2_analysis,
+                'product_id': make_product_id(product_2),
+                'cache_age_seconds': product2_data['cache_age_seconds']
             },
             'ai_insights': ai_insights,
             'comparison_summary': {
@@ -1223,6 +1759,12 @@ if __name__ == '__main__':
         print(f"   - POST /api/competitive-analysis")
         print(f"\n✅ Server is ready!\n")
         
+        # Optionally pre-launch scraper browsers so the first request doesn't pay for start-up
+        prewarm = int(os.getenv('DRIVER_POOL_PREWARM', '0'))
+        if prewarm:
+            print(f"🚀 Pre-launching {prewarm} browser(s) per scraper pool...")
+            warm_pools(prewarm)
+        
         # Use threaded=True to handle multiple requests
         # Use use_reloader=False in production to avoid socket issues
         app.run(
@@ -0,0 +1,104 @@
+"""
+Amazon Fetch Benchmark
+Serves the recorded Amazon pages from a local HTTP server and times the
+HTTP + lxml path against the Selenium path on the same pages. The Selenium
+run is skipped when Chrome isn't available.
+
+Usage:
+    python benchmark_amazon.py --runs 10 --latency 0.2
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read().encode('utf-8')
+
+def start_fixture_server(latency, captcha):
+    """Local stand-in for amazon.com: homepage, /s search and /dp/ product pages"""
+    pages = {name: _fixture(name) for name in
+             ('amazon_home.html', 'amazon_search.html', 'amazon_product.html', 'amazon_captcha.html')}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path == '/':
+                body = pages['amazon_home.html']
+            elif self.path.startswith('/s?'):
+                body = pages['amazon_captcha.html' if captcha else 'amazon_search.html']
+            elif '/dp/' in self.path:
+                body = pages['amazon_product.html']
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if self.path == '/':
+                self.send_header('Set-Cookie', 'session-id=000-0000000-0000000; Path=/')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def time_runs(name, runs, fetch):
+    """Time fetch() runs times; None (after printing why) if it raised"""
+    timings = []
+    reviews = 0
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            _, result = fetch()
+            timings.append(time.perf_counter() - start)
+            reviews = len(result)
+    except Exception as e:
+        print(f"{name:<12} skipped ({str(e).splitlines()[0][:100]})")
+        return None
+    first = timings[0]
+    timings.sort()
+    print(f"{name:<12} runs={runs:<3} reviews={reviews:<3} first={first:.3f}s "
+          f"median={timings[len(timings) // 2]:.3f}s min={timings[0]:.3f}s")
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.1, help='Seconds added to every page response')
+    parser.add_argument('--captcha', action='store_true', help='Serve the robot check on search (exercises the fallback)')
+    parser.add_argument('--skip-selenium', action='store_true')
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.latency, args.captcha)
+    os.environ['AMAZON_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ['AMAZON_COOKIE_FILE'] = os.path.join(tempfile.mkdtemp(), 'amazon_cookies')
+
+    import amazon_scraper  # After AMAZON_BASE_URL is set
+
+    print(f"🛒 Fixture server at {os.environ['AMAZON_BASE_URL']} (latency {args.latency}s)\n")
+    amazon_scraper.AMAZON_HTTP_FETCH = True
+    http_timings = time_runs('http+lxml', args.runs,
+                             lambda: amazon_scraper.scrape_amazon_reviews("Dr Martens 1460 boots"))
+
+    if args.skip_selenium:
+        return
+    amazon_scraper.AMAZON_HTTP_FETCH = False
+    selenium_timings = time_runs('selenium', args.runs,
+                                 lambda: amazon_scraper.scrape_amazon_reviews("Dr Martens 1460 boots"))
+    if not http_timings or not selenium_timings:
+        return
+    speedup = selenium_timings[len(selenium_timings) // 2] / http_timings[len(http_timings) // 2]
+    print(f"\n⚡ HTTP path is {speedup:.1f}x faster (median)")
+
+if __name__ == "__main__":
+    main()
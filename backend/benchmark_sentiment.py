@@ -0,0 +1,194 @@
+"""
+Sentiment Throughput Benchmark
+Drives analyze_sentiment, /api/ai-insights, /api/chat and /api/competitive-analysis
+against the local fake OpenAI server with scrapers replaced by fixture data, and
+reports reviews/second, p50/p95 latency and LLM calls per request
+
+Usage:
+    python benchmark_sentiment.py --latency 0.3 --rate-limit-rate 0.02
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from fake_openai_server import FakeOpenAIServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_corpus():
+    with open(os.path.join(FIXTURES_DIR, 'sentiment_corpus.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def fixture_reviews(corpus, source, product, count):
+    """Review dicts shaped like each scraper's output, built from the corpus"""
+    reviews = []
+    for idx in range(count):
+        text = f"{corpus[idx % len(corpus)]} ({product} #{idx})"
+        rating = (idx % 5) + 1
+        if source == 'youtube':
+            reviews.append({'author': f"viewer{idx}", 'text': text, 'date': '2024-01-01', 'likes': idx,
+                            'video_title': f"{product} review", 'video_url': 'https://youtube.com/watch?v=fixture'})
+        elif source == 'reddit':
+            reviews.append({'author': f"redditor{idx}", 'text': text, 'title': product, 'date': '2024-01-01',
+                            'score': idx, 'url': 'https://reddit.com/r/BuyItForLife', 'subreddit': 'BuyItForLife',
+                            'type': 'post'})
+        else:
+            reviews.append({'author': f"buyer{idx}", 'text': text, 'title': product, 'rating': rating,
+                            'date': '2024-01-01', 'verified': True})
+    return reviews
+
+def patch_scrapers(app_module, corpus):
+    """
+    Replace the network scrapers with fixture-backed stand-ins: the fetch of
+    every registered review source (search, combined and competitive
+    endpoints) and the scrape functions app.py calls directly (streams)
+    """
+    fixtures = {
+        'youtube': lambda query, max_reviews=50: fixture_reviews(corpus, 'youtube', query, max_reviews),
+        'reddit': lambda query, max_reviews=50: fixture_reviews(corpus, 'reddit', query, max_reviews),
+        'trustpilot': lambda query, max_reviews=50, **kwargs: fixture_reviews(corpus, 'trustpilot', query, max_reviews),
+        'amazon': lambda query, max_reviews=50: (
+            {'title': query, 'url': 'https://amazon.com/dp/fixture'},
+            fixture_reviews(corpus, 'amazon', query, max_reviews)
+        )
+    }
+    for source in app_module.get_sources():
+        source.fetch = fixtures[source.name]
+    app_module.scrape_cache.clear()
+    app_module.scrape_youtube_reviews = fixtures['youtube']
+    app_module.scrape_reddit_reviews = fixtures['reddit']
+    app_module.scrape_trustpilot_reviews = fixtures['trustpilot']
+    app_module.scrape_amazon_reviews = fixtures['amazon']
+
+def run_scenario(name, server, app_module, calls, reviews_per_call):
+    """
+    Time each call, with a cold sentiment cache per scenario
+
+    Args:
+        calls: List of zero-argument callables (one per request)
+        reviews_per_call: Reviews handled by each call, for reviews/second
+    """
+    app_module.sentiment_cache.clear()
+    app_module.scrape_cache.clear()
+    server.reset_stats()
+    latencies = []
+    start = time.perf_counter()
+    for call in calls:
+        call_start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    llm_stats = server.stats()
+    llm_calls = llm_stats.get('requests', 0)
+
+    result = {
+        'scenario': name,
+        'requests': len(calls),
+        'seconds': round(elapsed, 3),
+        'reviews_per_second': round(reviews_per_call * len(calls) / elapsed, 1) if reviews_per_call else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'llm_calls': llm_calls,
+        'llm_calls_per_request': round(llm_calls / len(calls), 2) if calls else 0,
+        'rate_limited': llm_stats.get('rate_limited', 0),
+        'errors': llm_stats.get('errors', 0)
+    }
+    print(f"📊 {name}")
+    print(f"   {result['requests']} requests in {result['seconds']}s"
+          + (f" ({result['reviews_per_second']} reviews/s)" if reviews_per_call else ''))
+    print(f"   p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms")
+    print(f"   LLM calls: {llm_calls} ({result['llm_calls_per_request']}/request,"
+          f" {result['rate_limited']} rate limited, {result['errors']} errors)")
+    return result
+
+def post_json(test_client, path, payload):
+    response = test_client.post(path, json=payload)
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response.get_json()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sentiment and insight paths against a fake OpenAI server')
+    parser.add_argument('--latency', type=float, default=0.3, help='Fake server latency per request (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--reviews', type=int, default=300, help='Reviews per batch sentiment run')
+    parser.add_argument('--single', type=int, default=20, help='Reviews scored one by one with analyze_sentiment')
+    parser.add_argument('--iterations', type=int, default=5, help='Requests per endpoint scenario')
+    parser.add_argument('--skip-competitive', action='store_true', help='Skip /api/competitive-analysis')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              rate_limit_rate=args.rate_limit_rate).start()
+
+    # app.py reads its OpenAI settings at import time
+    cache_dir = tempfile.mkdtemp(prefix='sentiment-bench-')
+    os.environ['OPENAI_API_KEY'] = 'fake-key'
+    os.environ['OPENAI_BASE_URL'] = server.base_url
+    os.environ['SENTIMENT_CACHE_PATH'] = os.path.join(cache_dir, 'sentiment_cache.db')
+    os.environ['REVIEW_STORE_PATH'] = os.path.join(cache_dir, 'reviews.db')
+    import app as app_module
+
+    corpus = load_corpus()
+    patch_scrapers(app_module, corpus)
+    test_client = app_module.app.test_client()
+    print(f"🤖 Fake OpenAI at {server.base_url} (latency {args.latency}s ± {args.jitter}s)\n")
+
+    results = []
+    single_texts = [f"{corpus[idx % len(corpus)]} #{idx}" for idx in range(args.single)]
+    batch_items = [(f"{corpus[idx % len(corpus)]} #{idx}", (idx % 5) + 1) for idx in range(args.reviews)]
+
+    for mode in ('ai', 'cascade'):
+        results.append(run_scenario(
+            f"analyze_sentiment ({mode}, one review per call)", server, app_module,
+            [lambda text=text, mode=mode: app_module.analyze_sentiment(text, mode=mode) for text in single_texts], 1
+        ))
+        results.append(run_scenario(
+            f"analyze_sentiment_batch ({mode}, {args.reviews} reviews)", server, app_module,
+            [lambda mode=mode: app_module.analyze_sentiment_batch(batch_items, mode=mode)], args.reviews
+        ))
+
+    insight_reviews = fixture_reviews(corpus, 'amazon', 'Dr Martens 1460', 30)
+    results.append(run_scenario(
+        "/api/ai-insights", server, app_module,
+        [lambda: post_json(test_client, '/api/ai-insights', {'reviews': insight_reviews})] * args.iterations,
+        len(insight_reviews)
+    ))
+    results.append(run_scenario(
+        "/api/chat", server, app_module,
+        [lambda: post_json(test_client, '/api/chat', {
+            'question': 'What do people complain about most?',
+            'reviews': insight_reviews,
+            'history': []
+        })] * args.iterations,
+        len(insight_reviews)
+    ))
+
+    if not args.skip_competitive:
+        # youtube 30 + amazon 20 + reddit 30 + trustpilot 30 per product
+        results.append(run_scenario(
+            "/api/competitive-analysis", server, app_module,
+            [lambda: post_json(test_client, '/api/competitive-analysis', {'query': 'Dr Martens 1460 vs Timberland 6 inch'})] * max(1, args.iterations // 2),
+            2 * (30 + 20 + 30 + 30)
+        ))
+
+    server.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
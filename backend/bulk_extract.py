@@ -0,0 +1,354 @@
+"""
+Bulk Review Extraction
+Reads every review card on the page in a single execute_script round trip,
+instead of scrollIntoView + click + dozens of find_element calls per card.
+Sites describe their cards with a field map; Trustpilot's heuristics need
+their own extract function but share the same expand-and-read harness.
+The same field maps can be applied to HTML fetched without a browser (lxml).
+"""
+import re
+from functools import lru_cache
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+# Clicks every expand ("Read more") button inside the cards, waits for the DOM
+# to settle, then returns extract(card) for each card. The site's extract
+# function is substituted for %s.
+_HARNESS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const cards = Array.from(document.querySelectorAll(arguments[0])).slice(0, arguments[1]);
+const expandSelector = arguments[2], quietMs = arguments[3], timeoutMs = arguments[4], fields = arguments[5];
+
+const clean = (el) => (el.innerText || el.textContent || '').trim();
+
+%s
+
+let quietTimer = null, hardTimer = null, finished = false;
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done(cards.map(extract));
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+
+let clicked = 0;
+if (expandSelector) {
+    for (const card of cards) {
+        const button = card.querySelector(expandSelector);
+        if (button) {
+            try { button.click(); clicked++; } catch (e) {}
+        }
+    }
+}
+if (!clicked) {
+    finish();
+} else {
+    quietTimer = setTimeout(finish, quietMs);
+    hardTimer = setTimeout(finish, timeoutMs);
+}
+"""
+
+# Generic extract for a field map: each field takes the first non-empty value
+# among its selectors
+_FIELD_MAP_EXTRACT = """
+function readValue(el, read) {
+    if (read === 'exists') return true;
+    if (read === 'content') return (el.textContent || el.innerText || '').trim();
+    if (read.startsWith('attr:')) return el.getAttribute(read.slice(5));
+    return clean(el);
+}
+
+function extract(card) {
+    const row = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        let value = null;
+        for (const selector of spec.selectors) {
+            const el = card.querySelector(selector);
+            if (!el) continue;
+            const v = readValue(el, spec.read);
+            if (v) { value = v; break; }
+        }
+        row[name] = value;
+    }
+    return row;
+}
+"""
+
+# Mirrors the per-element extraction in trustpilot_scraper._read_review_card
+_TRUSTPILOT_EXTRACT = """
+const TITLE_SELECTORS = [
+    'h2[data-service-review-title-typography]',
+    'h2[class*="title"]',
+    'h3[class*="title"]',
+    '[data-service-review-title]'
+];
+const TEXT_SELECTORS = [
+    'p[data-service-review-text-typography]',
+    'div[data-service-review-text]',
+    'p[class*="typography_body"]',
+    '[data-review-content-body]'
+];
+const AUTHOR_SELECTORS = [
+    'span[data-consumer-name-typography]',
+    'a[data-consumer-profile-link]',
+    '[data-consumer-name]'
+];
+
+function extract(card) {
+    let rating = null;
+    const ratingImg = card.querySelector('div[data-service-review-rating] img');
+    const alt = ratingImg ? (ratingImg.getAttribute('alt') || '') : '';
+    if (alt.includes('Rated')) {
+        rating = parseInt(alt.split(/\\s+/)[1], 10);
+        if (isNaN(rating)) rating = null;
+    } else {
+        const filled = Array.from(card.querySelectorAll('img[alt*="star"]')).filter((img) => {
+            const src = (img.getAttribute('src') || '').toLowerCase();
+            return src.includes('filled') || src.includes('full');
+        });
+        if (filled.length) rating = filled.length;
+    }
+
+    let title = '';
+    for (const selector of TITLE_SELECTORS) {
+        const el = card.querySelector(selector);
+        if (!el) continue;
+        title = clean(el);
+        if (title && title.length > 3) break;
+    }
+    if (!title) {
+        for (const h of card.querySelectorAll('h2, h3')) {
+            const t = clean(h);
+            if (t && t.length > 3) { title = t; break; }
+        }
+    }
+
+    let text = '';
+    for (const selector of TEXT_SELECTORS) {
+        const texts = Array.from(card.querySelectorAll(selector)).map(clean).filter((t) => t.length > 10);
+        if (texts.length) { text = texts.join(' '); break; }
+    }
+    if (text.length < 20) {
+        const paras = Array.from(card.querySelectorAll('p')).map(clean).filter((t) =>
+            t.length > 15 && !t.includes('Date of experience') && !t.includes('Report'));
+        if (paras.length) text = paras.join(' ');
+    }
+    if (text.length < 20) {
+        const lines = clean(card).split('\\n').map((l) => l.trim()).filter((l) =>
+            l.length > 15 && !l.includes('Date of experience') && !l.includes('Report') &&
+            !l.includes('Helpful') && !/^\\d+$/.test(l));
+        if (lines.length) text = lines.slice(0, 5).join(' ');
+    }
+
+    let author = null;
+    for (const selector of AUTHOR_SELECTORS) {
+        const el = card.querySelector(selector);
+        if (!el) continue;
+        author = clean(el);
+        if (author) break;
+    }
+
+    const time = card.querySelector('time');
+    const datetime = time ? time.getAttribute('datetime') : null;
+
+    return {
+        rating: rating,
+        title: title,
+        text: text,
+        author: author,
+        date: datetime ? datetime.slice(0, 10) : null,
+        verified: !!card.querySelector('div[data-service-review-verification-badge], [data-verification-badge]')
+    };
+}
+"""
+
+def _run_harness(driver, extract_js, card_selector, limit, expand_selector, quiet, timeout, fields=None):
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(
+        _HARNESS_SCRIPT % extract_js, card_selector, limit, expand_selector,
+        int(quiet * 1000), int(timeout * 1000), fields
+    ) or []
+
+def extract_trustpilot_cards(driver, card_selector, limit=100, quiet=0.15, timeout=2):
+    """
+    Expand and read Trustpilot review cards in one WebDriver round trip
+
+    Args:
+        driver: Selenium WebDriver on a Trustpilot review page
+        card_selector: CSS selector that matched the review cards
+        limit: Maximum number of cards to read
+        quiet: Seconds without DOM changes after clicking "Read more" before reading
+        timeout: Upper bound on the wait for expanded cards
+
+    Returns:
+        List of dicts with rating, title, text, author, date, verified
+        (author/date are None when the card has none)
+    """
+    return _run_harness(driver, _TRUSTPILOT_EXTRACT, card_selector, limit,
+                        "button[class*='show-more'], button[class*='ShowMore'], button[data-show-more-trigger]",
+                        quiet, timeout)
+
+def _read_value(element, read):
+    if read == 'exists':
+        return True
+    if read == 'content':
+        return (element.get_attribute('textContent') or element.text or '').strip()
+    if read.startswith('attr:'):
+        return element.get_attribute(read[5:])
+    return element.text.strip()
+
+def read_card_fields(element, fields):
+    """
+    Per-element version of the field-map extract (fallback when the script fails)
+
+    Returns:
+        Dict of raw values: the first non-empty value among each field's
+        selectors, or None
+    """
+    row = {}
+    for name, spec in fields.items():
+        row[name] = None
+        for selector in spec['selectors']:
+            try:
+                value = _read_value(element.find_element(By.CSS_SELECTOR, selector), spec.get('read', 'text'))
+            except NoSuchElementException:
+                continue
+            if value:
+                row[name] = value
+                break
+    return row
+
+def finalize_row(row, fields):
+    """Apply each field's parse and default to a raw row"""
+    review = {}
+    for name, spec in fields.items():
+        value = row.get(name)
+        if spec.get('read') == 'exists':
+            review[name] = bool(value)
+            continue
+        if value and spec.get('parse'):
+            try:
+                value = spec['parse'](value)
+            except (TypeError, ValueError):
+                value = None
+        review[name] = value if value not in (None, '') else spec.get('default')
+    return review
+
+def extract_reviews(driver, card_selector, fields, expand_selector=None, limit=100, quiet=0.15, timeout=2):
+    """
+    Read review cards described by a field map, in one round trip when possible
+
+    Args:
+        driver: Selenium WebDriver on the review page
+        card_selector: CSS selector for one review card
+        fields: Field map, {name: {'selectors': [...], 'read': 'text' | 'content' |
+            'attr:<name>' | 'exists', 'parse': callable, 'default': value}};
+            selectors are tried in order and the first non-empty value wins
+        expand_selector: "More"/"Read more" button inside a card, clicked before reading
+        limit: Maximum number of cards to read
+        quiet: Seconds without DOM changes after expanding before reading
+        timeout: Upper bound on the wait for expanded cards
+
+    Returns:
+        List of review dicts with one key per field
+    """
+    script_fields = {name: {'selectors': spec['selectors'], 'read': spec.get('read', 'text')}
+                     for name, spec in fields.items()}
+    try:
+        rows = _run_harness(driver, _FIELD_MAP_EXTRACT, card_selector, limit, expand_selector,
+                            quiet, timeout, script_fields)
+    except WebDriverException as e:
+        print(f"⚠️ Bulk extraction failed, reading cards one by one: {str(e)[:100]}")
+        rows = []
+        for element in driver.find_elements(By.CSS_SELECTOR, card_selector)[:limit]:
+            try:
+                if expand_selector:
+                    for button in element.find_elements(By.CSS_SELECTOR, expand_selector)[:1]:
+                        driver.execute_script("arguments[0].click();", button)
+                rows.append(read_card_fields(element, fields))
+            except WebDriverException as card_error:
+                print(f"   ⚠️ Error extracting review: {str(card_error)[:100]}")
+    return [finalize_row(row, fields) for row in rows]
+
+_COMPOUND_RE = re.compile(r"""
+    (?P<tag>^[a-zA-Z][\w-]*|^\*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[(?P<attr>[\w-]+)(?:(?P<op>[\^*]?=)['"]?(?P<val>[^'"\]]*)['"]?)?\]
+""", re.VERBOSE)
+
+@lru_cache(maxsize=256)
+def css_to_xpath(selector):
+    """
+    Translate the simple CSS selectors used in the field maps to XPath for lxml
+
+    Supports tag, #id, .class, [attr], [attr='v'], [attr^='v'], [attr*='v'],
+    descendant combinators and comma-separated groups.
+    """
+    groups = []
+    for group in selector.split(','):
+        steps = []
+        for compound in group.split():
+            pos = 0
+            tag = '*'
+            predicates = []
+            while pos < len(compound):
+                match = _COMPOUND_RE.match(compound, pos)
+                if not match or match.end() == pos:
+                    raise ValueError(f"Unsupported CSS selector: {selector}")
+                pos = match.end()
+                if match.group('tag'):
+                    tag = match.group('tag')
+                elif match.group('id'):
+                    predicates.append(f"[@id='{match.group('id')}']")
+                elif match.group('cls'):
+                    predicates.append(f"[contains(concat(' ', normalize-space(@class), ' '), ' {match.group('cls')} ')]")
+                elif match.group('op') == '=':
+                    predicates.append(f"[@{match.group('attr')}='{match.group('val')}']")
+                elif match.group('op') == '^=':
+                    predicates.append(f"[starts-with(@{match.group('attr')}, '{match.group('val')}')]")
+                elif match.group('op') == '*=':
+                    predicates.append(f"[contains(@{match.group('attr')}, '{match.group('val')}')]")
+                else:
+                    predicates.append(f"[@{match.group('attr')}]")
+            steps.append(tag + ''.join(predicates))
+        groups.append('.//' + '//'.join(steps))
+    return ' | '.join(groups)
+
+def html_select(element, selector):
+    """lxml elements under element matching a CSS selector, in document order"""
+    return element.xpath(css_to_xpath(selector))
+
+def _read_html_value(element, read):
+    if read == 'exists':
+        return True
+    if read.startswith('attr:'):
+        return element.get(read[5:])
+    return ' '.join(element.text_content().split())
+
+def read_html_fields(element, fields):
+    """
+    Field-map extract for an lxml element (pages fetched without a browser)
+
+    Returns:
+        Dict of raw values, like read_card_fields; pass it to finalize_row
+    """
+    row = {}
+    for name, spec in fields.items():
+        row[name] = None
+        for selector in spec['selectors']:
+            matches = html_select(element, selector)
+            if not matches:
+                continue
+            value = _read_html_value(matches[0], spec.get('read', 'text'))
+            if value:
+                row[name] = value
+                break
+    return row
@@ -0,0 +1,207 @@
+"""
+API Client Registry
+Builds each API client (YouTube, Reddit, OpenAI) once per process and hands
+the same instance to every request, instead of re-reading the discovery
+document / redoing the OAuth handshake per call. Clients are rebuilt when
+a caller reports a failure and the health check (if any) says so.
+Clients that can't be shared between threads (PRAW) are registered as a
+ClientPool and leased to one thread at a time.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+class _Entry:
+    def __init__(self, factory, health_check, health_interval):
+        self.factory = factory
+        self.health_check = health_check
+        self.health_interval = health_interval
+        self.lock = threading.Lock()
+        self.client = None
+        self.suspect = False
+        self.last_check = 0.0
+        self.stats = {
+            'builds': 0,
+            'reuses': 0,
+            'build_seconds': 0.0,
+            'health_checks': 0,
+            'recreated': 0
+        }
+
+class ClientRegistry:
+    """
+    Thread-safe registry of lazily built, shared API clients
+
+    Each client has its own lock, so a slow build of one (e.g., an OAuth
+    handshake) doesn't block requests that need another.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def register(self, name, factory, health_check=None, health_interval=None):
+        """
+        Register a client factory (re-registering an existing name is a no-op)
+
+        Args:
+            name: Client name used by get() and in metrics
+            factory: Zero-argument callable that builds the client
+            health_check: Optional callable(client) -> bool; False or an exception means rebuild
+            health_interval: Seconds between routine health checks (None: only after report_failure)
+        """
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _Entry(factory, health_check, health_interval)
+
+    def get(self, name, record=True):
+        """
+        The shared client for name, building it on first use or after a failed health check
+
+        Args:
+            record: Count this call as a reuse in the metrics
+        """
+        entry = self._entries[name]
+        client = entry.client
+        if client is not None and not self._needs_check(entry):
+            if record:
+                self._bump(entry, 'reuses')
+            return client
+
+        with entry.lock:
+            if entry.client is not None and self._needs_check(entry):
+                if not self._healthy(entry):
+                    print(f"♻️ Re-creating {name} client (health check failed)")
+                    entry.client = None
+                    self._bump(entry, 'recreated')
+            if entry.client is None:
+                start = time.monotonic()
+                entry.client = entry.factory()
+                elapsed = time.monotonic() - start
+                entry.suspect = False
+                entry.last_check = time.monotonic()
+                with self._lock:
+                    entry.stats['builds'] += 1
+                    entry.stats['build_seconds'] += elapsed
+                print(f"🔌 Built {name} client in {elapsed:.2f}s")
+            elif record:
+                self._bump(entry, 'reuses')
+            return entry.client
+
+    def report_failure(self, name):
+        """Mark a client as suspect; the next get() health-checks it (or rebuilds it if it has no check)"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            entry.suspect = True
+
+    def invalidate(self, name):
+        """Drop a client so the next get() rebuilds it"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            with entry.lock:
+                if entry.client is not None:
+                    entry.client = None
+                    self._bump(entry, 'recreated')
+
+    def stats(self):
+        """
+        Per-client counters, including setup time saved: every reuse skips one
+        build, estimated at the average build time
+        """
+        with self._lock:
+            entries = {name: dict(entry.stats) for name, entry in self._entries.items()}
+        for stats in entries.values():
+            avg = stats['build_seconds'] / stats['builds'] if stats['builds'] else 0.0
+            stats['avg_build_seconds'] = round(avg, 3)
+            stats['build_seconds'] = round(stats['build_seconds'], 3)
+            stats['setup_seconds_saved'] = round(avg * stats['reuses'], 2)
+        return entries
+
+    def _needs_check(self, entry):
+        if entry.suspect:
+            return True
+        return entry.health_interval is not None and time.monotonic() - entry.last_check >= entry.health_interval
+
+    def _healthy(self, entry):
+        """Run the health check; without one, a reported failure means rebuild"""
+        entry.last_check = time.monotonic()
+        if entry.health_check is None:
+            return not entry.suspect
+        self._bump(entry, 'health_checks')
+        try:
+            healthy = bool(entry.health_check(entry.client))
+        except Exception as e:
+            print(f"⚠️ Health check failed: {str(e)[:100]}")
+            healthy = False
+        if healthy:
+            entry.suspect = False
+        return healthy
+
+    def _bump(self, entry, key):
+        with self._lock:
+            entry.stats[key] += 1
+
+class ClientProxy:
+    """
+    Stand-in for a registered client that resolves it on every attribute access,
+    so module-level references pick up a re-created client
+    """
+
+    def __init__(self, registry, name):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name, record=False), attr)
+
+class ClientPool:
+    """
+    Clients of a library that isn't thread-safe, leased to one thread at a
+    time; returned clients (and their auth tokens) are kept for the next lease
+
+    Args:
+        name: Pool name used in logs
+        factory: Zero-argument callable that builds one client
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._idle = []
+        self.built = 0
+
+    def acquire(self):
+        """An idle client, or a new one if every client is leased"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.built += 1
+        print(f"🔌 Building {self.name} client #{self.built}")
+        return self.factory()
+
+    def release(self, client):
+        with self._lock:
+            self._idle.append(client)
+
+    @contextmanager
+    def lease(self):
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+registry = ClientRegistry()
+
+def register_client(name, factory, health_check=None, health_interval=None):
+    registry.register(name, factory, health_check, health_interval)
+
+def get_client(name):
+    return registry.get(name)
+
+def report_client_failure(name):
+    registry.report_failure(name)
+
+def client_stats():
+    return registry.stats()
@@ -0,0 +1,292 @@
+"""
+Selenium WebDriver Pool
+Keeps pre-launched, stealth-configured Chrome sessions warm and leases them
+to the scrapers, so a request doesn't pay several seconds of browser start-up
+"""
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from host_rate_limiter import host_limiter
+
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '2'))              # Idle browsers kept per pool
+DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', '20'))               # Recycle after this many leases
+DRIVER_MAX_MEMORY_MB = int(os.getenv('DRIVER_MAX_MEMORY_MB', '512'))    # Recycle when the JS heap grows past this
+DRIVER_IDLE_TIMEOUT = float(os.getenv('DRIVER_IDLE_TIMEOUT', '600'))    # Quit browsers idle longer than this (seconds)
+DRIVER_MAX_PER_HOST = int(os.getenv('DRIVER_MAX_PER_HOST', '2'))        # Concurrent sessions against one site
+
+@lru_cache(maxsize=1)
+def chromedriver_path():
+    """Resolve chromedriver once per process instead of on every driver start"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+_host_lock = threading.Lock()
+_host_semaphores = {}
+
+def _host_semaphore(host):
+    with _host_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(DRIVER_MAX_PER_HOST)
+        return _host_semaphores[host]
+
+class _PooledDriver:
+    """A browser plus its bookkeeping"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.idle_since = time.monotonic()
+
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions built by one factory (e.g., a scraper's setup_driver)
+
+    Args:
+        name: Pool name used in logs and metrics
+        factory: Zero-argument callable returning a configured WebDriver
+        max_idle: Idle browsers kept for reuse
+        max_uses: Leases before a browser is recycled
+        max_memory_mb: JS heap size that triggers a recycle
+        idle_timeout: Seconds an idle browser is kept before it is quit
+    """
+
+    def __init__(self, name, factory, max_idle=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES,
+                 max_memory_mb=DRIVER_MAX_MEMORY_MB, idle_timeout=DRIVER_IDLE_TIMEOUT):
+        self.name = name
+        self.factory = factory
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._idle = []
+        self._leased = {}
+        self._stats = {
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'discarded': 0,
+            'leases': 0,
+            'startup_seconds': 0.0,
+            'host_wait_seconds': 0.0
+        }
+
+    def acquire(self, host=None):
+        """
+        Lease a browser, waiting for a free per-host slot (and a token from
+        the host's rate limit) when host is given
+
+        Always pair with release(); lease() does this for you.
+        """
+        if host:
+            wait_start = time.monotonic()
+            _host_semaphore(host).acquire()
+            self._bump('host_wait_seconds', time.monotonic() - wait_start)
+            host_limiter.acquire(host)
+
+        try:
+            entry = self._take_idle()
+            if entry is None:
+                entry = self._create()
+            else:
+                self._bump('reused')
+        except Exception:
+            if host:
+                _host_semaphore(host).release()
+            raise
+
+        entry.uses += 1
+        with self._lock:
+            self._leased[id(entry.driver)] = (entry, host)
+            self._stats['leases'] += 1
+        return entry.driver
+
+    def release(self, driver, discard=False):
+        """
+        Return a leased browser; it is reset and kept warm unless it is broken,
+        over its use/memory limits or the pool is full
+        """
+        with self._lock:
+            entry, host = self._leased.pop(id(driver), (None, None))
+        try:
+            if entry is None:
+                self._quit(driver)
+                return
+            if discard:
+                self._bump('discarded')
+                self._quit(driver)
+                return
+            reason = self._recycle_reason(entry)
+            if reason is None:
+                try:
+                    self._reset(driver)
+                except Exception as e:
+                    reason = f"reset failed: {str(e)[:80]}"
+            if reason is not None:
+                print(f"♻️ Recycling {self.name} browser ({reason})")
+                self._bump('recycled')
+                self._quit(driver)
+                return
+            entry.idle_since = time.monotonic()
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(entry)
+                    return
+            self._quit(driver)
+        finally:
+            if host:
+                _host_semaphore(host).release()
+
+    @contextmanager
+    def lease(self, host=None):
+        """Context manager around acquire/release; a browser that raised is discarded"""
+        driver = self.acquire(host)
+        failed = False
+        try:
+            yield driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(driver, discard=failed)
+
+    def warm(self, count=None):
+        """Launch browsers in the background until count (default max_idle) are idle"""
+        count = self.max_idle if count is None else min(count, self.max_idle)
+
+        def run():
+            while True:
+                with self._lock:
+                    if len(self._idle) >= count:
+                        return
+                try:
+                    entry = self._create()
+                except Exception as e:
+                    print(f"⚠️ Could not pre-launch {self.name} browser: {e}")
+                    return
+                with self._lock:
+                    self._idle.append(entry)
+
+        threading.Thread(target=run, name=f"{self.name}-warm", daemon=True).start()
+
+    def close(self):
+        """Quit every idle browser"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._quit(entry.driver)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = len(self._idle)
+            stats['leased'] = len(self._leased)
+        stats['startup_seconds'] = round(stats['startup_seconds'], 2)
+        stats['host_wait_seconds'] = round(stats['host_wait_seconds'], 2)
+        return stats
+
+    def _take_idle(self):
+        """Pop a healthy idle browser, quitting expired or dead ones"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                entry = self._idle.pop()
+            if time.monotonic() - entry.idle_since > self.idle_timeout:
+                self._bump('recycled')
+                self._quit(entry.driver)
+                continue
+            try:
+                entry.driver.current_url  # Cheap liveness check
+                return entry
+            except Exception:
+                self._bump('discarded')
+                self._quit(entry.driver)
+
+    def _create(self):
+        start = time.monotonic()
+        driver = self.factory()
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self._stats['created'] += 1
+            self._stats['startup_seconds'] += elapsed
+        print(f"🚀 Launched {self.name} browser in {elapsed:.1f}s")
+        return _PooledDriver(driver)
+
+    def _recycle_reason(self, entry):
+        if entry.uses >= self.max_uses:
+            return f"{entry.uses} uses"
+        heap_mb = _js_heap_mb(entry.driver)
+        if heap_mb is not None and heap_mb > self.max_memory_mb:
+            return f"{heap_mb:.0f} MB heap"
+        return None
+
+    def _reset(self, driver):
+        """Close extra tabs and clear cookies/storage so the next lease starts clean"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # about:blank and some origins have no storage
+        driver.delete_all_cookies()
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            pass
+        driver.get('about:blank')
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️ Error closing {self.name} browser: {e}")
+
+    def _bump(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+def _js_heap_mb(driver):
+    """Used JS heap of the current page in MB, or None if Chrome won't say"""
+    try:
+        used = driver.execute_script("return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;")
+        return used / (1024 * 1024) if used else None
+    except Exception:
+        return None
+
+_pools_lock = threading.Lock()
+_pools = {}
+
+def get_pool(name, factory):
+    """Shared pool for name, created on first use"""
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = DriverPool(name, factory)
+        return _pools[name]
+
+def pool_stats():
+    """Stats for every pool that has been created"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
+
+def warm_pools(count=None):
+    """Pre-launch browsers for every registered pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.warm(count)
+
+@atexit.register
+def _close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,328 @@
+"""
+Fake OpenAI Server
+Local OpenAI-compatible chat completions endpoint for benchmarks and offline
+tests. Returns schema-valid JSON for the prompts app.py sends, with
+configurable latency, server errors and 429 rate limiting.
+
+Usage:
+    python fake_openai_server.py --port 8089 --latency 0.3 --rate-limit-rate 0.05
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python app.py
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import client_registry
+from keyword_matcher import count_keywords
+
+ATTRIBUTES = ('quality', 'comfort', 'durability', 'style', 'price', 'value_for_money',
+              'break_in_period', 'overall_satisfaction')
+
+def _label(text):
+    """Deterministic sentiment label from keyword counts"""
+    negative_count, positive_count = count_keywords(text)
+    if positive_count > negative_count:
+        return 'positive'
+    if negative_count > positive_count:
+        return 'negative'
+    return 'neutral'
+
+def _sentiment_entry(text):
+    sentiment = _label(text)
+    return {
+        'sentiment': sentiment,
+        'confidence': 0.6 if sentiment == 'neutral' else 0.9,
+        'reasoning': f"Review reads as {sentiment}"
+    }
+
+def _batch_sentiment(user_content):
+    """Answer a numbered batch prompt ("Review 0:\\n...") with one entry per review"""
+    parts = re.split(r'(?:^|\n\n)Review (\d+):\n', user_content)
+    results = []
+    # re.split yields [preamble, index, text, index, text, ...]
+    for idx, text in zip(parts[1::2], parts[2::2]):
+        entry = _sentiment_entry(text)
+        entry['index'] = int(idx)
+        results.append(entry)
+    return {'results': results}
+
+def _insights():
+    return {
+        'executive_summary': 'Customers like the look and durability but many struggle with the break-in period.',
+        'key_themes': [
+            {'theme': 'Durability', 'sentiment': 'positive', 'frequency': 'high', 'description': 'Boots last for years'},
+            {'theme': 'Break-in', 'sentiment': 'negative', 'frequency': 'high', 'description': 'Stiff leather at first'},
+            {'theme': 'Style', 'sentiment': 'positive', 'frequency': 'medium', 'description': 'Iconic look'},
+            {'theme': 'Quality control', 'sentiment': 'mixed', 'frequency': 'low', 'description': 'Occasional defects'}
+        ],
+        'strengths': [
+            {'strength': 'Iconic style', 'impact': 'high', 'examples': 'Go with everything'},
+            {'strength': 'Durability', 'impact': 'high', 'examples': 'Still wearing them after years'},
+            {'strength': 'Comfort once broken in', 'impact': 'medium', 'examples': 'Like slippers now'}
+        ],
+        'pain_points': [
+            {'issue': 'Painful break-in', 'severity': 'high', 'recommendation': 'Include break-in guidance'},
+            {'issue': 'Inconsistent quality', 'severity': 'medium', 'recommendation': 'Tighten QC checks'},
+            {'issue': 'Price', 'severity': 'low', 'recommendation': 'Communicate long-term value'}
+        ],
+        'recommendations': [
+            {'priority': 'high', 'action': 'Publish a break-in guide', 'expected_impact': 'Fewer early returns'},
+            {'priority': 'medium', 'action': 'Audit sole bonding', 'expected_impact': 'Fewer defect complaints'},
+            {'priority': 'medium', 'action': 'Promote durability stories', 'expected_impact': 'Higher perceived value'},
+            {'priority': 'low', 'action': 'Offer half sizes', 'expected_impact': 'Better fit'}
+        ],
+        'customer_personas': [
+            {'type': 'Loyalist', 'characteristics': 'Owns several pairs', 'needs': 'Consistent quality'},
+            {'type': 'First-time buyer', 'characteristics': 'Drawn by style', 'needs': 'Comfort guidance'}
+        ],
+        'sentiment_drivers': {
+            'positive_drivers': ['Style', 'Durability', 'Comfort after break-in'],
+            'negative_drivers': ['Break-in pain', 'Defects', 'Price']
+        },
+        'competitive_insights': {
+            'unique_strengths': 'Recognisable design',
+            'areas_for_improvement': 'Out-of-box comfort',
+            'market_positioning': 'Premium heritage brand'
+        },
+        'trend_analysis': {
+            'emerging_patterns': 'More comments on quality consistency',
+            'seasonal_factors': 'Autumn purchase peak',
+            'prediction': 'Comfort will matter more'
+        }
+    }
+
+def _competitive_insights():
+    sentiment = {'positive_count': 6, 'negative_count': 2, 'positive_pct': 75.0, 'negative_pct': 25.0}
+    return {
+        'head_to_head_comparison': {
+            attribute: {
+                'winner': 'Dr. Martens',
+                'reasoning': f"More positive mentions of {attribute.replace('_', ' ')}",
+                'dr_martens_sentiment': dict(sentiment),
+                'competitor_sentiment': dict(sentiment)
+            } for attribute in ATTRIBUTES
+        },
+        'dr_martens_strengths': ['Style', 'Durability', 'Brand heritage'],
+        'dr_martens_weaknesses': ['Break-in', 'Price', 'Quality consistency'],
+        'competitor_strengths': ['Out-of-box comfort', 'Waterproofing', 'Price'],
+        'competitor_weaknesses': ['Less distinctive style', 'Heavier', 'Sizing'],
+        'competitive_advantages': 'Distinctive design and long lifespan',
+        'competitive_threats': 'Competitor wins on day-one comfort',
+        'target_audience': {
+            'dr_martens_best_for': 'Style-led buyers',
+            'competitor_best_for': 'Outdoor and work use'
+        },
+        'price_value_analysis': 'Comparable price, value depends on lifespan',
+        'strategic_recommendations_for_dr_martens': '1. Reduce break-in 2. Tighten QC 3. Market durability',
+        'market_positioning': 'Fashion-forward heritage boot',
+        'customer_preference_insights': 'Style versus comfort drives the choice',
+        'executive_summary': 'Dr. Martens leads on style. The competitor leads on comfort. Focus on break-in.'
+    }
+
+def build_completion(payload):
+    """
+    Produce the assistant message content for a chat completion payload
+
+    Returns:
+        (kind, content) where kind names the prompt type that was recognised
+    """
+    messages = payload.get('messages', [])
+    system = next((m.get('content', '') for m in messages if m.get('role') == 'system'), '')
+    user = messages[-1].get('content', '') if messages else ''
+
+    if 'sentiment analyzer' in system and '"results"' in system:
+        return 'sentiment_batch', json.dumps(_batch_sentiment(user))
+    if 'sentiment analyzer' in system:
+        return 'sentiment', json.dumps(_sentiment_entry(user))
+    if 'business intelligence analyst' in system:
+        return 'insights', json.dumps(_insights())
+    if 'competitive intelligence analyst' in system:
+        return 'competitive', json.dumps(_competitive_insights())
+    if 'report writer' in system:
+        return 'report', "# Executive Summary\n\nCustomers value style and durability.\n\n## Recommendations\n\n1. Improve break-in comfort"
+    if payload.get('response_format', {}).get('type') == 'json_object':
+        return 'json', json.dumps({'result': 'ok'})
+    return 'chat', "Most reviewers praise the durability, while the main complaint is the break-in period."
+
+class FakeOpenAIServer:
+    """
+    Threaded fake of the chat completions API
+
+    Args:
+        port: Port to bind (0 picks a free port)
+        latency: Seconds each request takes
+        jitter: Extra random latency, up to this many seconds
+        error_rate: Fraction of requests answered with a 500
+        rate_limit_rate: Fraction of requests answered with a 429
+        retry_after: Seconds suggested in the 429 retry-after header
+        seed: Random seed so runs are repeatable
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.2, jitter=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, retry_after=0.5, seed=42):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._thread = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+                    return
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    self._send(400, {'error': {'message': 'Invalid JSON', 'type': 'invalid_request_error'}})
+                    return
+                status, response, headers = server._respond(payload)
+                self._send(status, response, headers)
+
+            def _send(self, status, response, headers=None):
+                raw = json.dumps(response).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(raw)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        """Serve in a background thread; returns self"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self):
+        """Requests received, by prompt kind and outcome"""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts.clear()
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def _respond(self, payload):
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + self._random.random() * self.jitter
+        time.sleep(delay)
+        self._count('requests')
+
+        if roll < self.rate_limit_rate:
+            self._count('rate_limited')
+            return 429, {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'}}, {
+                'retry-after-ms': str(int(self.retry_after * 1000))
+            }
+        if roll < self.rate_limit_rate + self.error_rate:
+            self._count('errors')
+            return 500, {'error': {'message': 'Injected server error', 'type': 'server_error'}}, None
+
+        kind, content = build_completion(payload)
+        self._count(kind)
+        prompt_tokens = sum(len(str(m.get('content', ''))) for m in payload.get('messages', [])) // 4
+        completion_tokens = len(content) // 4
+        return 200, {
+            'id': f"chatcmpl-fake-{time.time_ns()}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }, None
+
+@contextmanager
+def fake_openai_app(server, **settings):
+    """
+    A fresh import of app.py talking to server, with its caches in a temp dir
+
+    app.py reads its settings at import time, so the environment (plus any extra
+    settings, e.g. SENTIMENT_MODE='cascade') is patched around the import. The
+    environment, client registry and any previously imported app module are
+    restored on exit.
+    """
+    previous = sys.modules.pop('app', None)
+    try:
+        # The registry is process-wide and ignores re-registration: give this app its own OpenAI client
+        with mock.patch.dict(client_registry.registry._entries), \
+                tempfile.TemporaryDirectory(prefix='fake-openai-app-') as cache_dir, mock.patch.dict(os.environ, {
+            'OPENAI_API_KEY': 'fake-key',
+            'OPENAI_BASE_URL': server.base_url,
+            'SENTIMENT_CACHE_PATH': os.path.join(cache_dir, 'sentiment_cache.db'),
+            'REVIEW_STORE_PATH': os.path.join(cache_dir, 'reviews.db'),
+            **settings
+        }):
+            client_registry.registry._entries.pop('openai', None)
+            yield importlib.import_module('app')
+    finally:
+        sys.modules.pop('app', None)
+        if previous is not None:
+            sys.modules['app'] = previous
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fake OpenAI chat completions server')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=0.5)
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after)
+    print(f"🤖 Fake OpenAI server on {fake.base_url}")
+    print(f"   Set OPENAI_API_KEY=fake OPENAI_BASE_URL={fake.base_url}")
+    try:
+        fake.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping fake OpenAI server")
+        fake.httpd.server_close()
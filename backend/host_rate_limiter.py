@@ -0,0 +1,133 @@
+"""
+Per-Host Rate Limiter
+Token buckets keyed by host, shared by every request, so scrapes of
+different sites run at once while each site keeps its politeness limit.
+The scrapers take a token per HTTP request (Trustpilot and Amazon pages)
+and per browser lease. Subdomains share their site's bucket
+(uk.trustpilot.com counts against trustpilot.com). Waits are recorded per
+host for tuning (reported by /api/metrics).
+"""
+import math
+import os
+import threading
+import time
+
+# Requests (page fetches / browser leases) per second and burst size, per host.
+# The YouTube Data API and Reddit API are paced by the quota ledger and
+# X-Ratelimit headers instead.
+DEFAULT_HOST_LIMITS = {
+    'amazon.com': (1.0, 3),
+    'trustpilot.com': (2.0, 4)
+}
+DEFAULT_LIMIT = (1.0, 2)
+
+def parse_host_limits(spec):
+    """
+    Parse "host=rate/burst,host=rate/burst" (e.g., "amazon.com=0.5/2")
+
+    Entries that don't parse, or whose rate isn't a positive number or burst is below 1,
+    are skipped (the host keeps its default limit)
+
+    Returns:
+        {host: (rate per second, burst)}
+    """
+    limits = {}
+    for part in (spec or '').split(','):
+        if '=' not in part:
+            continue
+        host, limit = part.split('=', 1)
+        rate, _, burst = limit.partition('/')
+        try:
+            rate, burst = float(rate), int(burst or 1)
+        except ValueError:
+            print(f"⚠️ Ignoring bad HOST_RATE_LIMITS entry: {part.strip()}")
+            continue
+        if not (rate > 0 and math.isfinite(rate)) or burst < 1:  # TokenBucket divides and multiplies by the rate
+            print(f"⚠️ Ignoring HOST_RATE_LIMITS entry without a positive rate and burst: {part.strip()}")
+            continue
+        limits[host.strip()] = (rate, burst)
+    return limits
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """
+        Take amount tokens now, going into debt if needed; returns the seconds
+        the caller must wait before using them (callers queue up in order)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+class HostRateLimiter:
+    """
+    Token bucket per host
+
+    Args:
+        limits: {host: (rate per second, burst)}
+        default: (rate, burst) for hosts not in limits
+    """
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT):
+        self.limits = dict(limits or {})
+        self.default = default
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._stats = {}
+
+    def limit_key(self, host):
+        """Bucket for host: the configured site it belongs to (www.amazon.com -> amazon.com), else host"""
+        for key in self.limits:
+            if host == key or host.endswith('.' + key):
+                return key
+        return host
+
+    def acquire(self, host):
+        """Wait for host's next slot; returns seconds waited"""
+        host = self.limit_key(host)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(*self.limits.get(host, self.default))
+                self._stats[host] = {'acquired': 0, 'waited': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+            bucket, stats = self._buckets[host], self._stats[host]
+
+        delay = bucket.reserve()
+        with self._lock:
+            stats['acquired'] += 1
+            if delay > 0:
+                stats['waited'] += 1
+                stats['wait_seconds'] += delay
+                stats['max_wait_seconds'] = max(stats['max_wait_seconds'], delay)
+        if delay > 0:
+            print(f"⏳ Waiting {delay:.1f}s for {host} rate limit")
+            time.sleep(delay)
+        return delay
+
+    def stats(self):
+        """Per-host acquisitions and time spent waiting"""
+        with self._lock:
+            result = {}
+            for host, stats in self._stats.items():
+                rate, burst = self.limits.get(host, self.default)
+                result[host] = {
+                    **stats,
+                    'wait_seconds': round(stats['wait_seconds'], 2),
+                    'max_wait_seconds': round(stats['max_wait_seconds'], 2),
+                    'rate_per_second': rate,
+                    'burst': burst
+                }
+            return result
+
+# Shared by all Flask threads
+host_limiter = HostRateLimiter({**DEFAULT_HOST_LIMITS, **parse_host_limits(os.getenv('HOST_RATE_LIMITS'))})
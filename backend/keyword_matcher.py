@@ -0,0 +1,119 @@
+"""
+Sentiment Keyword Matcher
+Counts positive/negative keyword hits with one precompiled regex pass per text
+instead of a separate substring scan for every keyword
+"""
+import re
+
+# Enhanced keyword lists for better detection
+NEGATIVE_KEYWORDS = (
+    'disappointed', 'frustrat', 'terrible', 'awful', 'horrible', 'worst',
+    'broken', 'defective', 'poor', 'bad', 'never', 'waste', 'useless',
+    'angry', 'annoying', 'annoyed', 'upset', 'unhappy', 'unsatisfied',
+    'misleading', 'lied', 'fake', 'scam', 'fraud', 'avoid', 'warning',
+    'regret', 'hate', 'disappoint', 'not recommend', 'don\'t buy',
+    'cheap', 'poorly made', 'fell apart', 'uncomfortable', 'painful'
+)
+
+POSITIVE_KEYWORDS = (
+    'excellent', 'amazing', 'love', 'perfect', 'great', 'awesome',
+    'fantastic', 'wonderful', 'best', 'recommend', 'happy', 'satisfied',
+    'quality', 'comfortable', 'beautiful', 'impressed', 'exceeded',
+    'worth', 'favorite', 'highly recommend', 'outstanding', 'superb',
+    'pleased', 'delighted', 'brilliant', 'sturdy', 'durable', 'stylish'
+)
+
+def _trie_pattern(keywords):
+    """
+    Build a regex alternation factored as a prefix trie
+    ('disappoint(?:ed)?', 'd(?:efective|urable|...)') so each position costs a
+    single branch lookup instead of trying every keyword; optional suffixes are
+    greedy, so the longest keyword starting at a position wins
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+def _build_matcher(negative_keywords, positive_keywords):
+    """
+    Compile all keywords into one regex plus lookup tables
+
+    Keywords are matched as substrings (same semantics as `word in text`) and each
+    keyword counts at most once per text. A non-overlapping scan finds the longest
+    keyword at each match position; shorter keywords contained in it ('disappoint'
+    in 'disappointed', 'recommend' in 'not recommend') are implied by the match,
+    and the rare keywords that could start inside a match and run past its end
+    ('recommend' + 'disappointed') are checked directly. This keeps the counts
+    identical to scanning each keyword separately.
+    """
+    keywords = list(dict.fromkeys(negative_keywords + positive_keywords))
+    pattern = re.compile(_trie_pattern(keywords))
+
+    implied = {}
+    overlapping = {}
+    for keyword in keywords:
+        implied[keyword] = frozenset(k for k in keywords if k in keyword)
+        # Keywords that can start inside this one and run past its end
+        overlapping[keyword] = tuple(
+            k for k in keywords if k not in keyword
+            and any(k.startswith(keyword[offset:]) for offset in range(max(1, len(keyword) - len(k) + 1), len(keyword)))
+        )
+    return pattern, implied, overlapping
+
+_PATTERN, _IMPLIED, _OVERLAPPING = _build_matcher(NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS)
+_NEGATIVE = frozenset(NEGATIVE_KEYWORDS)
+_POSITIVE = frozenset(POSITIVE_KEYWORDS)
+
+def _tally(matched, text_lower):
+    """Expand the set of matched keywords into (negative_count, positive_count)"""
+    found = set()
+    pending = list(matched)
+    while pending:
+        keyword = pending.pop()
+        if keyword in found:
+            continue
+        found.add(keyword)
+        found |= _IMPLIED[keyword]
+        pending.extend(k for k in _OVERLAPPING[keyword] if k not in found and k in text_lower)
+    return len(found & _NEGATIVE), len(found & _POSITIVE)
+
+def count_keywords(text):
+    """
+    Count distinct negative and positive keywords present in text
+
+    Returns:
+        Tuple of (negative_count, positive_count)
+    """
+    text_lower = text.lower()
+    return _tally(set(_PATTERN.findall(text_lower)), text_lower)
+
+def count_keywords_batch(texts):
+    """
+    Count keywords for a whole list of texts
+
+    Args:
+        texts: List of review texts
+
+    Returns:
+        List of (negative_count, positive_count) tuples in input order
+    """
+    findall = _PATTERN.findall
+    counts = []
+    for text in texts:
+        text_lower = (text or '').lower()
+        counts.append(_tally(set(findall(text_lower)), text_lower))
+    return counts
@@ -0,0 +1,303 @@
+"""
+Vectorized Lexicon Polarity Engine
+Batch polarity/subjectivity scoring with TextBlob's pattern lexicon, computed
+over a whole corpus at once instead of one TextBlob per review
+"""
+import re
+import numpy as np
+from textblob._text import (ABBREVIATIONS, EMOTICONS, EOS, PUNCTUATION,
+                            RE_ABBR1, RE_ABBR2, RE_ABBR3, RE_EMOTICONS, RE_SARCASM)
+from textblob.en import sentiment as pattern_sentiment
+
+# Same negations the pattern analyzer recognises ("n't" never survives its tokenizer)
+NEGATIONS = ('no', 'not', 'never')
+
+# Reserved token ids for words that are not in the lexicon
+_UNKNOWN_LONG = 0   # len > 2: clears a pending modifier and negation
+_UNKNOWN_MID = 1    # len == 2: keeps a pending modifier ("really is good")
+_UNKNOWN_SHORT = 2  # len <= 1: keeps modifier and negation ("not a good")
+_EXCLAMATION = 3    # "!" boosts the previous assessment
+_SARCASM = 4        # "(!)" adds a neutral, fully subjective assessment
+_RESERVED = 5
+
+# How far an unknown token lets a pending negation / modifier reach past it
+_REACH = {_UNKNOWN_LONG: 0, _UNKNOWN_MID: 1, _UNKNOWN_SHORT: 2, _EXCLAMATION: 2, _SARCASM: 0}
+
+# Tokenizer rules, mirroring pattern's find_tokens
+_LEADING = tuple(PUNCTUATION.replace('.', ''))
+_TRAILING = _LEADING + ('.',)
+_LEADING_CHARS, _TRAILING_CHARS = frozenset(_LEADING), frozenset(_TRAILING)
+_SENTENCE_END = frozenset(('...', '.', '!', '?', EOS))
+_SENTENCE_TAIL = frozenset(("'", '"', '”', '’', '...', '.', '!', '?', ')', EOS))
+_QUOTES = ('“', '”', '‘', '’', "'", '"')
+_PARAGRAPH = re.compile(r"\n{2,}")
+
+def _join_emoticon(match):
+    return match.group(1).replace(' ', '') + match.group(2)
+
+def _is_abbreviation(token):
+    return (token in ABBREVIATIONS or RE_ABBR1.match(token) is not None or
+            RE_ABBR2.match(token) is not None or RE_ABBR3.match(token) is not None)
+
+def pattern_tokens(text):
+    """
+    Tokenize a text exactly as TextBlob's pattern analyzer does
+
+    Args:
+        text: Review text
+
+    Returns:
+        List of lowercased tokens
+    """
+    # Quote spacing below splits "'d", "'s", ... anyway; only "n't" needs its own rule
+    text = text.replace("n't", " n't")
+    for quote in _QUOTES:
+        text = text.replace(quote, f" {quote} ")
+    text = _PARAGRAPH.sub(f" {EOS} ", text.replace('\r\n', '\n'))
+
+    # Split punctuation off the words, keeping abbreviations ("e.g.") whole
+    tokens = []
+    for token in text.split():
+        if token[0] not in _LEADING_CHARS and token[-1] not in _TRAILING_CHARS:
+            tokens.append(token)
+            continue
+        tail = []
+        while token.startswith(_LEADING):
+            tokens.append(token[0])
+            token = token[1:]
+        while token.endswith(_TRAILING):
+            if token.endswith(_LEADING):
+                tail.append(token[-1])
+                token = token[:-1]
+            if token.endswith('...'):
+                tail.append('...')
+                token = token[:-3].rstrip('.')
+            if token.endswith('.'):
+                if _is_abbreviation(token):
+                    break
+                tail.append(token[-1])
+                token = token[:-1]
+        if token:
+            tokens.append(token)
+        tokens.extend(reversed(tail))
+
+    # Sentences matter only for where emoticons and "(!)" may be glued back together
+    sentences, i, j = [], 0, 0
+    for end in [k for k, token in enumerate(tokens) if token in _SENTENCE_END]:
+        if end < j:
+            continue
+        j = end
+        while j < len(tokens) and tokens[j] in _SENTENCE_TAIL:
+            # Pattern's balanced-quote check always sees an empty sentence here
+            if tokens[j] in ("'", '"'):
+                break
+            j += 1
+        sentences.append([t for t in tokens[i:j] if t != EOS])
+        i = j
+        j += 1
+    sentences.append(tokens[i:])
+
+    words = []
+    for sentence in sentences:
+        if sentence:
+            sentence = RE_EMOTICONS.sub(_join_emoticon, RE_SARCASM.sub('(!)', ' '.join(sentence)))
+            words.extend(sentence.lower().split())
+    return words
+
+class LexiconPolarityEngine:
+    """Scores many texts at once with array lookups into the pattern lexicon"""
+
+    def __init__(self):
+        vocab = {'!': _EXCLAMATION, '(!)': _SARCASM}
+        polarity, subjectivity, intensity = [0.0] * _RESERVED, [0.0] * _RESERVED, [1.0] * _RESERVED
+        known, modifier, modifier_ly = [False] * _RESERVED, [False] * _RESERVED, [False] * _RESERVED
+        negation, emoticon = [False] * _RESERVED, [False] * _RESERVED
+        reach = [_REACH[i] for i in range(_RESERVED)]
+
+        def add(word, p=0.0, s=0.0, i=1.0, is_known=False, is_modifier=False,
+                is_negation=False, is_emoticon=False):
+            vocab[word] = len(polarity)
+            polarity.append(p)
+            subjectivity.append(s)
+            intensity.append(i)
+            known.append(is_known)
+            modifier.append(is_modifier)
+            modifier_ly.append(is_modifier and word.endswith('ly'))
+            negation.append(is_negation)
+            emoticon.append(is_emoticon)
+            reach.append(0 if len(word) > 2 else 1 if len(word) == 2 else 2)
+
+        # Lexicon entries averaged over all parts of speech, as TextBlob uses them
+        if not dict.__len__(pattern_sentiment):
+            pattern_sentiment.load()
+        for word, senses in dict.items(pattern_sentiment):
+            p, s, i = senses[None]
+            add(word, p, s, i, is_known=True, is_modifier='RB' in senses,
+                is_negation=word in NEGATIONS)
+
+        for word in NEGATIONS:
+            if word not in vocab:
+                add(word, is_negation=True)
+
+        # Emoticons are matched lowercased; the first mood listing a face wins.
+        # Pattern skips alphabetic tokens, so "XD" is never an emoticon
+        for (_, score), faces in EMOTICONS.items():
+            for face in faces:
+                face = face.lower()
+                if face not in vocab and not face.isalpha() and len(face) <= 5 and face not in PUNCTUATION:
+                    add(face, score, 1.0, 1.0, is_emoticon=True)
+
+        self.vocab = vocab
+        self.polarity = np.array(polarity)
+        self.subjectivity = np.array(subjectivity)
+        self.intensity = np.array(intensity)
+        self.known = np.array(known)
+        self.modifier = np.array(modifier)
+        self.modifier_ly = np.array(modifier_ly)
+        self.negation = np.array(negation)
+        self.emoticon = np.array(emoticon)
+        self.reach = np.array(reach)
+
+    def tokenize(self, texts):
+        """
+        Tokenize a corpus into one flat id array
+
+        Returns:
+            Tuple of (token_ids, doc_index) int arrays
+        """
+        vocab_get = self.vocab.get
+        ids = []
+        lengths = []
+        for text in texts:
+            tokens = pattern_tokens(text or '')
+            lengths.append(len(tokens))
+            for token in tokens:
+                token_id = vocab_get(token)
+                if token_id is None:
+                    if len(token) <= 1:
+                        token_id = _UNKNOWN_SHORT
+                    elif len(token) == 2:
+                        token_id = _UNKNOWN_MID
+                    else:
+                        token_id = _UNKNOWN_LONG
+                ids.append(token_id)
+        token_ids = np.array(ids, dtype=np.int64)
+        doc_index = np.repeat(np.arange(len(texts)), lengths)
+        return token_ids, doc_index
+
+    def assess(self, ids, doc):
+        """
+        Group tokens into scored assessments, following the pattern analyzer's rules:
+        a modifier merges into the next known word ("very good"), a negation flips it
+        ("not good", "not a good"), "really not good" negates the modifier's chunk,
+        and "!" boosts the previous assessment
+
+        Returns:
+            Tuple of (polarity, subjectivity, doc_index) arrays, one entry per assessment
+        """
+        # Plain unknown words only matter while a modifier or negation is pending:
+        # skip those at the start of a review or after a long unknown word
+        n = len(ids)
+        positions = np.arange(n)
+        active = (self.known[ids] | self.negation[ids] | self.emoticon[ids] |
+                  (ids == _EXCLAMATION) | (ids == _SARCASM))
+        clears = ~active & (self.reach[ids] == 0)
+        last_event = np.full(n, -1)
+        last_event[1:] = np.maximum.accumulate(np.where(active | clears, positions, -1))[:-1]
+        doc_start = np.searchsorted(doc, doc)
+        idle = (last_event < doc_start) | clears[np.maximum(last_event, 0)]
+        keep = active | ~idle
+
+        polarity, subjectivity, intensity = self.polarity.tolist(), self.subjectivity.tolist(), self.intensity.tolist()
+        is_known, is_modifier, is_modifier_ly = self.known.tolist(), self.modifier.tolist(), self.modifier_ly.tolist()
+        is_negation, is_emoticon, reach = self.negation.tolist(), self.emoticon.tolist(), self.reach.tolist()
+
+        a_doc, a_p, a_s, a_i, a_negated = [], [], [], [], []
+        current, start = -1, 0
+        m = m_ly = n = False
+        for d, t in zip(doc[keep].tolist(), ids[keep].tolist()):
+            if d != current:
+                current, start = d, len(a_p)
+                m = m_ly = n = False
+            if is_known[t]:
+                if not m:
+                    a_doc.append(d)
+                    a_p.append(polarity[t])
+                    a_s.append(subjectivity[t])
+                    a_i.append(intensity[t])
+                    a_negated.append(False)
+                else:
+                    # "very good": the modifier's intensity scales the word it modifies
+                    a_p[-1] = max(-1.0, min(polarity[t] * a_i[-1], +1.0))
+                    a_s[-1] = max(-1.0, min(subjectivity[t] * a_i[-1], +1.0))
+                    a_i[-1] = intensity[t]
+                if n:
+                    a_i[-1] = 1.0 / a_i[-1]
+                    a_negated[-1] = True
+                m, m_ly, n = is_modifier[t], is_modifier_ly[t], is_negation[t]
+                continue
+            if is_negation[t]:
+                n = True
+            elif n and reach[t] < 2:
+                n = False
+            if n and m_ly:
+                # "really not good": the negation lands on the "really" chunk
+                a_negated[-1] = True
+                n = False
+            elif m and reach[t] == 0:
+                m = m_ly = False
+            if t == _EXCLAMATION:
+                if len(a_p) > start:
+                    a_p[-1] = max(-1.0, min(a_p[-1] * 1.25, +1.0))
+            elif t == _SARCASM or is_emoticon[t]:
+                a_doc.append(d)
+                a_p.append(polarity[t])
+                a_s.append(1.0 if t == _SARCASM else subjectivity[t])
+                a_i.append(1.0)
+                a_negated.append(False)
+
+        # "not good" = slightly bad, "not bad" = slightly good
+        pol = np.array(a_p)
+        pol = np.where(np.array(a_negated, dtype=bool), pol * -0.5, pol)
+        return pol, np.array(a_s), np.array(a_doc, dtype=np.int64)
+
+    def score(self, texts):
+        """
+        Polarity and subjectivity for every text
+
+        Args:
+            texts: List of review texts
+
+        Returns:
+            Tuple of (polarity, subjectivity) float arrays, one entry per text
+        """
+        n_docs = len(texts)
+        ids, doc = self.tokenize(texts)
+        pol, subj, rows = self.assess(ids, doc)
+        if len(rows) == 0:
+            return np.zeros(n_docs), np.zeros(n_docs)
+
+        counts = np.bincount(rows, minlength=n_docs)
+        polarity = np.bincount(rows, weights=pol, minlength=n_docs)
+        subjectivity = np.bincount(rows, weights=subj, minlength=n_docs)
+        divisor = np.maximum(counts, 1)
+        return polarity / divisor, subjectivity / divisor
+
+_engine = None
+
+def get_engine():
+    """Shared engine instance (the lexicon is loaded on first use)"""
+    global _engine
+    if _engine is None:
+        _engine = LexiconPolarityEngine()
+    return _engine
+
+def polarity_batch(texts):
+    """
+    Score a list of texts
+
+    Returns:
+        List of (polarity, subjectivity) float tuples in input order
+    """
+    polarity, subjectivity = get_engine().score(list(texts))
+    return list(zip(polarity.tolist(), subjectivity.tolist()))
@@ -0,0 +1,234 @@
+"""
+Page Readiness Engine
+Event-driven waits for the Selenium scrapers, used instead of fixed sleeps:
+selector waits, network idle from Chrome's CDP performance log, and a
+MutationObserver that reports when a scroll or click has finished changing
+the page. Every wait has its own timeout and is timed in readiness_metrics.
+"""
+import json
+import threading
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Chrome capability that records CDP Network events in the 'performance' log
+PERFORMANCE_LOGGING = {'performance': 'ALL'}
+
+POLL_SECONDS = 0.1
+
+class ReadinessMetrics:
+    """Per-wait timing counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = {}
+
+    def record(self, name, seconds, timed_out=False):
+        with self._lock:
+            stats = self._waits.setdefault(name, {'count': 0, 'timeouts': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            stats['count'] += 1
+            stats['timeouts'] += 1 if timed_out else 0
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def stats(self):
+        with self._lock:
+            waits = {name: dict(stats) for name, stats in self._waits.items()}
+        for stats in waits.values():
+            stats['avg_seconds'] = round(stats['total_seconds'] / stats['count'], 3)
+            stats['total_seconds'] = round(stats['total_seconds'], 3)
+            stats['max_seconds'] = round(stats['max_seconds'], 3)
+        return waits
+
+readiness_metrics = ReadinessMetrics()
+
+def wait_until(driver, condition, timeout=10, name='condition'):
+    """
+    WebDriverWait on condition, recorded under name
+
+    Returns:
+        The condition's truthy result, or None on timeout
+    """
+    start = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_SECONDS).until(condition)
+        readiness_metrics.record(name, time.monotonic() - start)
+        return result
+    except TimeoutException:
+        readiness_metrics.record(name, time.monotonic() - start, timed_out=True)
+        return None
+
+def wait_for_selector(driver, selectors, timeout=10, name='selector'):
+    """
+    Wait until any of the CSS selectors matches, trying them in order
+
+    Returns:
+        (selector, elements) for the first selector that matched, or (None, [])
+    """
+    if isinstance(selectors, str):
+        selectors = [selectors]
+
+    def find_any(d):
+        for selector in selectors:
+            elements = d.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                return selector, elements
+        return False
+
+    return wait_until(driver, find_any, timeout, name) or (None, [])
+
+def _drain_network_log(driver):
+    """Discard buffered CDP events so the next wait only sees the new page"""
+    try:
+        driver.get_log('performance')
+    except WebDriverException:
+        pass
+
+def wait_for_network_idle(driver, idle_seconds=0.5, max_in_flight=2, timeout=10, name='network_idle'):
+    """
+    Wait until the document has loaded and the network has been quiet for idle_seconds
+
+    Uses CDP Network.* events from the 'performance' log when the driver was
+    started with PERFORMANCE_LOGGING; allows max_in_flight long-lived requests
+    (analytics beacons, long polls). Without the log it falls back to watching
+    the Resource Timing entry count.
+
+    Returns:
+        True when idle, False on timeout
+    """
+    start = time.monotonic()
+    last_activity = start
+    in_flight = set()
+    use_log = True
+    resource_count = -1
+
+    while True:
+        now = time.monotonic()
+        if use_log:
+            try:
+                entries = driver.get_log('performance')
+            except WebDriverException:
+                use_log = False
+                continue
+            for entry in entries:
+                try:
+                    message = json.loads(entry['message'])['message']
+                except (KeyError, ValueError):
+                    continue
+                method = message.get('method', '')
+                request_id = message.get('params', {}).get('requestId')
+                if method == 'Network.requestWillBeSent':
+                    in_flight.add(request_id)
+                    last_activity = now
+                elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                    in_flight.discard(request_id)
+                    last_activity = now
+            state = driver.execute_script("return document.readyState")
+            quiet = len(in_flight) <= max_in_flight
+        else:
+            state, count = driver.execute_script(
+                "return [document.readyState, performance.getEntriesByType('resource').length];"
+            )
+            if count != resource_count:
+                resource_count = count
+                last_activity = now
+            quiet = True
+
+        if state == 'complete' and quiet and now - last_activity >= idle_seconds:
+            readiness_metrics.record(name, now - start)
+            return True
+        if now - start >= timeout:
+            readiness_metrics.record(name, now - start, timed_out=True)
+            return False
+        time.sleep(POLL_SECONDS)
+
+def load_page(driver, url, ready_selectors=None, timeout=10, name='page'):
+    """
+    Navigate to url and wait for it to be usable: network idle, then (optionally)
+    one of ready_selectors present
+
+    Returns:
+        (selector, elements) when ready_selectors are given, else None
+    """
+    _drain_network_log(driver)
+    start = time.monotonic()
+    driver.get(url)
+    wait_for_network_idle(driver, timeout=timeout, name=f"{name}_network_idle")
+    if ready_selectors:
+        remaining = max(0.5, timeout - (time.monotonic() - start))
+        return wait_for_selector(driver, ready_selectors, timeout=remaining, name=f"{name}_ready")
+    return None
+
+_MUTATION_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const target = arguments[0] || document.body;
+const firstChangeMs = arguments[1], quietMs = arguments[2], timeoutMs = arguments[3];
+const extra = Array.prototype.slice.call(arguments, 4, arguments.length - 1);
+let added = 0, finished = false, quietTimer = null;
+const finish = (timedOut) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done({added: added, timedOut: !!timedOut});
+};
+const observer = new MutationObserver((mutations) => {
+    for (const m of mutations) added += m.addedNodes.length;
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(false), quietMs);
+});
+observer.observe(target, {childList: true, subtree: true, characterData: true});
+const hardTimer = setTimeout(() => finish(true), timeoutMs);
+// Give up early if nothing changes at all
+quietTimer = setTimeout(() => finish(false), firstChangeMs);
+try {
+    %s
+} catch (e) {}
+"""
+
+def wait_for_mutations(driver, action='', target=None, args=(), first_change_timeout=3, quiet=0.3,
+                       timeout=8, name='mutations'):
+    """
+    Run an optional JavaScript action and wait for the DOM to settle
+
+    A MutationObserver is attached before the action runs. The wait ends when
+    no mutation arrives within first_change_timeout, or once mutations have been
+    quiet for quiet seconds, or after timeout.
+
+    Args:
+        action: JavaScript run after the observer is attached; can use `target`
+            (the observed element) and `extra` (the args list)
+        target: Element to observe (default document.body)
+        args: Extra values (e.g., elements) exposed to the action as `extra`
+
+    Returns:
+        Number of nodes added while waiting
+    """
+    start = time.monotonic()
+    script = _MUTATION_SCRIPT % action
+    try:
+        driver.set_script_timeout(timeout + 2)
+        result = driver.execute_async_script(
+            script, target, int(first_change_timeout * 1000), int(quiet * 1000), int(timeout * 1000), *args
+        ) or {}
+    except WebDriverException:
+        result = {'added': 0, 'timedOut': True}
+    readiness_metrics.record(name, time.monotonic() - start, timed_out=result.get('timedOut', False))
+    return result.get('added', 0)
+
+def scroll_and_wait(driver, container=None, fraction=1.0, first_change_timeout=3, quiet=0.4, timeout=8, name='scroll'):
+    """
+    Scroll the window (or a scrollable container) and wait until lazily
+    loaded content has finished arriving
+
+    Returns:
+        Number of nodes the scroll added (0 means nothing more loaded)
+    """
+    if container is None:
+        action = f"window.scrollTo(0, document.body.scrollHeight * {fraction});"
+    else:
+        action = f"target.scrollTop = target.scrollHeight * {fraction};"
+    return wait_for_mutations(driver, action, target=container, first_change_timeout=first_change_timeout,
+                              quiet=quiet, timeout=timeout, name=name)
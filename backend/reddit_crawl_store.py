@@ -0,0 +1,110 @@
+"""
+Reddit Crawl Store
+Remembers, per query, every submission already crawled (subreddit,
+created_utc and the reviews taken from it) so a refresh only has to fetch
+submissions newer than each subreddit's high-watermark. Submissions whose
+comments couldn't be fetched are kept for retry: they hold the watermark below them
+"""
+import json
+import sqlite3
+import threading
+import time
+
+def normalize_query(query):
+    return ' '.join((query or '').lower().split())
+
+class RedditCrawlStore:
+    """SQLite record of crawled submissions; disabled (everything looks new) if the file can't be opened"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS reddit_submissions (
+                    query TEXT NOT NULL,
+                    submission_id TEXT NOT NULL,
+                    subreddit TEXT NOT NULL,
+                    created_utc REAL NOT NULL,
+                    reviews TEXT NOT NULL,
+                    comments_fetched INTEGER NOT NULL DEFAULT 1,
+                    crawled_at REAL NOT NULL,
+                    PRIMARY KEY (query, submission_id)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reddit_submissions_created ON reddit_submissions(query, created_utc)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Reddit crawl store unavailable, incremental refresh disabled: {e}")
+            self._conn = None
+
+    def watermarks(self, query):
+        """
+        {subreddit: newest created_utc crawled} for a query (empty if never crawled),
+        held just below the oldest submission still waiting for its comments
+        """
+        watermarks = {}
+        for subreddit, newest, retry_from in self._fetch(
+            "SELECT subreddit, MAX(CASE WHEN comments_fetched THEN created_utc END), "
+            "MIN(CASE WHEN NOT comments_fetched THEN created_utc END) "
+            "FROM reddit_submissions WHERE query = ? GROUP BY subreddit",
+            (normalize_query(query),)
+        ):
+            if retry_from is not None:
+                # created_utc is in whole seconds: a second earlier keeps the submission above the watermark
+                newest = retry_from - 1 if newest is None else min(newest, retry_from - 1)
+            watermarks[subreddit] = newest
+        return watermarks
+
+    def seen_ids(self, query):
+        """IDs of every submission already crawled for a query (not those waiting to retry their comments)"""
+        return {row[0] for row in self._fetch(
+            "SELECT submission_id FROM reddit_submissions WHERE query = ? AND comments_fetched",
+            (normalize_query(query),)
+        )}
+
+    def backlog(self, query, exclude=()):
+        """Stored reviews for a query, newest submission first"""
+        reviews = []
+        for submission_id, raw in self._fetch(
+            "SELECT submission_id, reviews FROM reddit_submissions WHERE query = ? ORDER BY created_utc DESC",
+            (normalize_query(query),)
+        ):
+            if submission_id not in exclude:
+                reviews.extend(json.loads(raw))
+        return reviews
+
+    def save(self, query, submission_id, subreddit, created_utc, reviews, comments_fetched=True):
+        """
+        Record a crawled submission and the reviews taken from it (possibly none)
+
+        With comments_fetched=False it is kept for retry by the next refresh
+        """
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO reddit_submissions "
+                    "(query, submission_id, subreddit, created_utc, reviews, comments_fetched, crawled_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (normalize_query(query), submission_id, subreddit, created_utc, json.dumps(reviews),
+                     int(comments_fetched), time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Reddit crawl store write failed: {e}")
+
+    def _fetch(self, sql, params):
+        if self._conn is None:
+            return []
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️ Reddit crawl store read failed: {e}")
+                return []
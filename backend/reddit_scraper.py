@@ -3,13 +3,32 @@ Reddit Review Scraper using PRAW (Python Reddit API Wrapper)
 Scrapes posts and comments from relevant subreddits
 """
 import praw
+import prawcore
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 import time
+from praw.models import Comment
+from client_registry import ClientPool, get_client, register_client, report_client_failure
+from reddit_crawl_store import RedditCrawlStore
 
 load_dotenv()
 
+REDDIT_MAX_WORKERS = int(os.getenv('REDDIT_MAX_WORKERS', '4'))  # Comment trees fetched at once
+REDDIT_RATE_LIMIT_FLOOR = int(os.getenv('REDDIT_RATE_LIMIT_FLOOR', '5'))  # Wait for the reset below this many requests left
+COMMENTS_PER_POST = 5
+# Refresh known queries from stored results plus submissions newer than the stored ones
+REDDIT_INCREMENTAL = os.getenv('REDDIT_INCREMENTAL', 'true').lower() not in ('0', 'false', 'no')
+
+crawl_store = RedditCrawlStore(
+    os.getenv('REDDIT_CRAWL_STORE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reddit_crawl.db'))
+)
+
+_rate_limit_lock = threading.Lock()
+
 def setup_reddit():
     """Initialize Reddit API client for read-only access"""
     client_id = os.getenv('REDDIT_CLIENT_ID')
@@ -31,19 +50,161 @@ def setup_reddit():
     
     return reddit
 
-def scrape_reddit_reviews(query, max_reviews=50):
+def _reddit_healthy(clients):
+    """Cheap authenticated call; raises if the app-only token can't be refreshed"""
+    with clients.lease() as reddit:
+        next(iter(reddit.subreddit('all').hot(limit=1)), None)
+    return True
+
+# PRAW isn't thread-safe: each thread leases its own client; idle clients keep their
+# OAuth token for the next request. The pool is rebuilt after a failed health check.
+register_client('reddit', lambda: ClientPool('reddit', setup_reddit), health_check=_reddit_healthy)
+
+def _wait_for_rate_limit(reddit):
+    """
+    Sleep until the rate limit window resets if the X-Ratelimit-Remaining
+    header of the last response (reddit.auth.limits) is nearly used up
+    """
+    with _rate_limit_lock:
+        limits = reddit.auth.limits
+        remaining, reset_timestamp = limits.get('remaining'), limits.get('reset_timestamp')
+        if remaining is None or reset_timestamp is None or remaining >= REDDIT_RATE_LIMIT_FLOOR:
+            return
+        delay = reset_timestamp - time.time()
+        if delay > 0:
+            print(f"⏳ Reddit rate limit nearly used ({remaining:.0f} left), waiting {delay:.1f}s")
+            time.sleep(delay)
+
+def _fetch_top_comments(clients, post):
+    """
+    Top-level comments of a post in one small request (limit + depth=1),
+    instead of loading the whole comment tree, on a client leased from clients
+
+    Returns None if the request failed (as opposed to [] for a post without comments)
+    """
+    try:
+        with clients.lease() as reddit:
+            _wait_for_rate_limit(reddit)
+            _, comment_listing = reddit.get(f"/comments/{post.id}/",
+                                            params={'limit': COMMENTS_PER_POST, 'depth': 1, 'sort': 'confidence'})
+    except Exception as e:
+        print(f"⚠️ Error processing comments: {e}")
+        return None
+    return [comment for comment in comment_listing.children if isinstance(comment, Comment)][:COMMENTS_PER_POST]
+
+def _with_comments(clients, posts):
+    """
+    Yield (post, top comments or None if they couldn't be fetched) in search
+    order, fetching the next few posts' comments in the background while the caller works
+    """
+    posts = iter(posts)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=REDDIT_MAX_WORKERS) as executor:
+        def submit_next():
+            post = next(posts, None)
+            if post is not None:
+                pending.append((post, executor.submit(_fetch_top_comments, clients, post)))
+
+        for _ in range(REDDIT_MAX_WORKERS):
+            submit_next()
+        try:
+            while pending:
+                post, future = pending.popleft()
+                submit_next()
+                yield post, future.result()
+        finally:
+            # Caller stopped early (max_reviews reached): drop prefetches not yet started
+            for _, future in pending:
+                future.cancel()
+
+def _post_reviews(post, comments):
+    """Reviews taken from a post: its own text (if long enough) and its top comments"""
+    reviews = []
+    if post.selftext and len(post.selftext) > 50 and post.selftext != '[removed]':
+        reviews.append({
+            'author': str(post.author) if post.author else 'Anonymous',
+            'text': post.selftext[:1500],  # Limit length
+            'title': post.title,
+            'date': datetime.fromtimestamp(post.created_utc).strftime('%Y-%m-%d'),
+            'score': post.score,
+            'url': f"https://reddit.com{post.permalink}",
+            'subreddit': str(post.subreddit),
+            'type': 'post'
+        })
+    
+    for comment in comments:
+        if (comment.body and 
+            len(comment.body) > 30 and 
+            comment.body not in ['[deleted]', '[removed]']):
+            reviews.append({
+                'author': str(comment.author) if comment.author else 'Anonymous',
+                'text': comment.body[:1500],
+                'title': f"Comment on: {post.title[:50]}...",
+                'date': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d'),
+                'score': comment.score,
+                'url': f"https://reddit.com{comment.permalink}",
+                'subreddit': str(post.subreddit),
+                'type': 'comment'
+            })
+    return reviews
+
+def _newer_posts(posts, watermarks, seen_ids):
+    """
+    Posts from a newest-first listing that weren't crawled yet and are newer
+    than their subreddit's watermark; stops once past every watermark
+    """
+    floor = min(watermarks.values())
+    for post in posts:
+        if post.created_utc <= floor:
+            return
+        if post.id in seen_ids or post.created_utc <= watermarks.get(str(post.subreddit), floor):
+            continue
+        yield post
+
+def _crawl(clients, query, posts, reviews, max_reviews, on_review, crawl_all=False):
+    """
+    Fetch comments for posts, record each in the crawl store and add their reviews up to max_reviews
+
+    With crawl_all every post is crawled and stored even once max_reviews is
+    reached (a refresh must not leave newer posts behind the watermark). A post
+    whose comments couldn't be fetched is stored for retry: it doesn't count as
+    crawled and holds its subreddit's watermark below it until a later refresh fetches them
+
+    Returns:
+        IDs of the posts crawled (including those stored for retry)
+    """
+    crawled = set()
+    for post, comments in _with_comments(clients, posts):
+        if len(reviews) >= max_reviews and not crawl_all:
+            break
+        post_reviews = _post_reviews(post, comments or [])
+        crawl_store.save(query, post.id, str(post.subreddit), post.created_utc, post_reviews,
+                         comments_fetched=comments is not None)
+        crawled.add(post.id)
+        for review in post_reviews[:max_reviews - len(reviews)]:
+            reviews.append(review)
+            if on_review:
+                on_review(review)
+    return crawled
+
+def scrape_reddit_reviews(query, max_reviews=50, on_review=None, incremental=None):
     """
     Search Reddit for posts/comments about a product or place
     
     Args:
         query: Search term (e.g., "Dr Martens 1460 boots")
         max_reviews: Maximum number of reviews to collect
+        on_review: Optional callback called with each review as soon as it is scraped
+        incremental: Refresh a previously crawled query by fetching only newer
+            submissions and merging them with the stored ones (default: REDDIT_INCREMENTAL)
     
     Returns:
         List of review dictionaries
     """
+    clients = reddit = None
     try:
-        reddit = setup_reddit()
+        clients = get_client('reddit')
+        reddit = clients.acquire()  # This thread's client for the search listings
         reviews = []
         
         print(f"🔍 Searching Reddit for: {query}")
@@ -68,75 +229,51 @@ def scrape_reddit_reviews(query, max_reviews=50):
         subreddit_str = '+'.join(subreddits)
         subreddit = reddit.subreddit(subreddit_str)
         
-        # Add delay before API call to respect rate limits
-        time.sleep(1)
+        incremental = REDDIT_INCREMENTAL if incremental is None else incremental
+        watermarks = crawl_store.watermarks(query) if incremental else {}
+        if watermarks:
+            # Known query: newest submissions first, stopping at what we already have. Every newer
+            # submission is stored, even past max_reviews, since the watermark moves past all of them
+            seen_ids = crawl_store.seen_ids(query)
+            print(f"🔁 Refreshing {len(seen_ids)} stored Reddit posts with newer submissions")
+            newest = subreddit.search(query, limit=None, sort='new', time_filter='all')
+            refreshed = _crawl(clients, query, _newer_posts(newest, watermarks, seen_ids), reviews, max_reviews,
+                               on_review, crawl_all=True)
+            new_count = len(reviews)
+            for review in crawl_store.backlog(query, exclude=refreshed):
+                if len(reviews) >= max_reviews:
+                    break
+                reviews.append(review)
+                if on_review:
+                    on_review(review)
+            print(f"✅ {new_count} new Reddit reviews, {len(reviews) - new_count} from earlier crawls")
+            if len(reviews) >= max_reviews:
+                return reviews
+            # Stored crawl was smaller than this request: continue it below
+            print(f"🔍 Extending stored crawl to {max_reviews} reviews")
+            seen_ids = crawl_store.seen_ids(query) | refreshed
+        else:
+            seen_ids = set()
         
-        # Search for relevant posts
+        # Search for relevant posts (the listing already carries each post's full data)
         search_results = subreddit.search(query, limit=20, sort='relevance', time_filter='all')
+        unseen = (post for post in search_results if post.id not in seen_ids)
+        _crawl(clients, query, unseen, reviews, max_reviews, on_review)
         
-        posts_processed = 0
-        for post in search_results:
-            if len(reviews) >= max_reviews:
-                break
-            
-            # Add small delay between processing posts
-            time.sleep(0.5)
-            
-            # Extract post itself as a review
-            if post.selftext and len(post.selftext) > 50 and post.selftext != '[removed]':
-                reviews.append({
-                    'author': str(post.author) if post.author else 'Anonymous',
-                    'text': post.selftext[:1500],  # Limit length
-                    'title': post.title,
-                    'date': datetime.fromtimestamp(post.created_utc).strftime('%Y-%m-%d'),
-                    'score': post.score,
-                    'url': f"https://reddit.com{post.permalink}",
-                    'subreddit': str(post.subreddit),
-                    'type': 'post'
-                })
-                posts_processed += 1
-            
-            # Extract top comments from the post
-            try:
-                post.comments.replace_more(limit=0)  # Remove "load more comments"
-                
-                # Add delay before fetching comments
-                time.sleep(0.5)
-                
-                for comment in post.comments.list()[:5]:  # Top 5 comments per post
-                    if len(reviews) >= max_reviews:
-                        break
-                    
-                    if (comment.body and 
-                        len(comment.body) > 30 and 
-                        comment.body not in ['[deleted]', '[removed]']):
-                        reviews.append({
-                            'author': str(comment.author) if comment.author else 'Anonymous',
-                            'text': comment.body[:1500],
-                            'title': f"Comment on: {post.title[:50]}...",
-                            'date': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d'),
-                            'score': comment.score,
-                            'url': f"https://reddit.com{comment.permalink}",
-                            'subreddit': str(post.subreddit),
-                            'type': 'comment'
-                        })
-                    
-                    # Small delay between comments
-                    time.sleep(0.2)
-                    
-            except Exception as e:
-                print(f"⚠️ Error processing comments: {e}")
-                time.sleep(1)  # Wait before continuing
-                continue
-        
+        posts_processed = sum(1 for review in reviews if review['type'] == 'post')
         print(f"✅ Successfully scraped {len(reviews)} Reddit reviews from {posts_processed} posts")
         return reviews
         
     except Exception as e:
         print(f"❌ Error scraping Reddit: {str(e)}")
+        if isinstance(e, prawcore.exceptions.PrawcoreException):
+            report_client_failure('reddit')
         import traceback
         traceback.print_exc()
         return []
+    finally:
+        if reddit is not None:
+            clients.release(reddit)
 
 def scrape_subreddit_reviews(subreddit_name, query, max_reviews=50):
     """
@@ -150,8 +287,10 @@ def scrape_subreddit_reviews(subreddit_name, query, max_reviews=50):
     Returns:
         List of review dictionaries
     """
+    clients = reddit = None
     try:
-        reddit = setup_reddit()
+        clients = get_client('reddit')
+        reddit = clients.acquire()
         reviews = []
         
         print(f"🔍 Searching r/{subreddit_name} for: {query}")
@@ -159,7 +298,7 @@ def scrape_subreddit_reviews(subreddit_name, query, max_reviews=50):
         subreddit = reddit.subreddit(subreddit_name)
         search_results = subreddit.search(query, limit=20, sort='relevance', time_filter='all')
         
-        for post in search_results:
+        for post, comments in _with_comments(clients, search_results):
             if len(reviews) >= max_reviews:
                 break
             
@@ -177,33 +316,33 @@ def scrape_subreddit_reviews(subreddit_name, query, max_reviews=50):
                 })
             
             # Add comments
-            try:
-                post.comments.replace_more(limit=0)
-                for comment in post.comments.list()[:5]:
-                    if len(reviews) >= max_reviews:
-                        break
-                    
-                    if comment.body and len(comment.body) > 30 and comment.body != '[deleted]':
-                        reviews.append({
-                            'author': str(comment.author) if comment.author else 'Anonymous',
-                            'text': comment.body[:1500],
-                            'title': f"Comment on: {post.title[:50]}...",
-                            'date': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d'),
-                            'score': comment.score,
-                            'url': f"https://reddit.com{comment.permalink}",
-                            'subreddit': subreddit_name,
-                            'type': 'comment'
-                        })
-            except Exception as e:
-                print(f"⚠️ Error processing comments: {e}")
-                continue
+            for comment in comments or []:
+                if len(reviews) >= max_reviews:
+                    break
+                
+                if comment.body and len(comment.body) > 30 and comment.body != '[deleted]':
+                    reviews.append({
+                        'author': str(comment.author) if comment.author else 'Anonymous',
+                        'text': comment.body[:1500],
+                        'title': f"Comment on: {post.title[:50]}...",
+                        'date': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d'),
+                        'score': comment.score,
+                        'url': f"https://reddit.com{comment.permalink}",
+                        'subreddit': subreddit_name,
+                        'type': 'comment'
+                    })
         
         print(f"✅ Found {len(reviews)} reviews from r/{subreddit_name}")
         return reviews
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
+        if isinstance(e, prawcore.exceptions.PrawcoreException):
+            report_client_failure('reddit')
         return []
+    finally:
+        if reddit is not None:
+            clients.release(reddit)
 
 if __name__ == "__main__":
     # Test the scraper
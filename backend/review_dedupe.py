@@ -0,0 +1,121 @@
+"""
+Near-Duplicate Review Detection
+Clusters reviews whose text is the same or nearly the same (Trustpilot title
+fallbacks, Reddit crossposts, YouTube copypasta) using 64-bit SimHash
+fingerprints with banded lookup, so each cluster is scored only once
+"""
+import hashlib
+import re
+import numpy as np
+
+_WORD_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)?")
+
+SIMHASH_BITS = 64
+_BANDS = 4  # 4 x 16-bit bands: fingerprints within 3 bits share at least one band
+_BAND_BITS = SIMHASH_BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+def tokenize(text):
+    """Lowercased word tokens"""
+    return _WORD_RE.findall((text or '').lower())
+
+def _feature_hashes(tokens, ngram):
+    """64-bit hashes of the word n-gram shingles of a token list"""
+    if len(tokens) <= ngram:
+        shingles = [' '.join(tokens)]
+    else:
+        shingles = [' '.join(tokens[i:i + ngram]) for i in range(len(tokens) - ngram + 1)]
+    return [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little') for s in shingles]
+
+def simhash(text, ngram=3):
+    """
+    64-bit SimHash fingerprint of a text's word shingles
+
+    Texts that share most of their shingles get fingerprints that differ
+    in only a few bits
+    """
+    return simhash_many([text], ngram)[0]
+
+def simhash_many(texts, ngram=3):
+    """SimHash fingerprints for a list of texts (bit voting done with NumPy)"""
+    fingerprints = []
+    for text in texts:
+        hashes = _feature_hashes(tokenize(text), ngram)
+        bits = np.unpackbits(np.array(hashes, dtype='<u8').view(np.uint8), bitorder='little').reshape(-1, SIMHASH_BITS)
+        votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(hashes)
+        weights = 1 << np.arange(SIMHASH_BITS, dtype=np.uint64)
+        fingerprints.append(int(weights[votes > 0].sum()))
+    return fingerprints
+
+def cluster_near_duplicates(texts, max_distance=3, min_tokens=5, ngram=3):
+    """
+    Group near-duplicate texts
+
+    Args:
+        texts: List of review texts
+        max_distance: Largest SimHash Hamming distance treated as a duplicate (at most 3)
+        min_tokens: Texts shorter than this only cluster on an exact (normalized) match,
+            since short reviews like "Great boots" vs "Bad boots" hash too close together
+        ngram: Word shingle size
+
+    Returns:
+        List the same length as texts; entry i is the index of the first text
+        in i's cluster (i itself when the text has no earlier duplicate)
+    """
+    max_distance = min(max_distance, _BANDS - 1)
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            # The earliest review stays the representative
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    exact = {}
+    long_indices = []
+    long_texts = []
+    for idx, text in enumerate(texts):
+        tokens = tokenize(text)
+        normalized = ' '.join(tokens)
+        if normalized in exact:
+            union(exact[normalized], idx)
+            continue
+        exact[normalized] = idx
+        if len(tokens) >= min_tokens:
+            long_indices.append(idx)
+            long_texts.append(text)
+
+    if max_distance > 0 and long_texts:
+        fingerprints = simhash_many(long_texts, ngram)
+        buckets = {}
+        for idx, fingerprint in zip(long_indices, fingerprints):
+            candidates = set()
+            for band in range(_BANDS):
+                key = (band, (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK)
+                candidates.update(buckets.get(key, ()))
+                buckets.setdefault(key, []).append((idx, fingerprint))
+            for other_idx, other_fingerprint in candidates:
+                if bin(fingerprint ^ other_fingerprint).count('1') <= max_distance:
+                    union(other_idx, idx)
+
+    return [find(idx) for idx in range(len(texts))]
+
+def dedupe_reviews(reviews, max_distance=3):
+    """
+    Collapse near-duplicate review dicts, keeping the first of each cluster
+
+    Returns:
+        List of (review, copies) tuples in first-seen order, where copies is
+        the number of reviews in that cluster
+    """
+    representatives = cluster_near_duplicates([r.get('text') or '' for r in reviews], max_distance)
+    copies = {}
+    for rep in representatives:
+        copies[rep] = copies.get(rep, 0) + 1
+    return [(reviews[idx], copies[idx]) for idx in sorted(copies)]
@@ -0,0 +1,254 @@
+"""
+Review Sources
+Common interface over the review scrapers (YouTube, Amazon, Reddit,
+Trustpilot), a registry of them, and a fan-out that runs every source at
+once so a combined analysis takes about as long as its slowest source.
+Scrapes go through a cache shared by all endpoints, and scored reviews are
+kept in the persistent review store.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from amazon_scraper import scrape_amazon_reviews
+from reddit_scraper import scrape_reddit_reviews
+from review_store import ReviewStore, make_product_id
+from scrape_cache import ScrapeCache
+from trustpilot_scraper import scrape_trustpilot_reviews
+from youtube_scraper import scrape_youtube_reviews
+
+REVIEW_SOURCE_TIMEOUT = float(os.getenv('REVIEW_SOURCE_TIMEOUT', '90'))  # Seconds, per source unless overridden
+
+# Scrape results shared by /api/<source>/search, combined and competitive analysis
+scrape_cache = ScrapeCache(
+    ttls={name: int(os.getenv(f"SCRAPE_CACHE_TTL_{name.upper()}", default)) for name, default in (
+        ('youtube', '900'),
+        ('amazon', '1800'),
+        ('reddit', '600'),
+        ('trustpilot', '1800')
+    )},
+    default_ttl=int(os.getenv('SCRAPE_CACHE_TTL', '600')),
+    max_entries=int(os.getenv('SCRAPE_CACHE_MAX_ENTRIES', '500'))
+)
+
+# Every scored review, by product; insights and chat read from it by product ID
+review_store = ReviewStore(
+    os.getenv('REVIEW_STORE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reviews.db'))
+)
+
+class ReviewSource:
+    """
+    A place reviews come from
+
+    Args:
+        name: Source name (response key, e.g. "youtube")
+        fetch: callable(query, max_reviews) -> scraper result (list of raw review dicts, unless reviews_from is given)
+        format_review: callable(review, sentiment) -> review dict for the response
+        use_rating: Pass the review's star rating to sentiment analysis
+        timeout: Seconds to wait for fetch (env REVIEW_SOURCE_TIMEOUT_<NAME> overrides)
+        label: Log line prefix (emoji + name)
+        reviews_from: callable(result) -> review list, for scrapers that return more than reviews
+    """
+
+    def __init__(self, name, fetch, format_review, use_rating=True, timeout=None, label=None, reviews_from=None):
+        self.name = name
+        self.fetch = fetch
+        self.reviews_from = reviews_from or (lambda result: result)
+        self.format_review = format_review
+        self.use_rating = use_rating
+        self.timeout = float(os.getenv(f"REVIEW_SOURCE_TIMEOUT_{name.upper()}", timeout or REVIEW_SOURCE_TIMEOUT))
+        self.label = label or name
+
+    def fetch_cached(self, query, max_reviews):
+        """
+        Scraper result from the shared cache, scraping on a miss (the scrapers
+        take per-host rate limit tokens for each request they make)
+
+        Returns:
+            (result, age in seconds)
+        """
+        return scrape_cache.get_or_fetch(self.name, query, max_reviews, lambda: self.fetch(query, max_reviews),
+                                         should_cache=lambda result: bool(self.reviews_from(result)))
+
+    def score(self, reviews, analyze_batch):
+        """Run sentiment analysis on fetched reviews; returns (formatted reviews, sentiments)"""
+        items = reviews if self.use_rating else [(review.get('text', ''), None) for review in reviews]
+        sentiments = analyze_batch(items)
+        return [self.format_review(review, sentiment) for review, sentiment in zip(reviews, sentiments)], sentiments
+
+    def score_and_store(self, query, reviews, analyze_batch):
+        """score, then save the raw reviews and their sentiments under the query's product ID"""
+        formatted, sentiments = self.score(reviews, analyze_batch)
+        review_store.upsert_reviews(make_product_id(query), self.name, reviews, sentiments)
+        return formatted, sentiments
+
+_sources = {}
+
+def register_source(source):
+    """Add (or replace) a source; sources run and are reported in registration order"""
+    _sources[source.name] = source
+
+def get_source(name):
+    return _sources[name]
+
+def get_sources(names=None):
+    """Registered sources, optionally limited to names"""
+    if names is None:
+        return list(_sources.values())
+    return [_sources[name] for name in names if name in _sources]
+
+def fan_out(query, max_reviews, analyze_batch, sources=None):
+    """
+    Fetch from every source concurrently and score each one's reviews as soon as it finishes
+
+    Scored reviews are saved to review_store under make_product_id(query).
+    A source that raises or runs past its timeout is reported with status
+    "error" / "timeout" and no reviews; the others are unaffected. A timed-out
+    scraper is left to finish in the background.
+
+    Args:
+        query: Search query passed to every source
+        max_reviews: Per-source review limit
+        analyze_batch: Sentiment function over a list of reviews or (text, rating) pairs
+        sources: ReviewSource list (default: all registered)
+
+    Returns:
+        {name: {'status', 'reviews', 'sentiments', 'error', 'fetch_seconds', 'seconds', 'cache_age_seconds'}}
+        in source order
+    """
+    sources = get_sources() if sources is None else sources
+    results = {source.name: {
+        'status': 'pending',
+        'reviews': [],
+        'sentiments': [],
+        'error': None,
+        'fetch_seconds': None,
+        'seconds': None,
+        'cache_age_seconds': None
+    } for source in sources}
+    if not sources:
+        return results
+
+    start = time.monotonic()
+    # Fetch + scoring workers; not a context manager so timed-out fetches don't hold up the response
+    executor = ThreadPoolExecutor(max_workers=len(sources) * 2)
+    try:
+        fetching = {}
+        for source in sources:
+            print(f"{source.label} Fetching {source.name} reviews for: {query}")
+            fetching[executor.submit(source.fetch_cached, query, max_reviews)] = source
+
+        scoring = {}
+        while fetching:
+            now = time.monotonic()
+            for future, source in list(fetching.items()):
+                if now - start >= source.timeout:
+                    del fetching[future]
+                    future.cancel()
+                    results[source.name].update(status='timeout', error=f"timed out after {source.timeout:.0f}s")
+                    print(f"⏱️ {source.name} timed out after {source.timeout:.0f}s")
+            if not fetching:
+                break
+            next_deadline = min(start + source.timeout for source in fetching.values())
+            done, _ = wait(fetching, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                source = fetching.pop(future)
+                results[source.name]['fetch_seconds'] = round(time.monotonic() - start, 2)
+                try:
+                    result, age = future.result()
+                    reviews = source.reviews_from(result)
+                    results[source.name]['cache_age_seconds'] = round(age, 1)
+                except Exception as e:
+                    results[source.name].update(status='error', error=str(e))
+                    print(f"⚠️ {source.name} fetching failed: {e}")
+                    continue
+                # Score this source now, while the others are still fetching
+                scoring[executor.submit(source.score_and_store, query, reviews, analyze_batch)] = source
+
+        for future, source in scoring.items():
+            try:
+                reviews, sentiments = future.result()
+                results[source.name].update(status='ok', reviews=reviews, sentiments=sentiments)
+            except Exception as e:
+                results[source.name].update(status='error', error=str(e))
+                print(f"⚠️ {source.name} sentiment analysis failed: {e}")
+            results[source.name]['seconds'] = round(time.monotonic() - start, 2)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"✅ Fetched {sum(len(r['reviews']) for r in results.values())} reviews from "
+          f"{len(sources)} sources in {time.monotonic() - start:.1f}s")
+    return results
+
+def _format_youtube_review(review, sentiment_data):
+    return {
+        'author': review.get('author', 'Anonymous'),
+        'text': review.get('text', ''),
+        'date': review.get('date', 'Unknown'),
+        'likes': review.get('likes', 0),
+        'video_title': review.get('video_title', ''),
+        'video_url': review.get('video_url', ''),
+        'sentiment': sentiment_data['sentiment'],
+        'polarity': sentiment_data['polarity'],
+        'subjectivity': sentiment_data['subjectivity'],
+        'source': 'youtube'
+    }
+
+def _format_amazon_review(review, sentiment_data):
+    return {
+        'author': review.get('author', 'Anonymous'),
+        'rating': review.get('rating') or 0,
+        'title': review.get('title', ''),
+        'text': review.get('text', ''),
+        'date': review.get('date', 'Unknown'),
+        'verified': review.get('verified', False),
+        'sentiment': sentiment_data['sentiment'],
+        'polarity': sentiment_data['polarity'],
+        'subjectivity': sentiment_data['subjectivity'],
+        'source': 'amazon'
+    }
+
+def _format_reddit_review(post, sentiment_data):
+    return {
+        'author': post.get('author', 'Anonymous'),
+        'title': post.get('title', ''),
+        'text': post.get('text', ''),
+        'score': post.get('score', 0),
+        'subreddit': post.get('subreddit', ''),
+        'date': post.get('date', 'Unknown'),
+        'sentiment': sentiment_data['sentiment'],
+        'polarity': sentiment_data['polarity'],
+        'subjectivity': sentiment_data['subjectivity'],
+        'source': 'reddit'
+    }
+
+def _format_trustpilot_review(review, sentiment_data):
+    return {
+        'author': review.get('author', 'Anonymous'),
+        'rating': review.get('rating', 0),
+        'title': review.get('title', ''),
+        'text': review.get('text', ''),
+        'date': review.get('date', 'Unknown'),
+        'verified': review.get('verified', False),
+        'sentiment': sentiment_data['sentiment'],
+        'polarity': sentiment_data['polarity'],
+        'subjectivity': sentiment_data['subjectivity'],
+        'source': 'trustpilot'
+    }
+
+register_source(ReviewSource(
+    'youtube', lambda query, max_reviews: scrape_youtube_reviews(query, max_reviews=max_reviews),
+    _format_youtube_review, use_rating=False, timeout=45, label='🎥'
+))
+register_source(ReviewSource(
+    'amazon', lambda query, max_reviews: scrape_amazon_reviews(query, max_reviews=max_reviews),
+    _format_amazon_review, timeout=90, label='🛒',
+    reviews_from=lambda result: result[1]  # (product_info, reviews)
+))
+register_source(ReviewSource(
+    'reddit', lambda query, max_reviews: scrape_reddit_reviews(query, max_reviews=max_reviews),
+    _format_reddit_review, use_rating=False, timeout=60, label='📱'
+))
+register_source(ReviewSource(
+    'trustpilot', lambda query, max_reviews: scrape_trustpilot_reviews(query, max_reviews=max_reviews),
+    _format_trustpilot_review, timeout=90, label='⭐'
+))
@@ -0,0 +1,226 @@
+"""
+Review Store
+Persists every scraped review with its sentiment result in SQLite, keyed by
+a stable per-source ID so re-scrapes update rows instead of duplicating
+them. Reviews are grouped by product ID (the normalized query) and
+full-text indexed with FTS5, so insights and chat can load a product's
+reviews server-side instead of receiving them in the request.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# Words too common in chat questions to be useful search terms
+_STOPWORDS = {
+    'the', 'and', 'are', 'for', 'with', 'what', 'which', 'how', 'does', 'did', 'about', 'that', 'this',
+    'they', 'them', 'there', 'their', 'have', 'has', 'was', 'were', 'any', 'most', 'people', 'customers',
+    'reviews', 'review', 'say', 'said', 'think', 'you', 'your', 'from', 'why', 'who', 'when'
+}
+
+def make_product_id(query):
+    """Stable product ID for a search query, e.g. "Dr Martens 1460" -> "dr-martens-1460" """
+    return re.sub(r'[^a-z0-9]+', '-', (query or '').lower()).strip('-')
+
+def review_id(source, review):
+    """
+    Stable ID for a scraped review: YouTube comment ID, Trustpilot review URL,
+    Reddit permalink, or a content hash (Amazon, and any review missing its ID)
+    """
+    if source == 'youtube' and review.get('comment_id'):
+        return f"youtube:{review['comment_id']}"
+    if source == 'trustpilot' and review.get('review_url'):
+        return f"trustpilot:{review['review_url']}"
+    if source == 'reddit' and review.get('url'):
+        return f"reddit:{review['url']}"
+    # No date: the browser scrapers fill in today's date when a card has none
+    raw = json.dumps([review.get('author'), review.get('title'), review.get('text')], ensure_ascii=False)
+    return f"{source}:sha1:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+def iso_date(value):
+    """Best-effort YYYY-MM-DD for the date column ("2024-03-01T12:00Z", "... on March 3, 2024"); None if unknown"""
+    value = str(value or '')
+    match = re.search(r'\d{4}-\d{2}-\d{2}', value)
+    if match:
+        return match.group(0)
+    match = re.search(r'([A-Z][a-z]+ \d{1,2}, \d{4})', value)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%B %d, %Y').strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    return None
+
+class ReviewStore:
+    """SQLite review table with an FTS5 index on title and text (search disabled if FTS5 is unavailable)"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._fts = False
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS reviews (
+                    id INTEGER PRIMARY KEY,
+                    review_id TEXT NOT NULL,
+                    product_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    date TEXT,
+                    rating REAL,
+                    title TEXT,
+                    text TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    sentiment TEXT,
+                    sentiment_label TEXT,
+                    first_seen REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (product_id, review_id)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reviews_product_source ON reviews(product_id, source)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reviews_product_date ON reviews(product_id, date)")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Review store unavailable: {e}")
+            self._conn = None
+            return
+
+        try:
+            # External-content FTS index kept in sync by triggers
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+                    title, text, content='reviews', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN
+                    INSERT INTO reviews_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN
+                    INSERT INTO reviews_fts(reviews_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF title, text ON reviews BEGIN
+                    INSERT INTO reviews_fts(reviews_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+                    INSERT INTO reviews_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+                END;
+            """)
+            self._fts = True
+        except sqlite3.Error as e:
+            print(f"⚠️ Review full-text search unavailable (no FTS5): {e}")
+
+    def upsert_reviews(self, product_id, source, reviews, sentiments=None):
+        """
+        Insert or update reviews (and their sentiment results) for a product
+
+        Args:
+            product_id: ID from make_product_id
+            source: Source name ("youtube", "amazon", "reddit", "trustpilot")
+            reviews: Raw review dicts as returned by the scraper
+            sentiments: Sentiment dicts parallel to reviews (None entries keep the stored result)
+
+        Returns:
+            Number of reviews written
+        """
+        if self._conn is None or not reviews:
+            return 0
+        sentiments = sentiments or [None] * len(reviews)
+        now = time.time()
+        rows = []
+        for review, sentiment in zip(reviews, sentiments):
+            text = review.get('text') or ''
+            if not text:
+                continue
+            data = {key: value for key, value in review.items() if key != 'sentiment'}
+            rating = review.get('rating')
+            rows.append((
+                review_id(source, review), product_id, source, iso_date(review.get('date')),
+                float(rating) if isinstance(rating, (int, float)) and rating else None,
+                review.get('title') or '', text, json.dumps(data, ensure_ascii=False),
+                json.dumps(sentiment) if sentiment else None,
+                sentiment.get('sentiment') if sentiment else None,
+                now, now
+            ))
+        with self._lock:
+            try:
+                self._conn.executemany("""
+                    INSERT INTO reviews (review_id, product_id, source, date, rating, title, text, data,
+                                         sentiment, sentiment_label, first_seen, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(product_id, review_id) DO UPDATE SET
+                        date = COALESCE(excluded.date, reviews.date),
+                        rating = excluded.rating,
+                        title = excluded.title,
+                        text = excluded.text,
+                        data = excluded.data,
+                        sentiment = COALESCE(excluded.sentiment, reviews.sentiment),
+                        sentiment_label = COALESCE(excluded.sentiment_label, reviews.sentiment_label),
+                        updated_at = excluded.updated_at
+                """, rows)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Review store write failed: {e}")
+                return 0
+        return len(rows)
+
+    def get_reviews(self, product_id, source=None, limit=500):
+        """
+        Stored reviews for a product, newest first
+
+        Returns:
+            Review dicts as scraped, plus 'source', 'review_id' and 'sentiment' (the stored result)
+        """
+        sql = "SELECT review_id, source, data, sentiment FROM reviews WHERE product_id = ?"
+        params = [product_id]
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        sql += " ORDER BY date IS NULL, date DESC, updated_at DESC LIMIT ?"
+        params.append(limit)
+        return [self._row_to_review(row) for row in self._fetch(sql, params)]
+
+    def search(self, product_id, text, source=None, limit=30):
+        """Reviews of a product matching any meaningful word of text, best match first ([] without FTS5)"""
+        terms = [term for term in dict.fromkeys(re.findall(r'\w+', (text or '').lower()))
+                 if len(term) > 2 and term not in _STOPWORDS]
+        if not self._fts or not terms:
+            return []
+        sql = """
+            SELECT r.review_id, r.source, r.data, r.sentiment
+            FROM reviews_fts JOIN reviews r ON r.id = reviews_fts.rowid
+            WHERE reviews_fts MATCH ? AND r.product_id = ?
+        """
+        params = [' OR '.join(f'"{term}"' for term in terms), product_id]
+        if source:
+            sql += " AND r.source = ?"
+            params.append(source)
+        sql += " ORDER BY bm25(reviews_fts) LIMIT ?"
+        params.append(limit)
+        return [self._row_to_review(row) for row in self._fetch(sql, params)]
+
+    def stats(self):
+        """Row and product counts"""
+        rows = self._fetch("SELECT COUNT(*), COUNT(DISTINCT product_id) FROM reviews", [])
+        reviews, products = rows[0] if rows else (0, 0)
+        return {'reviews': reviews, 'products': products, 'full_text_search': self._fts}
+
+    def _fetch(self, sql, params):
+        if self._conn is None:
+            return []
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️ Review store read failed: {e}")
+                return []
+
+    @staticmethod
+    def _row_to_review(row):
+        stored_id, source, data, sentiment = row
+        review = json.loads(data)
+        review['source'] = source
+        review['review_id'] = stored_id
+        review['sentiment'] = json.loads(sentiment) if sentiment else None
+        return review
@@ -0,0 +1,126 @@
+"""
+Scrape Result Cache
+Short-lived, in-memory cache of scraper results shared by every endpoint,
+keyed by source, normalized query and max_reviews. Concurrent identical
+requests are coalesced: one caller scrapes, the rest wait for its result
+instead of each starting their own browser.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_query(query):
+    return ' '.join((query or '').lower().split())
+
+class _Flight:
+    """A scrape in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.fetched_at = None
+
+class ScrapeCache:
+    """
+    TTL cache with single-flight loading
+
+    Args:
+        ttls: {source: seconds a result stays fresh}
+        default_ttl: TTL for sources not in ttls
+        max_entries: Results kept (least recently used evicted first)
+    """
+
+    def __init__(self, ttls=None, default_ttl=600, max_entries=500):
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (fetched_at, result)
+        self._flights = {}
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'errors': 0
+        }
+
+    def get_or_fetch(self, source, query, max_reviews, fetch, should_cache=bool):
+        """
+        Cached result for (source, query, max_reviews), calling fetch() on a miss
+
+        Every caller gets its own copy of the result, so it can be modified freely.
+
+        Args:
+            fetch: Zero-argument callable doing the actual scrape
+            should_cache: callable(result) -> bool; by default empty results aren't kept
+
+        Returns:
+            (result, age in seconds)
+
+        Raises:
+            Whatever fetch raised (also raised in callers that were waiting on it,
+            except BaseExceptions such as a cancelled stream: waiters then fetch themselves)
+        """
+        key = (source, normalize_query(query), max_reviews)
+        ttl = self.ttls.get(source, self.default_ttl)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] < ttl:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return copy.deepcopy(entry[1]), time.time() - entry[0]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counters['misses'] += 1
+            else:
+                self._counters['coalesced'] += 1
+
+        if not leader:
+            print(f"🔗 Waiting on in-flight {source} scrape for: {query}")
+            flight.done.wait()
+            if isinstance(flight.error, Exception):
+                raise flight.error
+            if flight.error is not None:
+                # The leader was stopped (e.g., its stream client went away), it didn't fail: scrape here
+                return self.get_or_fetch(source, query, max_reviews, fetch, should_cache)
+            return copy.deepcopy(flight.result), time.time() - flight.fetched_at
+
+        try:
+            flight.result = fetch()
+            flight.fetched_at = time.time()
+        except BaseException as e:
+            flight.error = e
+            if isinstance(e, Exception):
+                with self._lock:
+                    self._counters['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and should_cache(flight.result):
+                    self._entries[key] = (flight.fetched_at, flight.result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return copy.deepcopy(flight.result), 0.0
+
+    def clear(self):
+        """Drop every cached result (in-flight scrapes still finish and are cached)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss/coalesce counters"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['entries'] = len(self._entries)
+            counters['in_flight'] = len(self._flights)
+        lookups = counters['hits'] + counters['misses'] + counters['coalesced']
+        counters['hit_rate'] = round((counters['hits'] + counters['coalesced']) / lookups, 3) if lookups else 0
+        return counters
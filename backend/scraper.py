@@ -8,9 +8,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 import re
+from driver_pool import get_pool, chromedriver_path
+from page_readiness import PERFORMANCE_LOGGING, load_page, wait_for_selector, scroll_and_wait
+from bulk_extract import extract_reviews
+
+def _parse_rating(aria_label):
+    """"5 stars" -> 5"""
+    rating_match = re.search(r'(\d+)', aria_label)
+    return int(rating_match.group(1)) if rating_match else 0
+
+# Where each field lives inside a review card (div.jftiEf)
+GOOGLE_MAPS_REVIEW_FIELDS = {
+    'rating': {'selectors': ["span.kvMYJc"], 'read': 'attr:aria-label', 'parse': _parse_rating, 'default': 0},
+    'text': {'selectors': ["span.wiI7pd"], 'default': ""},
+    'author': {'selectors': ["div.d4r55"], 'default': "Anonymous"},
+    'date': {'selectors': ["span.rsqaWe"], 'default': "Unknown"}
+}
 
 def setup_driver():
     """Setup Chrome driver with optimal options"""
@@ -22,11 +37,16 @@ def setup_driver():
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    chrome_options.set_capability('goog:loggingPrefs', PERFORMANCE_LOGGING)
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
 
+# Warm browsers shared by all Google Maps scrapes
+driver_pool = get_pool('google_maps', setup_driver)
+GOOGLE_MAPS_HOST = 'google.com'
+
 def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
     """
     Scrape reviews from Google Maps by searching for a place
@@ -39,7 +59,8 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
     Returns:
         List of review dictionaries with author, rating, text, and date
     """
-    driver = setup_driver()
+    driver = driver_pool.acquire(GOOGLE_MAPS_HOST)
+    failed = False
     reviews = []
     
     try:
@@ -48,8 +69,7 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
         search_url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
         
         print(f"🔍 Searching Google Maps for: {search_query}")
-        driver.get(search_url)
-        time.sleep(4)
+        load_page(driver, search_url, timeout=8, name='maps_search')
         
         # Click on the first search result
         try:
@@ -58,7 +78,6 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
             )
             first_result.click()
             print("✅ Found place, loading details...")
-            time.sleep(3)
         except Exception as e:
             print(f"❌ Could not find place: {e}")
             return reviews
@@ -74,7 +93,7 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
             reviews_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label*='Reviews']")
             driver.execute_script("arguments[0].click();", reviews_button)
             print("✅ Opened reviews section")
-            time.sleep(3)
+            wait_for_selector(driver, "div.jftiEf", timeout=8, name='maps_reviews')
         except Exception as e:
             print(f"⚠️ Could not open reviews section: {e}")
             # Try alternative method
@@ -82,7 +101,7 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
                 reviews_elements = driver.find_elements(By.XPATH, "//button[contains(text(), 'Reviews')]")
                 if reviews_elements:
                     driver.execute_script("arguments[0].click();", reviews_elements[0])
-                    time.sleep(3)
+                    wait_for_selector(driver, "div.jftiEf", timeout=8, name='maps_reviews')
             except:
                 print("❌ Failed to access reviews")
                 return reviews
@@ -98,22 +117,15 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
         
         # Scroll to load more reviews
         print(f"📜 Scrolling to load reviews (target: {max_reviews})...")
-        last_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
         scroll_attempts = 0
         max_scrolls = 15  # Adjust based on how many reviews you want
         
         while scroll_attempts < max_scrolls:
-            # Scroll down
-            driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div)
-            time.sleep(2.5)
-            
-            # Check if we've reached the bottom
-            new_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
-            if new_height == last_height:
+            # Scroll down and wait until the new batch has rendered
+            if not scroll_and_wait(driver, container=scrollable_div, name='maps_scroll'):
                 print("   Reached end of reviews")
                 break
             
-            last_height = new_height
             scroll_attempts += 1
             
             # Check current count
@@ -123,70 +135,22 @@ def scrape_google_maps_reviews(place_name, location="", max_reviews=50):
             if current_reviews >= max_reviews:
                 break
         
-        # Expand "More" buttons to see full review text
-        print("📖 Expanding review texts...")
-        more_buttons = driver.find_elements(By.CSS_SELECTOR, "button.w8nwRe")
-        for idx, button in enumerate(more_buttons[:max_reviews]):
-            try:
-                driver.execute_script("arguments[0].click();", button)
-                time.sleep(0.2)
-            except:
-                pass
-        
-        # Extract all reviews
+        # Expand "More" buttons and read every review in one script round trip
         print("🔍 Extracting review data...")
-        review_elements = driver.find_elements(By.CSS_SELECTOR, "div.jftiEf")
-        
-        for idx, element in enumerate(review_elements[:max_reviews]):
-            try:
-                review_data = {}
-                
-                # Extract rating
-                try:
-                    rating_element = element.find_element(By.CSS_SELECTOR, "span.kvMYJc")
-                    rating_aria = rating_element.get_attribute("aria-label")
-                    # Extract number from "5 stars", "4 stars", etc.
-                    rating_match = re.search(r'(\d+)', rating_aria)
-                    review_data['rating'] = int(rating_match.group(1)) if rating_match else 0
-                except:
-                    review_data['rating'] = 0
-                
-                # Extract review text
-                try:
-                    text_element = element.find_element(By.CSS_SELECTOR, "span.wiI7pd")
-                    review_data['text'] = text_element.text.strip()
-                except:
-                    review_data['text'] = ""
-                
-                # Extract author name
-                try:
-                    author_element = element.find_element(By.CSS_SELECTOR, "div.d4r55")
-                    review_data['author'] = author_element.text.strip()
-                except:
-                    review_data['author'] = "Anonymous"
-                
-                # Extract date
-                try:
-                    date_element = element.find_element(By.CSS_SELECTOR, "span.rsqaWe")
-                    review_data['date'] = date_element.text.strip()
-                except:
-                    review_data['date'] = "Unknown"
-                
-                # Only add reviews that have actual text
-                if review_data['text'] and len(review_data['text']) > 10:
-                    reviews.append(review_data)
-                    
-            except Exception as e:
-                print(f"   ⚠️ Error extracting review {idx + 1}: {e}")
-                continue
+        for review_data in extract_reviews(driver, "div.jftiEf", GOOGLE_MAPS_REVIEW_FIELDS,
+                                           expand_selector="button.w8nwRe", limit=max_reviews):
+            # Only add reviews that have actual text
+            if review_data['text'] and len(review_data['text']) > 10:
+                reviews.append(review_data)
         
         print(f"✅ Successfully scraped {len(reviews)} reviews")
         
     except Exception as e:
+        failed = True
         print(f"❌ Error during scraping: {e}")
     
     finally:
-        driver.quit()
+        driver_pool.release(driver, discard=failed)
     
     return reviews
 
@@ -202,7 +166,8 @@ def scrape_from_place_id(place_id, max_reviews=50):
     Returns:
         List of review dictionaries
     """
-    driver = setup_driver()
+    driver = driver_pool.acquire(GOOGLE_MAPS_HOST)
+    failed = False
     reviews = []
     
     try:
@@ -210,8 +175,7 @@ def scrape_from_place_id(place_id, max_reviews=50):
         maps_url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
         
         print(f"🔍 Loading Google Maps from place_id...")
-        driver.get(maps_url)
-        time.sleep(4)
+        load_page(driver, maps_url, timeout=8, name='maps_place')
         
         # The rest is similar to scrape_google_maps_reviews
         # Try to open reviews
@@ -221,7 +185,7 @@ def scrape_from_place_id(place_id, max_reviews=50):
             )
             driver.execute_script("arguments[0].click();", reviews_button)
             print("✅ Opened reviews section")
-            time.sleep(3)
+            wait_for_selector(driver, "div.jftiEf", timeout=8, name='maps_reviews')
         except Exception as e:
             print(f"⚠️ Could not open reviews: {e}")
             return reviews
@@ -237,19 +201,13 @@ def scrape_from_place_id(place_id, max_reviews=50):
         
         # Scroll to load reviews
         print(f"📜 Scrolling to load reviews...")
-        last_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
         scroll_attempts = 0
         max_scrolls = 15
         
         while scroll_attempts < max_scrolls:
-            driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div)
-            time.sleep(2.5)
-            
-            new_height = driver.execute_script("return arguments[0].scrollHeight", scrollable_div)
-            if new_height == last_height:
+            if not scroll_and_wait(driver, container=scrollable_div, name='maps_scroll'):
                 break
             
-            last_height = new_height
             scroll_attempts += 1
             
             current_count = len(driver.find_elements(By.CSS_SELECTOR, "div.jftiEf"))
@@ -257,64 +215,19 @@ def scrape_from_place_id(place_id, max_reviews=50):
             if current_count >= max_reviews:
                 break
         
-        # Expand "More" buttons
-        more_buttons = driver.find_elements(By.CSS_SELECTOR, "button.w8nwRe")
-        for button in more_buttons[:max_reviews]:
-            try:
-                driver.execute_script("arguments[0].click();", button)
-                time.sleep(0.2)
-            except:
-                pass
-        
-        # Extract reviews
-        review_elements = driver.find_elements(By.CSS_SELECTOR, "div.jftiEf")
-        
-        for element in review_elements[:max_reviews]:
-            try:
-                review_data = {}
-                
-                # Extract rating
-                try:
-                    rating_element = element.find_element(By.CSS_SELECTOR, "span.kvMYJc")
-                    rating_aria = rating_element.get_attribute("aria-label")
-                    rating_match = re.search(r'(\d+)', rating_aria)
-                    review_data['rating'] = int(rating_match.group(1)) if rating_match else 0
-                except:
-                    review_data['rating'] = 0
-                
-                # Extract text
-                try:
-                    text_element = element.find_element(By.CSS_SELECTOR, "span.wiI7pd")
-                    review_data['text'] = text_element.text.strip()
-                except:
-                    review_data['text'] = ""
-                
-                # Extract author
-                try:
-                    author_element = element.find_element(By.CSS_SELECTOR, "div.d4r55")
-                    review_data['author'] = author_element.text.strip()
-                except:
-                    review_data['author'] = "Anonymous"
-                
-                # Extract date
-                try:
-                    date_element = element.find_element(By.CSS_SELECTOR, "span.rsqaWe")
-                    review_data['date'] = date_element.text.strip()
-                except:
-                    review_data['date'] = "Unknown"
-                
-                if review_data['text'] and len(review_data['text']) > 10:
-                    reviews.append(review_data)
-                    
-            except Exception as e:
-                continue
+        # Expand "More" buttons and read every review in one script round trip
+        for review_data in extract_reviews(driver, "div.jftiEf", GOOGLE_MAPS_REVIEW_FIELDS,
+                                           expand_selector="button.w8nwRe", limit=max_reviews):
+            if review_data['text'] and len(review_data['text']) > 10:
+                reviews.append(review_data)
         
         print(f"✅ Successfully scraped {len(reviews)} reviews")
         
     except Exception as e:
+        failed = True
         print(f"❌ Error: {e}")
     finally:
-        driver.quit()
+        driver_pool.release(driver, discard=failed)
     
     return reviews
 
@@ -0,0 +1,196 @@
+"""
+Sentiment Result Cache
+Content-addressed cache for sentiment results with an in-memory LRU tier
+and an on-disk SQLite tier that survives server restarts
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_text(text):
+    """Normalize review text so trivially different copies share a cache key"""
+    return re.sub(r'\s+', ' ', (text or '').strip().lower())
+
+def make_cache_key(text, rating=None, method='ai', model=None):
+    """
+    Build a content-addressed key for a sentiment result
+
+    Args:
+        text: Review text (normalized before hashing)
+        rating: Star rating passed to the analyzer, if any
+        method: Requested analysis method (e.g., "ai", "keyword+textblob")
+        model: Model name used for the analysis, if any
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    rating = None if rating is None else float(rating)
+    raw = json.dumps([normalize_text(text), rating, method, model], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class SentimentCache:
+    """Two-tier (memory LRU + SQLite) cache of sentiment result dicts"""
+
+    def __init__(self, db_path, max_memory_entries=5000, max_disk_entries=100000):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0
+        }
+
+        self._conn = None
+        self._disk_entries = 0
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sentiment_cache_access ON sentiment_cache(last_access)"
+            )
+            self._conn.commit()
+            self._disk_entries = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"⚠️ Sentiment cache disk tier unavailable, using memory only: {e}")
+            self._conn = None
+
+    def get(self, key):
+        """Return a copy of the cached result for key, or None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Look up several keys at once; returns {key: result} for hits only"""
+        found = {}
+        disk_keys = []
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = dict(value)
+                    self._counters['memory_hits'] += 1
+                else:
+                    disk_keys.append(key)
+
+            disk_keys = list(dict.fromkeys(disk_keys))
+            if disk_keys and self._conn is not None:
+                now = time.time()
+                try:
+                    for offset in range(0, len(disk_keys), 500):
+                        part = disk_keys[offset:offset + 500]
+                        placeholders = ','.join('?' * len(part))
+                        rows = self._conn.execute(
+                            f"SELECT key, value FROM sentiment_cache WHERE key IN ({placeholders})",
+                            part
+                        ).fetchall()
+                        for key, raw in rows:
+                            value = json.loads(raw)
+                            found[key] = dict(value)
+                            self._remember(key, value)
+                            self._counters['disk_hits'] += 1
+                        if rows:
+                            self._conn.executemany(
+                                "UPDATE sentiment_cache SET last_access = ? WHERE key = ?",
+                                [(now, key) for key, _ in rows]
+                            )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Sentiment cache read failed: {e}")
+
+            self._counters['misses'] += sum(1 for key in disk_keys if key not in found)
+        return found
+
+    def set(self, key, value):
+        """Store a result under key in both tiers"""
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        """Store several {key: result} entries in both tiers"""
+        if not items:
+            return
+        with self._lock:
+            now = time.time()
+            for key, value in items.items():
+                self._remember(key, dict(value))
+            self._counters['writes'] += len(items)
+
+            if self._conn is None:
+                return
+            try:
+                for key, value in items.items():
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sentiment_cache (key, value, last_access) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), now)
+                    )
+                # Recount only when the cap may have been crossed
+                self._disk_entries += len(items)
+                if self._disk_entries > self.max_disk_entries:
+                    self._disk_entries = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+                    self._evict_disk()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Sentiment cache write failed: {e}")
+
+    def stats(self):
+        """Hit/miss/eviction counters and tier sizes"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['memory_entries'] = len(self._memory)
+            counters['disk_entries'] = self._disk_entries if self._conn is not None else 0
+        lookups = counters['memory_hits'] + counters['disk_hits'] + counters['misses']
+        counters['hit_rate'] = round((counters['memory_hits'] + counters['disk_hits']) / lookups, 3) if lookups else 0
+        counters['max_memory_entries'] = self.max_memory_entries
+        counters['max_disk_entries'] = self.max_disk_entries
+        return counters
+
+    def clear(self):
+        """Drop every cached result from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sentiment_cache")
+                self._conn.commit()
+            self._disk_entries = 0
+
+    def _remember(self, key, value):
+        """Insert into the memory tier, evicting least recently used entries (lock held)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters['memory_evictions'] += 1
+
+    def _evict_disk(self):
+        """Trim the disk tier back under its cap by last access time (lock held)"""
+        excess = self._disk_entries - self.max_disk_entries
+        if excess <= 0:
+            return
+        # Evict an extra 10% so we don't trim on every write near the cap
+        excess += self.max_disk_entries // 10
+        self._conn.execute("""
+            DELETE FROM sentiment_cache WHERE key IN (
+                SELECT key FROM sentiment_cache ORDER BY last_access ASC LIMIT ?
+            )
+        """, (excess,))
+        evicted = self._conn.execute("SELECT changes()").fetchone()[0]
+        self._disk_entries -= evicted
+        self._counters['disk_evictions'] += evicted
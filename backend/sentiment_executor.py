@@ -0,0 +1,215 @@
+"""
+Concurrent Sentiment Executor
+Fans out OpenAI chat completion requests with AsyncOpenAI on a background
+event loop, bounded by an in-flight limit and requests/tokens per minute
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from openai import AsyncOpenAI, RateLimitError, APIConnectionError, InternalServerError
+
+class AsyncTokenBucket:
+    """Token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute, burst_seconds=5):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount=1):
+        """Wait until amount tokens are available; returns seconds spent waiting"""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+def estimate_tokens(payload):
+    """Rough token estimate for a chat request (prompt chars / 4 + completion budget)"""
+    prompt_chars = sum(len(str(m.get('content', ''))) for m in payload.get('messages', []))
+    return prompt_chars // 4 + payload.get('max_tokens', 256)
+
+def retry_after_seconds(error):
+    """Read the server's retry-after hint from a 429 response, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    retry_ms = headers.get('retry-after-ms')
+    if retry_ms:
+        try:
+            return float(retry_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return None
+
+class ConcurrentSentimentExecutor:
+    """
+    Runs chat completion payloads concurrently against OpenAI
+
+    Requests share one process-wide event loop, semaphore and rate limiters,
+    so concurrent Flask requests together stay under the org limits.
+    """
+
+    def __init__(self, api_key, base_url=None, max_in_flight=8, requests_per_minute=500,
+                 tokens_per_minute=200000, max_retries=5):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+
+        self._start_lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._request_bucket = None
+        self._token_bucket = None
+        self._pause_until = 0.0
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'rate_limited': 0,
+            'retries': 0,
+            'throttle_wait_seconds': 0.0,
+            'in_flight': 0,
+            'peak_in_flight': 0
+        }
+
+    def map(self, payloads, timeout=None):
+        """
+        Run chat completion payloads concurrently
+
+        Args:
+            payloads: List of keyword-argument dicts for chat.completions.create
+            timeout: Overall timeout in seconds for the whole set
+
+        Returns:
+            List aligned with payloads; each entry is the response message
+            content, or the Exception that request finally failed with
+        """
+        if not payloads:
+            return []
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._run_all(payloads), loop)
+        return future.result(timeout)
+
+    def stats(self):
+        """Request, retry and throttling counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['throttle_wait_seconds'] = round(stats['throttle_wait_seconds'], 3)
+        stats['max_in_flight'] = self.max_in_flight
+        stats['requests_per_minute'] = self.requests_per_minute
+        stats['tokens_per_minute'] = self.tokens_per_minute
+        return stats
+
+    def _ensure_loop(self):
+        """Start the background event loop thread on first use"""
+        with self._start_lock:
+            if self._loop is None:
+                ready = threading.Event()
+                loop = asyncio.new_event_loop()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run_loop, name='sentiment-executor', daemon=True).start()
+                ready.wait()
+                asyncio.run_coroutine_threadsafe(self._init_on_loop(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _init_on_loop(self):
+        """Create the client and limiters inside the executor loop"""
+        # Retries are handled here so 429 backoff applies to the whole executor
+        self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._request_bucket = AsyncTokenBucket(self.requests_per_minute)
+        self._token_bucket = AsyncTokenBucket(self.tokens_per_minute)
+
+    async def _run_all(self, payloads):
+        # gather() keeps results in input order
+        return await asyncio.gather(*(self._run_one(p) for p in payloads), return_exceptions=True)
+
+    async def _run_one(self, payload):
+        tokens = estimate_tokens(payload)
+        self._bump('requests')
+
+        for attempt in range(self.max_retries + 1):
+            # Honour any executor-wide pause set by a recent 429
+            pause = self._pause_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            waited = await self._request_bucket.acquire(1)
+            waited += await self._token_bucket.acquire(tokens)
+            if waited:
+                self._bump('throttle_wait_seconds', waited)
+
+            try:
+                async with self._semaphore:
+                    self._track_in_flight(1)
+                    try:
+                        response = await self._client.chat.completions.create(**payload)
+                    finally:
+                        self._track_in_flight(-1)
+                self._bump('succeeded')
+                return response.choices[0].message.content
+            except RateLimitError as e:
+                self._bump('rate_limited')
+                if attempt >= self.max_retries:
+                    self._bump('failed')
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = min(30.0, (2 ** attempt) + random.random())
+                self._pause_until = max(self._pause_until, time.monotonic() + delay)
+                print(f"⚠️ OpenAI rate limited, backing off {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+            except (APIConnectionError, InternalServerError):
+                if attempt >= self.max_retries:
+                    self._bump('failed')
+                    raise
+                await asyncio.sleep(min(30.0, (2 ** attempt) * 0.5 + random.random()))
+            except Exception:
+                self._bump('failed')
+                raise
+            self._bump('retries')
+
+    def _bump(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _track_in_flight(self, delta):
+        with self._stats_lock:
+            self._stats['in_flight'] += delta
+            self._stats['peak_in_flight'] = max(self._stats['peak_in_flight'], self._stats['in_flight'])
@@ -0,0 +1,110 @@
+"""
+Test script for the HTTP Amazon fetcher, using saved pages (no network needed)
+"""
+import os
+import amazon_http
+import amazon_scraper
+from amazon_http import AMAZON_BASE_URL, AmazonBlocked, fetch_amazon_reviews
+from host_rate_limiter import HostRateLimiter
+
+# Keep the tests from waiting on amazon.com's rate limit
+amazon_http.host_limiter = HostRateLimiter({'amazon.com': (1000.0, 1000)})
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+class FakeCookie:
+    def __init__(self, name):
+        self.name = name
+
+class FakeSession:
+    """Routes home, search and product URLs to fixture pages"""
+
+    def __init__(self, search_page='amazon_search.html', cookies=()):
+        self.search_page = search_page
+        self.cookies = list(cookies)
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url[len(AMAZON_BASE_URL):])
+        if url == f"{AMAZON_BASE_URL}/":
+            return FakeResponse(200, _fixture('amazon_home.html'))
+        if url.startswith(f"{AMAZON_BASE_URL}/s?k="):
+            return FakeResponse(200, _fixture(self.search_page))
+        if '/dp/' in url:
+            return FakeResponse(200, _fixture('amazon_product.html'))
+        return FakeResponse(404)
+
+def test_parses_search_and_product_page():
+    http = FakeSession()
+    product_info, reviews = fetch_amazon_reviews("Dr Martens 1460 boots", max_reviews=20, http=http)
+
+    assert http.requested == [
+        '/',
+        '/s?k=Dr+Martens+1460+boots',
+        '/Dr-Martens-Smooth-Leather-Boots/dp/B000O3RH1I/ref=sr_1_1?keywords=dr+martens+1460'
+    ]
+    assert product_info == {
+        'name': 'Dr. Martens Unisex-Adult 1460 Smooth Leather Lace Up Boots',
+        'url': f"{AMAZON_BASE_URL}/Dr-Martens-Smooth-Leather-Boots/dp/B000O3RH1I/ref=sr_1_1?keywords=dr+martens+1460",
+        'rating': 4.5,
+        'total_ratings': 38412
+    }
+    assert len(reviews) == 7  # 8 cards, one too short to keep
+    assert reviews[0] == {
+        'rating': 5.0,
+        'title': 'Classic for a reason',
+        'text': 'Took about two weeks to break in, now the most comfortable boots I own. Sizing is true to UK size.',
+        'author': 'Sarah',
+        'date': 'Reviewed in the United States on March 3, 2024',
+        'verified': True
+    }
+    assert [r['verified'] for r in reviews].count(False) == 1
+
+def test_existing_session_skips_homepage():
+    http = FakeSession(cookies=[FakeCookie('session-id')])
+    _, reviews = fetch_amazon_reviews("Dr Martens 1460 boots", max_reviews=3, http=http)
+    assert len(reviews) == 3
+    assert http.requested[0].startswith('/s?k=')
+
+def test_captcha_falls_back_to_browser():
+    blocked = FakeSession(search_page='amazon_captcha.html')
+    try:
+        fetch_amazon_reviews("Dr Martens 1460 boots", http=blocked)
+        assert False, "expected AmazonBlocked"
+    except AmazonBlocked:
+        pass
+
+    acquired = []
+
+    def acquire(host=None):
+        acquired.append(host)
+        raise RuntimeError("no browser in tests")
+
+    original_session, original_acquire = amazon_http.session, amazon_scraper.driver_pool.acquire
+    amazon_http.session = blocked
+    amazon_scraper.driver_pool.acquire = acquire
+    try:
+        amazon_scraper.scrape_amazon_reviews("Dr Martens 1460 boots")
+        assert False, "expected the browser path to be tried"
+    except RuntimeError:
+        pass
+    finally:
+        amazon_http.session, amazon_scraper.driver_pool.acquire = original_session, original_acquire
+    assert acquired == [amazon_scraper.AMAZON_HOST]
+
+if __name__ == "__main__":
+    test_parses_search_and_product_page()
+    print("✅ Search and product page parsed")
+    test_existing_session_skips_homepage()
+    print("✅ Existing session skips homepage")
+    test_captcha_falls_back_to_browser()
+    print("✅ CAPTCHA falls back to browser")
@@ -0,0 +1,110 @@
+"""
+Test script for the shared API client registry
+"""
+import threading
+import time
+from client_registry import ClientPool, ClientProxy, ClientRegistry
+
+class FakeClient:
+    def __init__(self, serial):
+        self.serial = serial
+
+def _counting_factory(delay=0.0):
+    built = []
+
+    def factory():
+        time.sleep(delay)
+        built.append(FakeClient(len(built)))
+        return built[-1]
+    return factory, built
+
+def test_builds_once_across_threads():
+    registry = ClientRegistry()
+    factory, built = _counting_factory(delay=0.05)
+    registry.register('youtube', factory)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('youtube'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1 and all(client is built[0] for client in results)
+    stats = registry.stats()['youtube']
+    assert stats['builds'] == 1 and stats['reuses'] == 7
+    assert stats['setup_seconds_saved'] >= 0.3  # 7 reuses x ~0.05s build
+
+def test_failure_triggers_health_check_or_rebuild():
+    registry = ClientRegistry()
+    healthy = {'ok': True}
+    checked_factory, checked = _counting_factory()
+    registry.register('reddit', checked_factory, health_check=lambda client: healthy['ok'])
+    plain_factory, plain = _counting_factory()
+    registry.register('youtube', plain_factory)
+    registry.get('reddit')
+    registry.get('youtube')
+
+    # Health check passes: keep the client
+    registry.report_failure('reddit')
+    assert registry.get('reddit') is checked[0]
+    # Health check fails: rebuild
+    healthy['ok'] = False
+    registry.report_failure('reddit')
+    assert registry.get('reddit') is checked[1]
+    # No health check: a reported failure means rebuild
+    registry.report_failure('youtube')
+    assert registry.get('youtube') is plain[1]
+
+    stats = registry.stats()
+    assert stats['reddit']['health_checks'] == 2 and stats['reddit']['recreated'] == 1
+    assert stats['youtube']['recreated'] == 1 and stats['youtube']['health_checks'] == 0
+
+def test_proxy_follows_recreated_client():
+    registry = ClientRegistry()
+    factory, built = _counting_factory()
+    registry.register('openai', factory)
+    proxy = ClientProxy(registry, 'openai')
+
+    assert proxy.serial == 0
+    registry.invalidate('openai')
+    assert proxy.serial == 1
+    assert registry.stats()['openai']['reuses'] == 0  # Attribute lookups aren't counted as reuses
+
+def test_pool_leases_each_client_to_one_thread():
+    factory, built = _counting_factory()
+    pool = ClientPool('reddit', factory)
+    lock = threading.Lock()
+    in_use = set()
+    overlaps = []
+
+    def work():
+        with pool.lease() as client:
+            with lock:
+                overlaps.append(client.serial in in_use)
+                in_use.add(client.serial)
+            time.sleep(0.05)
+            with lock:
+                in_use.discard(client.serial)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 4 and not any(overlaps)
+
+    # Returned clients are reused
+    with pool.lease() as client:
+        assert client in built
+    assert len(built) == 4
+
+if __name__ == "__main__":
+    test_builds_once_across_threads()
+    print("✅ One build shared across threads")
+    test_failure_triggers_health_check_or_rebuild()
+    print("✅ Reported failures health-check or rebuild")
+    test_proxy_follows_recreated_client()
+    print("✅ Proxy follows the re-created client")
+    test_pool_leases_each_client_to_one_thread()
+    print("✅ Pooled clients leased to one thread at a time")
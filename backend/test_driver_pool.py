@@ -0,0 +1,74 @@
+"""
+Test script for the WebDriver pool, using stand-in drivers instead of Chrome
+"""
+from driver_pool import DriverPool
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ['main']
+        self.current_url = 'about:blank'
+        self.cookies_cleared = 0
+        self.quit_called = False
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def close(self):
+        self.window_handles.pop()
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        self.quit_called = True
+
+def test_reuses_and_resets_browsers():
+    """A released browser is reset and handed out again instead of launching a new one"""
+    pool = DriverPool('test', FakeDriver, max_idle=1, max_uses=10)
+    driver = pool.acquire('example.com')
+    driver.window_handles.append('popup')
+    pool.release(driver)
+
+    assert driver.window_handles == ['main']
+    assert driver.cookies_cleared == 1
+    again = pool.acquire('example.com')
+    try:
+        assert again is driver
+        assert pool.stats()['created'] == 1
+        assert pool.stats()['reused'] == 1
+    finally:
+        # Also frees example.com's per-host slot
+        pool.release(again)
+    assert pool.stats()['leased'] == 0
+
+def test_recycles_after_max_uses_and_discards_failures():
+    pool = DriverPool('test', FakeDriver, max_idle=1, max_uses=2)
+    first = pool.acquire()
+    pool.release(first)
+    pool.release(pool.acquire())  # Second use hits max_uses
+    assert first.quit_called
+
+    try:
+        with pool.lease() as driver:
+            raise RuntimeError('page crashed')
+    except RuntimeError:
+        pass
+    assert driver.quit_called
+    assert pool.stats()['discarded'] == 1
+    assert pool.stats()['idle'] == 0
+
+if __name__ == "__main__":
+    test_reuses_and_resets_browsers()
+    print("✅ Browsers are reused and reset")
+    test_recycles_after_max_uses_and_discards_failures()
+    print("✅ Browsers are recycled and discarded")
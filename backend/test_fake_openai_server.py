@@ -0,0 +1,51 @@
+"""
+Test script for the fake OpenAI server
+Checks the canned responses parse the way app.py expects
+"""
+import json
+from openai import OpenAI, RateLimitError
+from fake_openai_server import FakeOpenAIServer, build_completion
+
+def test_batch_sentiment_has_one_entry_per_review():
+    """Batch prompts get an indexed result for every numbered review"""
+    payload = {
+        'messages': [
+            {'role': 'system', 'content': 'You are a sentiment analyzer. ... {"results": [...]}'},
+            {'role': 'user', 'content': 'Analyze the sentiment of these 3 reviews:\n\n'
+                                        'Review 0:\nLove them, great boots\n\n'
+                                        'Review 1:\nTerrible, fell apart\n\n'
+                                        'Review 2:\nThey arrived on Tuesday'}
+        ]
+    }
+    kind, content = build_completion(payload)
+    results = json.loads(content)['results']
+    assert kind == 'sentiment_batch'
+    assert [r['index'] for r in results] == [0, 1, 2]
+    assert [r['sentiment'] for r in results] == ['positive', 'negative', 'neutral']
+
+def test_round_trip_and_rate_limit():
+    """The OpenAI client can talk to the server, and injected 429s carry retry-after"""
+    server = FakeOpenAIServer(latency=0.0).start()
+    try:
+        client = OpenAI(api_key='fake', base_url=server.base_url, max_retries=0)
+        response = client.chat.completions.create(
+            model='gpt-4o',
+            messages=[{'role': 'user', 'content': 'What do people complain about?'}]
+        )
+        assert response.choices[0].message.content
+
+        server.rate_limit_rate = 1.0
+        try:
+            client.chat.completions.create(model='gpt-4o', messages=[{'role': 'user', 'content': 'hi'}])
+            assert False, 'expected a 429'
+        except RateLimitError as e:
+            assert e.response.headers.get('retry-after-ms') == '500'
+        assert server.stats()['rate_limited'] == 1
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    test_batch_sentiment_has_one_entry_per_review()
+    print("✅ Batch sentiment responses")
+    test_round_trip_and_rate_limit()
+    print("✅ Round trip and rate limiting")
@@ -0,0 +1,53 @@
+"""
+Test script for the per-host token bucket rate limiter
+"""
+import threading
+import time
+from host_rate_limiter import HostRateLimiter, parse_host_limits
+
+def test_burst_then_spaced():
+    limiter = HostRateLimiter({'trustpilot.com': (10.0, 2)})
+    waits = [limiter.acquire('trustpilot.com') for _ in range(4)]
+    assert waits[0] == 0 and waits[1] == 0
+    # Each call after the burst waits one refill interval (0.1s)
+    assert 0.05 < waits[2] <= 0.1 and 0.05 < waits[3] <= 0.1
+    stats = limiter.stats()['trustpilot.com']
+    assert stats['acquired'] == 4 and stats['waited'] == 2 and stats['wait_seconds'] >= 0.15
+
+def test_hosts_do_not_block_each_other():
+    limiter = HostRateLimiter({'amazon.com': (1.0, 1), 'trustpilot.com': (1.0, 1)})
+    limiter.acquire('amazon.com')
+    start = time.perf_counter()
+    threads = [threading.Thread(target=limiter.acquire, args=(host,)) for host in ('trustpilot.com', 'reddit.com')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.perf_counter() - start < 0.05
+
+def test_subdomains_share_their_site_bucket():
+    limiter = HostRateLimiter({'trustpilot.com': (1.0, 1)})
+    assert limiter.acquire('uk.trustpilot.com') == 0
+    assert limiter.acquire('www.trustpilot.com') > 0.5
+    assert list(limiter.stats()) == ['trustpilot.com']
+    assert limiter.limit_key('nottrustpilot.com') == 'nottrustpilot.com'
+
+def test_parse_host_limits():
+    assert parse_host_limits("amazon.com=0.5/2, trustpilot.com=0.25,bad") == {
+        'amazon.com': (0.5, 2),
+        'trustpilot.com': (0.25, 1)
+    }
+    # A zero/negative/non-finite rate or a burst below 1 would break TokenBucket: the host keeps its default
+    assert parse_host_limits("a.com=0/2,b.com=-1,c.com=nan/2,d.com=1/0,e.com=2/-3,f.com=inf/1,g.com=3/5") == {
+        'g.com': (3.0, 5)
+    }
+
+if __name__ == "__main__":
+    test_burst_then_spaced()
+    print("✅ Burst, then spaced by the refill rate")
+    test_hosts_do_not_block_each_other()
+    print("✅ Different hosts don't wait on each other")
+    test_subdomains_share_their_site_bucket()
+    print("✅ Subdomains share their site's bucket")
+    test_parse_host_limits()
+    print("✅ HOST_RATE_LIMITS parsed")
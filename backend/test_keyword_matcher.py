@@ -0,0 +1,56 @@
+"""
+Test script for the single-pass keyword matcher
+Checks counts match the old per-keyword `word in text` scan
+"""
+import json
+import os
+import random
+from keyword_matcher import NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS, count_keywords, count_keywords_batch
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sentiment_corpus.json')
+
+def substring_counts(text):
+    """The per-keyword scan _fallback_sentiment (app.py) used before the matcher"""
+    text_lower = text.lower()
+    negative_count = sum(1 for word in NEGATIVE_KEYWORDS if word in text_lower)
+    positive_count = sum(1 for word in POSITIVE_KEYWORDS if word in text_lower)
+    return negative_count, positive_count
+
+def _adversarial_texts(count=2000, seed=7):
+    """Keywords glued together, overlapping and split by filler ("recommendisappointed")"""
+    rng = random.Random(seed)
+    keywords = NEGATIVE_KEYWORDS + POSITIVE_KEYWORDS
+    fillers = ['', '', ' ', 'ed', 'ing', 's', ' not ', 'dis', 'un', "n't ", '!', 'ly ']
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 8)):
+            keyword = rng.choice(keywords)
+            if rng.random() < 0.3:
+                keyword = keyword[rng.randint(1, len(keyword) - 1):]  # Start mid-keyword
+            if rng.random() < 0.2:
+                keyword = keyword.upper()
+            parts.append(keyword + rng.choice(fillers))
+        texts.append(''.join(parts))
+    return texts
+
+def test_parity_with_substring_scan():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        texts = json.load(f)
+    texts += ['recommendisappointed', 'not recommended', 'Highly Recommend', "don't buy, DON'T BUY",
+              'poorly madeworth', 'fell apartfell apart', 'bestworst', '', 'unhappyhappy']
+    texts += _adversarial_texts()
+
+    expected = [substring_counts(text) for text in texts]
+    assert [count_keywords(text) for text in texts] == expected
+    assert count_keywords_batch(texts) == expected
+
+def test_batch_handles_empty_entries():
+    assert count_keywords_batch([]) == []
+    assert count_keywords_batch([None, '', 'Great boots']) == [(0, 0), (0, 0), (0, 1)]
+
+if __name__ == "__main__":
+    test_parity_with_substring_scan()
+    print("✅ Counts match the per-keyword substring scan")
+    test_batch_handles_empty_entries()
+    print("✅ Batch counting handles empty entries")
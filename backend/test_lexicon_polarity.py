@@ -0,0 +1,90 @@
+"""
+Test script for the vectorized lexicon polarity engine
+Checks parity with TextBlob on the fixture corpus and compares throughput
+"""
+import json
+import os
+import time
+from textblob import TextBlob
+from lexicon_polarity import polarity_batch
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sentiment_corpus.json')
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+def label(polarity):
+    """Same TextBlob thresholds analyze_sentiment uses"""
+    if polarity > 0.05:
+        return 'positive'
+    if polarity < -0.05:
+        return 'negative'
+    return 'neutral'
+
+def assert_parity(texts):
+    """Engine scores must match TextBlob's pattern analyzer exactly"""
+    scores = polarity_batch(texts)
+
+    mismatches = []
+    for text, (polarity, subjectivity) in zip(texts, scores):
+        expected = TextBlob(text).sentiment
+        if (abs(expected.polarity - polarity) > 1e-9 or
+                abs(expected.subjectivity - subjectivity) > 1e-9 or
+                label(expected.polarity) != label(polarity)):
+            mismatches.append((text, expected.polarity, polarity))
+
+    for text, expected, actual in mismatches:
+        print(f"❌ TextBlob {expected:.3f} vs engine {actual:.3f}: {text[:60]}")
+    assert not mismatches, f"{len(mismatches)}/{len(texts)} reviews differ from TextBlob"
+
+def test_parity_with_textblob():
+    """Every fixture review scores exactly as with TextBlob"""
+    assert_parity(load_corpus())
+
+def test_negation_and_modifier_chains():
+    """Negations and intensifiers in every position TextBlob treats differently"""
+    openings = ['', 'not ', 'not a ', 'no ', 'never ', 'very ', 'not very ', 'really not ',
+                'really really ', 'not really ', 'extremely not ', 'is not a very ', "don't ", 'not at all ']
+    words = ['good', 'bad', 'comfortable', 'cheap', 'terrible', 'happy']
+    endings = ['', '!', '!!', ' :)', ' at all', ' (!)', '. Really not worth it.']
+    assert_parity([opening + word + ending for opening in openings for word in words for ending in endings])
+
+def test_empty_and_unknown_texts():
+    """Texts with no lexicon words score neutral"""
+    assert polarity_batch([]) == []
+    assert polarity_batch(['', 'zzz qqq', None]) == [(0.0, 0.0), (0.0, 0.0), (0.0, 0.0)]
+
+def benchmark(repeat=50):
+    """Print reviews/second for TextBlob and the engine"""
+    texts = load_corpus() * repeat
+    polarity_batch(texts[:5])  # Load the lexicon before timing
+
+    start = time.perf_counter()
+    for text in texts:
+        TextBlob(text).sentiment
+    textblob_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    polarity_batch(texts)
+    engine_seconds = time.perf_counter() - start
+
+    print(f"📊 {len(texts)} reviews")
+    print(f"   TextBlob: {len(texts) / textblob_seconds:,.0f} reviews/s")
+    print(f"   Engine:   {len(texts) / engine_seconds:,.0f} reviews/s")
+    print(f"   Speedup:  {textblob_seconds / engine_seconds:.1f}x")
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing Lexicon Polarity Engine")
+    print("=" * 60)
+
+    test_parity_with_textblob()
+    print("✅ Parity with TextBlob")
+    test_negation_and_modifier_chains()
+    print("✅ Negation and intensifier chains")
+    test_empty_and_unknown_texts()
+    print("✅ Empty and unknown texts")
+
+    print()
+    benchmark()
@@ -0,0 +1,56 @@
+"""
+Test script for the page readiness waits (no browser needed)
+"""
+import json
+import time
+from page_readiness import wait_for_network_idle, wait_for_selector, readiness_metrics
+
+def _event(method, request_id):
+    return {'message': json.dumps({'message': {'method': method, 'params': {'requestId': request_id}}})}
+
+class FakeDriver:
+    """Serves a scripted sequence of CDP log batches, one per get_log call"""
+
+    def __init__(self, batches, elements=None):
+        self.batches = list(batches)
+        self.elements = elements or {}
+
+    def get_log(self, log_type):
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_script(self, script, *args):
+        return 'complete'
+
+    def find_elements(self, by, selector):
+        return self.elements.get(selector, [])
+
+def test_network_idle_waits_for_requests():
+    """Idle is reported only after in-flight requests finish and the network stays quiet"""
+    driver = FakeDriver([
+        [_event('Network.requestWillBeSent', '1'), _event('Network.requestWillBeSent', '2'),
+         _event('Network.requestWillBeSent', '3')],
+        [],
+        [_event('Network.loadingFinished', '1'), _event('Network.loadingFailed', '2')],
+    ])
+    start = time.monotonic()
+    assert wait_for_network_idle(driver, idle_seconds=0.3, max_in_flight=1, timeout=3, name='test_idle')
+    assert 0.3 <= time.monotonic() - start < 1.5
+    assert readiness_metrics.stats()['test_idle']['timeouts'] == 0
+
+def test_network_idle_times_out():
+    driver = FakeDriver([[_event('Network.requestWillBeSent', str(i))] for i in range(100)])
+    assert not wait_for_network_idle(driver, idle_seconds=0.3, max_in_flight=0, timeout=0.5, name='test_busy')
+    assert readiness_metrics.stats()['test_busy']['timeouts'] == 1
+
+def test_selector_fallback_order():
+    driver = FakeDriver([], elements={'div.b': ['card'], 'div.c': ['other']})
+    assert wait_for_selector(driver, ['div.a', 'div.b', 'div.c'], timeout=1) == ('div.b', ['card'])
+    assert wait_for_selector(driver, ['div.missing'], timeout=0.3) == (None, [])
+
+if __name__ == "__main__":
+    test_network_idle_waits_for_requests()
+    print("✅ Network idle waits for requests")
+    test_network_idle_times_out()
+    print("✅ Network idle timeout")
+    test_selector_fallback_order()
+    print("✅ Selector fallback order")
@@ -0,0 +1,187 @@
+"""
+Test script for the Reddit scraper's concurrent comment fetch (no credentials needed)
+"""
+import threading
+import time
+from types import SimpleNamespace
+from praw.models import Comment
+import reddit_scraper
+from client_registry import registry
+from reddit_crawl_store import RedditCrawlStore
+
+def _comment(post_id, idx):
+    return Comment(None, _data={
+        'id': f"{post_id}c{idx}",
+        'body': f"Comment {idx} on {post_id}: mine lasted six years of daily wear",
+        'author': f"user{idx}",
+        'created_utc': 1700000000,
+        'score': idx,
+        'permalink': f"/r/BuyItForLife/comments/{post_id}/_/{post_id}c{idx}/"
+    })
+
+class FakeReddit:
+    """Posts with three comments each; each comment request takes 50ms"""
+
+    def __init__(self, remaining=None, reset_in=0.0, post_count=6):
+        self.auth = SimpleNamespace(limits={
+            'remaining': remaining,
+            'reset_timestamp': time.time() + reset_in if remaining is not None else None,
+            'used': None
+        })
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.comment_requests = []
+        self.searches = []
+        self.failing = set()  # Post IDs whose comment requests fail
+        self.posts = [self._post(i) for i in range(post_count)]
+
+    @staticmethod
+    def _post(i):
+        return SimpleNamespace(
+            id=f"p{i}", title=f"Post {i} about Dr Martens 1460", author=f"op{i}",
+            selftext=f"Post {i}: I have worn my 1460s for three winters and they still look great.",
+            created_utc=1700000000 + i * 3600, score=10, permalink=f"/r/BuyItForLife/comments/p{i}/",
+            subreddit='BuyItForLife'
+        )
+
+    def subreddit(self, name):
+        return SimpleNamespace(search=self.search)
+
+    def search(self, query, sort='relevance', limit=20, **kwargs):
+        self.searches.append(sort)
+        posts = sorted(self.posts, key=lambda post: -post.created_utc) if sort == 'new' else self.posts
+        return iter(posts[:limit])
+
+    def get(self, path, params=None):
+        post_id = path.split('/')[2]
+        with self.lock:
+            self.comment_requests.append((post_id, params))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        if post_id in self.failing:
+            raise RuntimeError(f"503 Service Unavailable for {post_id}")
+        return None, SimpleNamespace(children=[_comment(post_id, i) for i in range(3)])
+
+def _run(fake, max_reviews, store=None):
+    registry.invalidate('reddit')
+    original, original_store = reddit_scraper.setup_reddit, reddit_scraper.crawl_store
+    reddit_scraper.setup_reddit = lambda: fake
+    reddit_scraper.crawl_store = store or RedditCrawlStore(':memory:')
+    try:
+        streamed = []
+        start = time.perf_counter()
+        reviews = reddit_scraper.scrape_reddit_reviews("Dr Martens 1460", max_reviews=max_reviews,
+                                                       on_review=streamed.append)
+        return reviews, streamed, time.perf_counter() - start
+    finally:
+        reddit_scraper.setup_reddit, reddit_scraper.crawl_store = original, original_store
+        registry.invalidate('reddit')
+
+def test_fetches_comments_concurrently_in_order():
+    fake = FakeReddit()
+    reviews, streamed, elapsed = _run(fake, max_reviews=100)
+    assert len(reviews) == 24 and streamed == reviews
+    # Post, then its comments, in search order
+    assert [r['url'].split('/')[6] for r in reviews[:8]] == ['p0'] * 4 + ['p1'] * 4
+    assert [r['type'] for r in reviews[:4]] == ['post', 'comment', 'comment', 'comment']
+    assert fake.max_in_flight > 1 and elapsed < 6 * 0.05
+    assert fake.comment_requests[0][1] == {'limit': reddit_scraper.COMMENTS_PER_POST, 'depth': 1, 'sort': 'confidence'}
+
+def test_stops_prefetching_at_max_reviews():
+    fake = FakeReddit(post_count=20)
+    reviews, _, _ = _run(fake, max_reviews=6)
+    assert len(reviews) == 6
+    # Two posts used, plus at most one window of prefetches
+    assert len(fake.comment_requests) <= 2 + 2 * reddit_scraper.REDDIT_MAX_WORKERS
+
+def test_incremental_refresh_fetches_only_new_posts():
+    store = RedditCrawlStore(':memory:')
+    fake = FakeReddit(post_count=6)
+    first, _, _ = _run(fake, max_reviews=100, store=store)
+    assert len(first) == 24 and fake.searches == ['relevance']
+
+    fake.posts += [FakeReddit._post(6), FakeReddit._post(7)]
+    fake.comment_requests.clear()
+    fake.searches.clear()
+    refreshed, streamed, _ = _run(fake, max_reviews=32, store=store)
+    assert fake.searches == ['new']
+    assert sorted(post_id for post_id, _ in fake.comment_requests) == ['p6', 'p7']
+    assert len(refreshed) == 32 and streamed == refreshed
+    # New submissions first, then the stored backlog (newest first)
+    assert [r['url'].split('/')[6] for r in refreshed[::4]] == ['p7', 'p6', 'p5', 'p4', 'p3', 'p2', 'p1', 'p0']
+
+    # Asking for more than is stored continues the crawl, skipping known posts
+    fake.comment_requests.clear()
+    fake.searches.clear()
+    _run(fake, max_reviews=100, store=store)
+    assert fake.searches == ['new', 'relevance'] and fake.comment_requests == []
+
+def test_refresh_stores_new_posts_past_max_reviews():
+    store = RedditCrawlStore(':memory:')
+    fake = FakeReddit(post_count=6)
+    _run(fake, max_reviews=100, store=store)
+
+    fake.posts += [FakeReddit._post(6), FakeReddit._post(7)]
+    refreshed, _, _ = _run(fake, max_reviews=4, store=store)
+    assert [r['url'].split('/')[6] for r in refreshed] == ['p7'] * 4
+
+    # p6 was crawled too, so the next refresh only fetches p8 and still returns p6
+    fake.posts.append(FakeReddit._post(8))
+    fake.comment_requests.clear()
+    refreshed, _, _ = _run(fake, max_reviews=100, store=store)
+    assert [post_id for post_id, _ in fake.comment_requests] == ['p8']
+    assert 'p6' in {r['url'].split('/')[6] for r in refreshed}
+
+def test_failed_comment_fetch_is_retried_by_refresh():
+    store = RedditCrawlStore(':memory:')
+    fake = FakeReddit(post_count=6)
+    fake.failing.add('p2')
+    first, _, _ = _run(fake, max_reviews=100, store=store)
+    # p2's own text is still returned, only its comments are missing
+    assert len(first) == 21 and [r['type'] for r in first if '/p2/' in r['url']] == ['post']
+    assert store.seen_ids("Dr Martens 1460") == {'p0', 'p1', 'p3', 'p4', 'p5'}
+
+    # Newer posts in the same subreddit didn't move the watermark past p2; still failing, p2 is returned once
+    fake.comment_requests.clear()
+    refreshed, _, _ = _run(fake, max_reviews=100, store=store)
+    assert [post_id for post_id, _ in fake.comment_requests] == ['p2']
+    assert len(refreshed) == 21 and len({r['url'] for r in refreshed}) == 21
+
+    fake.failing.clear()
+    fake.comment_requests.clear()
+    refreshed, _, _ = _run(fake, max_reviews=100, store=store)
+    assert [post_id for post_id, _ in fake.comment_requests] == ['p2']
+    assert len(refreshed) == 24 and [r['type'] for r in refreshed[:4]] == ['post', 'comment', 'comment', 'comment']
+    assert len(store.seen_ids("Dr Martens 1460")) == 6
+
+    # Crawled now: the next refresh fetches nothing
+    fake.comment_requests.clear()
+    _run(fake, max_reviews=24, store=store)
+    assert fake.comment_requests == []
+
+def test_waits_for_rate_limit_reset():
+    fake = FakeReddit(remaining=1, reset_in=0.2)
+    start = time.perf_counter()
+    reddit_scraper._wait_for_rate_limit(fake)
+    assert time.perf_counter() - start >= 0.15
+    start = time.perf_counter()
+    reddit_scraper._wait_for_rate_limit(FakeReddit(remaining=500, reset_in=60))
+    assert time.perf_counter() - start < 0.05
+
+if __name__ == "__main__":
+    test_fetches_comments_concurrently_in_order()
+    print("✅ Comment trees fetched concurrently, results in search order")
+    test_stops_prefetching_at_max_reviews()
+    print("✅ Prefetching stops at max_reviews")
+    test_incremental_refresh_fetches_only_new_posts()
+    print("✅ Refresh of a known query fetches only new submissions")
+    test_refresh_stores_new_posts_past_max_reviews()
+    print("✅ Refresh stores every new post, even past max_reviews")
+    test_failed_comment_fetch_is_retried_by_refresh()
+    print("✅ Posts whose comments failed to load are retried by the next refresh")
+    test_waits_for_rate_limit_reset()
+    print("✅ Waits for the rate limit reset when nearly used up")
@@ -0,0 +1,41 @@
+"""
+Test script for near-duplicate review detection
+"""
+import json
+import os
+from review_dedupe import cluster_near_duplicates, dedupe_reviews
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'sentiment_corpus.json')
+
+REVIEW = ("These boots are absolutely amazing, I have worn them every day "
+          "for two years and they still look great.")
+
+def test_copies_cluster_together():
+    """Case/whitespace copies and copypasta with an extra sentence join the first review's cluster"""
+    texts = [
+        REVIEW,
+        "  " + REVIEW.upper(),
+        REVIEW + " Highly recommend!",
+        "Great boots",
+        "Bad boots",
+        "great   BOOTS"
+    ]
+    assert cluster_near_duplicates(texts) == [0, 0, 0, 3, 4, 3]
+
+def test_distinct_reviews_stay_apart():
+    """No two reviews in the fixture corpus are merged"""
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        corpus = json.load(f)
+    assert cluster_near_duplicates(corpus) == list(range(len(corpus)))
+
+def test_dedupe_reviews_counts_copies():
+    reviews = [{'text': REVIEW}, {'text': 'Great boots'}, {'text': REVIEW.lower()}]
+    assert dedupe_reviews(reviews) == [(reviews[0], 2), (reviews[1], 1)]
+
+if __name__ == "__main__":
+    test_copies_cluster_together()
+    print("✅ Copies cluster together")
+    test_distinct_reviews_stay_apart()
+    print("✅ Distinct reviews stay apart")
+    test_dedupe_reviews_counts_copies()
+    print("✅ Copy counts")
@@ -0,0 +1,80 @@
+"""
+Test script for the concurrent review source fan-out (fake sources, no network)
+"""
+import threading
+import time
+import review_sources
+from review_sources import ReviewSource, fan_out, get_sources
+from review_store import ReviewStore
+
+# Keep test reviews out of the real store
+review_sources.review_store = ReviewStore(':memory:')
+
+def _analyze(items):
+    return [{'sentiment': 'positive', 'polarity': 0.5, 'subjectivity': 0.5} for _ in items]
+
+def _format(review, sentiment):
+    return {**review, **sentiment}
+
+def _sleeping_source(name, delay, count=3, timeout=5, error=None):
+    def fetch(query, max_reviews):
+        time.sleep(delay)
+        if error:
+            raise error
+        return [{'text': f"{name} review {i} for {query}", 'rating': 4} for i in range(min(count, max_reviews))]
+    return ReviewSource(name, fetch, _format, timeout=timeout)
+
+def test_sources_run_concurrently():
+    sources = [_sleeping_source(f"source{i}", 0.2) for i in range(4)]
+    start = time.perf_counter()
+    results = fan_out("Dr Martens 1460", 2, _analyze, sources=sources)
+    assert time.perf_counter() - start < 0.4  # Not 4 x 0.2s
+    assert list(results) == ['source0', 'source1', 'source2', 'source3']
+    assert all(r['status'] == 'ok' and len(r['reviews']) == 2 and len(r['sentiments']) == 2 for r in results.values())
+
+def test_errors_and_timeouts_are_isolated():
+    sources = [
+        _sleeping_source('fast', 0.05),
+        _sleeping_source('broken', 0.05, error=RuntimeError("blocked")),
+        _sleeping_source('stuck', 2.0, timeout=0.2)
+    ]
+    start = time.perf_counter()
+    results = fan_out("Dr Martens 1460", 10, _analyze, sources=sources)
+    assert time.perf_counter() - start < 0.5
+    assert results['fast']['status'] == 'ok' and len(results['fast']['reviews']) == 3
+    assert results['broken']['status'] == 'error' and results['broken']['error'] == 'blocked'
+    assert results['stuck']['status'] == 'timeout' and results['stuck']['reviews'] == []
+
+def test_scoring_starts_before_slow_sources_finish():
+    scored_at = {}
+    lock = threading.Lock()
+
+    def analyze(items):
+        with lock:
+            scored_at[items[0]['text'].split()[0]] = time.perf_counter()
+        return _analyze(items)
+
+    start = time.perf_counter()
+    fan_out("Dr Martens 1460", 3, analyze, sources=[_sleeping_source('fast', 0.0), _sleeping_source('slow', 0.3)])
+    assert scored_at['fast'] - start < 0.15 and scored_at['slow'] - start >= 0.3
+
+def test_scored_reviews_are_stored():
+    fan_out("Dr Martens Jadon", 2, _analyze, sources=[_sleeping_source('stored', 0.0)])
+    stored = review_sources.review_store.get_reviews('dr-martens-jadon')
+    assert len(stored) == 2 and {r['source'] for r in stored} == {'stored'}
+    assert all(r['sentiment']['sentiment'] == 'positive' for r in stored)
+
+def test_default_sources_registered():
+    assert [source.name for source in get_sources()] == ['youtube', 'amazon', 'reddit', 'trustpilot']
+
+if __name__ == "__main__":
+    test_sources_run_concurrently()
+    print("✅ Sources fetched concurrently")
+    test_errors_and_timeouts_are_isolated()
+    print("✅ Errors and timeouts isolated per source")
+    test_scoring_starts_before_slow_sources_finish()
+    print("✅ Scoring starts as each source finishes")
+    test_scored_reviews_are_stored()
+    print("✅ Scored reviews saved to the review store")
+    test_default_sources_registered()
+    print("✅ Default sources registered")
@@ -0,0 +1,63 @@
+"""
+Test script for the persistent review store (in-memory SQLite)
+"""
+from review_store import ReviewStore, iso_date, make_product_id, review_id
+
+def _youtube(comment_id, text, date='2024-03-01T10:00:00Z'):
+    return {'author': 'Viewer', 'text': text, 'date': date, 'likes': 2, 'comment_id': comment_id, 'source': 'youtube'}
+
+def test_upsert_is_idempotent_and_updates_sentiment():
+    store = ReviewStore(':memory:')
+    reviews = [_youtube('c1', 'Comfortable after the break-in week'), _youtube('c2', 'Sole split after two months')]
+    assert store.upsert_reviews('dr-martens-1460', 'youtube', reviews) == 2
+    store.upsert_reviews('dr-martens-1460', 'youtube', reviews,
+                         [{'sentiment': 'positive', 'polarity': 0.6}, None])
+    stored = {r['comment_id']: r for r in store.get_reviews('dr-martens-1460')}
+    assert len(stored) == 2 and store.stats()['reviews'] == 2
+    assert stored['c1']['sentiment']['sentiment'] == 'positive'
+    assert stored['c2']['sentiment'] is None
+
+    # A rescrape without sentiment keeps the stored result
+    store.upsert_reviews('dr-martens-1460', 'youtube', reviews[:1])
+    stored = {r['comment_id']: r for r in store.get_reviews('dr-martens-1460', source='youtube')}
+    assert stored['c1']['sentiment']['polarity'] == 0.6
+
+def test_review_ids_by_source():
+    assert review_id('youtube', {'comment_id': 'abc'}) == 'youtube:abc'
+    assert review_id('trustpilot', {'review_url': 'https://www.trustpilot.com/reviews/1'}) == \
+        'trustpilot:https://www.trustpilot.com/reviews/1'
+    assert review_id('reddit', {'url': 'https://reddit.com/r/x/1'}) == 'reddit:https://reddit.com/r/x/1'
+    amazon = {'author': 'A', 'date': 'Reviewed on March 3, 2024', 'title': 'Great', 'text': 'Great boots'}
+    assert review_id('amazon', amazon) == review_id('amazon', dict(amazon))
+    assert review_id('amazon', amazon) != review_id('amazon', {**amazon, 'text': 'Bad boots'})
+    # Browser-path Trustpilot cards without a date get today's date; the ID must not change with it
+    card = {'author': 'B', 'title': 'Comfy', 'text': 'Comfy from day one', 'date': '2024-03-01'}
+    assert review_id('trustpilot', card) == review_id('trustpilot', {**card, 'date': '2024-03-02'})
+
+def test_search_ranks_matches_within_product():
+    store = ReviewStore(':memory:')
+    store.upsert_reviews('dr-martens-1460', 'youtube', [
+        _youtube('c1', 'The leather is stiff but the sizing runs large'),
+        _youtube('c2', 'Sizing runs large, sizing chart is wrong, order a size down'),
+        _youtube('c3', 'Great colour, fast delivery')
+    ])
+    store.upsert_reviews('timberland-6-inch', 'youtube', [_youtube('t1', 'Sizing is spot on')])
+    matches = store.search('dr-martens-1460', 'What do people say about the sizing?')
+    assert [r['comment_id'] for r in matches] == ['c2', 'c1']
+    assert store.search('dr-martens-1460', 'what do they say') == []
+
+def test_product_ids_and_dates():
+    assert make_product_id("  Dr Martens 1460 ") == 'dr-martens-1460'
+    assert iso_date('2024-03-01T10:00:00Z') == '2024-03-01'
+    assert iso_date('Reviewed in the United States on March 3, 2024') == '2024-03-03'
+    assert iso_date('Unknown') is None
+
+if __name__ == "__main__":
+    test_upsert_is_idempotent_and_updates_sentiment()
+    print("✅ Upserts are idempotent and keep sentiment")
+    test_review_ids_by_source()
+    print("✅ Stable review IDs per source")
+    test_search_ranks_matches_within_product()
+    print("✅ Full-text search ranks matches within a product")
+    test_product_ids_and_dates()
+    print("✅ Product IDs and dates normalized")
@@ -0,0 +1,121 @@
+"""
+Test script for the Server-Sent Events review streams
+Drives /api/trustpilot/search/stream through the Flask test client with a stand-in scraper
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+import pytest
+from driver_pool import DriverPool
+from fake_openai_server import FakeOpenAIServer, fake_openai_app
+from review_store import ReviewStore
+from test_driver_pool import FakeDriver
+
+URL = '/api/trustpilot/search/stream?query=Dr+Martens+1460&max_reviews=1000'
+
+@contextmanager
+def stream_app():
+    """app.py with local-only sentiment and an in-memory review store"""
+    server = FakeOpenAIServer(latency=0.0).start()
+    try:
+        with fake_openai_app(server, SENTIMENT_MODE='local') as app, \
+                mock.patch.object(app, 'review_store', ReviewStore(':memory:')):
+            yield SimpleNamespace(app=app, client=app.app.test_client())
+    finally:
+        server.stop()
+
+@pytest.fixture(scope='module')
+def stream():
+    with stream_app() as env:
+        yield env
+
+def _review(idx):
+    return {'author': f'Buyer {idx}', 'text': f'Great boots, very comfortable #{idx}', 'rating': 5,
+            'review_url': f'https://www.trustpilot.com/reviews/{idx}'}
+
+def _events(body):
+    """[(event, data)] from an event-stream body"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+def test_reviews_then_statistics(stream):
+    def scrape(query, max_reviews=50, on_review=None):
+        for idx in range(5):
+            on_review(_review(idx))
+            time.sleep(0.01)
+        return [_review(idx) for idx in range(5)]
+
+    with mock.patch.object(stream.app, 'scrape_trustpilot_reviews', scrape):
+        response = stream.client.get(URL)
+        events = _events(response.get_data(as_text=True))
+
+    assert response.mimetype == 'text/event-stream'
+    assert [name for name, _ in events] == ['start'] + ['review'] * 5 + ['statistics']
+    assert [data['author'] for name, data in events if name == 'review'] == [f'Buyer {idx}' for idx in range(5)]
+    assert all(data['sentiment']['sentiment'] == 'positive' for name, data in events if name == 'review')
+    statistics = events[-1][1]
+    assert statistics['total'] == 5 and statistics['sentiment_distribution']['positive'] == 5
+    assert statistics['product_id'] == 'dr-martens-1460' and 'error' not in statistics
+
+def test_scraper_error_reported_in_statistics(stream):
+    def scrape(query, max_reviews=50, on_review=None):
+        on_review(_review(0))
+        on_review(_review(1))
+        raise RuntimeError('Trustpilot blocked the request')
+
+    with mock.patch.object(stream.app, 'scrape_trustpilot_reviews', scrape):
+        events = _events(stream.client.get(URL).get_data(as_text=True))
+
+    assert [name for name, _ in events] == ['start', 'review', 'review', 'statistics']
+    assert events[-1][1]['error'] == 'Trustpilot blocked the request' and events[-1][1]['total'] == 2
+
+def test_disconnect_stops_scraper_and_releases_driver(stream):
+    pool = DriverPool('stream-test', FakeDriver, max_idle=1)
+    stopped = threading.Event()
+    progress = {'sent': 0, 'cancelled': None}
+
+    def scrape(query, max_reviews=50, on_review=None):
+        try:
+            with pool.lease() as driver:
+                progress['driver'] = driver
+                for idx in range(max_reviews):
+                    try:
+                        on_review(_review(idx))
+                    except Exception:
+                        # Scrapers skip cards that fail to parse; cancellation must get past this
+                        continue
+                    progress['sent'] += 1
+                    time.sleep(0.01)
+        except BaseException as e:
+            progress['cancelled'] = type(e).__name__
+            raise
+        finally:
+            stopped.set()
+
+    with mock.patch.object(stream.app, 'scrape_trustpilot_reviews', scrape):
+        response = stream.client.get(URL, buffered=False)
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b'event: start')
+        assert next(chunks).startswith(b'event: review')
+        response.close()  # The client goes away
+        assert stopped.wait(2), 'scraper kept running after the client disconnected'
+
+    assert progress['cancelled'] == 'StreamCancelled'
+    assert progress['sent'] < 100
+    stats = pool.stats()
+    assert stats['leased'] == 0 and stats['discarded'] == 1 and progress['driver'].quit_called
+
+if __name__ == "__main__":
+    with stream_app() as env:
+        test_reviews_then_statistics(env)
+        print("✅ Reviews stream in order, then the statistics event")
+        test_scraper_error_reported_in_statistics(env)
+        print("✅ Scraper errors are reported in the statistics event")
+        test_disconnect_stops_scraper_and_releases_driver(env)
+        print("✅ A client disconnect stops the scraper and releases its browser")
@@ -0,0 +1,120 @@
+"""
+Test script for the shared scrape cache and single-flight coalescing
+"""
+import threading
+import time
+from scrape_cache import ScrapeCache
+
+def _slow_scrape(calls, delay=0.2, result=None):
+    def fetch():
+        calls.append(time.perf_counter())
+        time.sleep(delay)
+        return result if result is not None else [{'text': 'Comfortable after two weeks of wear', 'rating': 5}]
+    return fetch
+
+def test_concurrent_requests_share_one_scrape():
+    cache = ScrapeCache()
+    calls, results = [], []
+    threads = [threading.Thread(target=lambda: results.append(
+        cache.get_or_fetch('trustpilot', 'Dr Martens  1460', 20, _slow_scrape(calls))
+    )) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and len(results) == 5
+    # Each caller gets its own copy
+    results[0][0][0]['sentiment'] = 'positive'
+    assert 'sentiment' not in results[1][0][0]
+    stats = cache.stats()
+    assert stats['misses'] == 1 and stats['coalesced'] == 4
+
+def test_hits_report_age_and_expire():
+    cache = ScrapeCache(ttls={'youtube': 0.2})
+    calls = []
+    _, age = cache.get_or_fetch('youtube', 'dr martens 1460', 20, _slow_scrape(calls, delay=0))
+    assert age == 0
+    time.sleep(0.05)
+    _, age = cache.get_or_fetch('youtube', 'Dr Martens 1460', 20, _slow_scrape(calls, delay=0))
+    assert len(calls) == 1 and age >= 0.05
+    cache.get_or_fetch('youtube', 'dr martens 1460', 50, _slow_scrape(calls, delay=0))  # Different max_reviews
+    assert len(calls) == 2
+    time.sleep(0.2)
+    cache.get_or_fetch('youtube', 'dr martens 1460', 20, _slow_scrape(calls, delay=0))
+    assert len(calls) == 3
+
+def test_errors_and_empty_results_not_cached():
+    cache = ScrapeCache()
+    errors = []
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("blocked")
+
+    def call():
+        try:
+            cache.get_or_fetch('amazon', 'dr martens 1460', 20, failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == ['blocked'] * 3 and cache.stats()['entries'] == 0
+
+    calls = []
+    cache.get_or_fetch('reddit', 'dr martens 1460', 20, _slow_scrape(calls, delay=0, result=[]))
+    cache.get_or_fetch('reddit', 'dr martens 1460', 20, _slow_scrape(calls, delay=0, result=[]))
+    assert len(calls) == 2
+
+def test_cancelled_leader_lets_waiters_fetch():
+    """A BaseException in the leader (a closed SSE stream) must not break coalesced callers"""
+    class Cancelled(BaseException):
+        pass
+
+    cache = ScrapeCache()
+    started, release = threading.Event(), threading.Event()
+    outcomes, calls = {}, []
+
+    def cancelled_fetch():
+        started.set()
+        release.wait()
+        raise Cancelled()
+
+    def leader():
+        try:
+            cache.get_or_fetch('trustpilot', 'dr martens 1460', 20, cancelled_fetch)
+        except Cancelled:
+            outcomes['leader'] = 'cancelled'
+
+    def follower():
+        outcomes['follower'] = cache.get_or_fetch('trustpilot', 'dr martens 1460', 20,
+                                                  _slow_scrape(calls, delay=0))
+
+    threads = [threading.Thread(target=leader)]
+    threads[0].start()
+    started.wait()
+    threads.append(threading.Thread(target=follower))
+    threads[1].start()
+    time.sleep(0.1)  # Let the follower start waiting on the flight
+    release.set()
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert outcomes['leader'] == 'cancelled'
+    result, age = outcomes['follower']
+    assert len(calls) == 1 and result[0]['rating'] == 5 and age == 0.0
+    stats = cache.stats()
+    assert stats['coalesced'] == 1 and stats['errors'] == 0 and stats['entries'] == 1
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_scrape()
+    print("✅ Concurrent identical requests share one scrape")
+    test_hits_report_age_and_expire()
+    print("✅ Hits report their age and expire after the TTL")
+    test_errors_and_empty_results_not_cached()
+    print("✅ Errors and empty results aren't cached")
+    test_cancelled_leader_lets_waiters_fetch()
+    print("✅ Waiters fetch themselves when the leader is cancelled")
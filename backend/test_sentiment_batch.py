@@ -0,0 +1,106 @@
+"""
+Test script for batched AI sentiment scoring
+Checks JSON-mode batch results map back by index and fall back per review and
+per chunk, against the local fake OpenAI server
+"""
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+import pytest
+import fake_openai_server
+from fake_openai_server import FakeOpenAIServer, fake_openai_app
+
+POSITIVE = 'Love them, great boots'
+NEGATIVE = 'Terrible, fell apart'
+NEUTRAL = 'They arrived on Tuesday'
+BROKEN = 'The box was dented on arrival'
+
+build_completion = fake_openai_server.build_completion
+
+@contextmanager
+def batch_app():
+    """app.py in AI mode against a fake OpenAI server (stopped on exit)"""
+    server = FakeOpenAIServer(latency=0.0).start()
+    try:
+        with fake_openai_app(server, SENTIMENT_MODE='ai', REVIEW_DEDUPE='false') as app:
+            yield SimpleNamespace(app=app, server=server)
+    finally:
+        server.stop()
+
+@pytest.fixture(scope='module')
+def batch():
+    with batch_app() as env:
+        yield env
+
+@contextmanager
+def scripted(edit):
+    """Let edit(results, user_prompt) rewrite the fake server's batch answers"""
+    def build(payload):
+        kind, content = build_completion(payload)
+        if kind == 'sentiment_batch':
+            content = edit(json.loads(content)['results'], payload['messages'][-1]['content'])
+            if not isinstance(content, str):
+                content = json.dumps({'results': content})
+        return kind, content
+
+    with mock.patch.object(fake_openai_server, 'build_completion', build):
+        yield
+
+def _score(batch, texts, batch_size=25):
+    batch.app.sentiment_cache.clear()
+    batch.server.reset_stats()
+    return batch.app.analyze_sentiment_batch([(text, None) for text in texts], batch_size=batch_size)
+
+def test_out_of_order_indices_map_back(batch):
+    with scripted(lambda results, _: list(reversed(results))):
+        results = _score(batch, [POSITIVE, NEGATIVE, NEUTRAL])
+    assert [r['sentiment'] for r in results] == ['positive', 'negative', 'neutral']
+    assert all(r['method'] == 'ai' and r['tier'] == 'llm' for r in results)
+    assert batch.server.stats()['sentiment_batch'] == 1
+
+def test_out_of_range_and_duplicate_indices(batch):
+    def edit(results, _):
+        first, second, third = results
+        # A duplicate of review 0 with another label, an index past the chunk, and review 1 missing
+        return [first, dict(first, sentiment='negative'), dict(second, index=7), third]
+
+    with scripted(edit):
+        results = _score(batch, [POSITIVE, NEGATIVE, NEUTRAL])
+    assert results[0]['sentiment'] == 'positive' and results[0]['method'] == 'ai'
+    assert results[1]['method'] == batch.app.FALLBACK_METHOD and results[1]['tier'] == 'local'
+    assert results[1]['sentiment'] == 'negative'
+    assert results[2]['sentiment'] == 'neutral' and results[2]['method'] == 'ai'
+
+def test_bad_label_falls_back_for_that_review_only(batch):
+    def edit(results, _):
+        results[1]['sentiment'] = 'mixed'
+        return results
+
+    with scripted(edit):
+        results = _score(batch, [POSITIVE, NEGATIVE, NEUTRAL])
+    assert [r['method'] for r in results] == ['ai', batch.app.FALLBACK_METHOD, 'ai']
+    assert [r['tier'] for r in results] == ['llm', 'local', 'llm']
+
+def test_failed_chunk_falls_back_while_others_keep_ai(batch):
+    # Chunks of two: [POSITIVE, NEGATIVE] and [BROKEN, NEUTRAL]
+    with scripted(lambda results, prompt: 'not json' if BROKEN in prompt else results):
+        results = _score(batch, [POSITIVE, NEGATIVE, BROKEN, NEUTRAL], batch_size=2)
+    assert batch.server.stats()['sentiment_batch'] == 2
+    assert [r['method'] for r in results] == ['ai', 'ai', batch.app.FALLBACK_METHOD, batch.app.FALLBACK_METHOD]
+    assert [r['sentiment'] for r in results[:2]] == ['positive', 'negative']
+
+    # Only the AI results were cached; the failed chunk is retried next time
+    results = batch.app._ai_sentiment_batch([(text, None) for text in (POSITIVE, BROKEN)])
+    assert results[0]['method'] == 'ai' and results[1]['method'] == 'ai'
+
+if __name__ == "__main__":
+    with batch_app() as env:
+        test_out_of_order_indices_map_back(env)
+        print("✅ Out-of-order indices map back to their reviews")
+        test_out_of_range_and_duplicate_indices(env)
+        print("✅ Out-of-range and duplicate indices are ignored")
+        test_bad_label_falls_back_for_that_review_only(env)
+        print("✅ A bad label falls back for that review only")
+        test_failed_chunk_falls_back_while_others_keep_ai(env)
+        print("✅ A failed chunk falls back, other chunks keep their AI results")
@@ -0,0 +1,73 @@
+"""
+Test script for the two-tier (memory LRU + SQLite) sentiment cache
+"""
+import os
+import tempfile
+import time
+from sentiment_cache import SentimentCache, make_cache_key
+
+def _result(sentiment, polarity):
+    return {'sentiment': sentiment, 'polarity': polarity, 'method': 'ai'}
+
+def test_keys_ignore_case_and_whitespace():
+    assert make_cache_key('Great  boots\n', 5) == make_cache_key(' great boots', 5.0)
+    assert make_cache_key('Great boots', 5) != make_cache_key('Great boots', 4)
+    assert make_cache_key('Great boots', method='ai') != make_cache_key('Great boots', method='keyword+lexicon')
+    assert make_cache_key('Great boots', model='gpt-4o-mini') != make_cache_key('Great boots')
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = SentimentCache(':memory:', max_memory_entries=2)
+    cache.set('a', _result('positive', 0.8))
+    cache.set('b', _result('negative', -0.6))
+    assert cache.get('a')['sentiment'] == 'positive'  # 'a' is now the most recent
+    cache.set('c', _result('neutral', 0.0))
+
+    assert set(cache._memory) == {'a', 'c'}
+    stats = cache.stats()
+    assert stats['memory_evictions'] == 1 and stats['memory_entries'] == 2
+
+    # The evicted entry is still on disk and comes back into memory on a hit
+    assert cache.get('b')['polarity'] == -0.6
+    stats = cache.stats()
+    assert stats['disk_hits'] == 1 and set(cache._memory) == {'c', 'b'}
+
+    # Callers get copies
+    cache.get('c')['sentiment'] = 'positive'
+    assert cache.get('c')['sentiment'] == 'neutral'
+
+def test_disk_tier_survives_restart_and_evicts_oldest():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sentiment_cache.db')
+        cache = SentimentCache(path, max_disk_entries=10)
+        cache.set_many({f'old-{i}': _result('positive', i / 10) for i in range(5)})
+        time.sleep(0.01)
+        cache.set_many({f'new-{i}': _result('negative', -i / 10) for i in range(5)})
+        assert cache.stats()['disk_entries'] == 10 and cache.stats()['disk_evictions'] == 0
+
+        # A fresh instance (server restart) starts with an empty memory tier
+        restarted = SentimentCache(path, max_disk_entries=10)
+        assert restarted.stats()['disk_entries'] == 10
+        assert restarted.get('old-3') == _result('positive', 0.3)
+        stats = restarted.stats()
+        assert stats['disk_hits'] == 1 and stats['memory_hits'] == 0 and stats['memory_entries'] == 1
+        assert restarted.get('missing') is None and restarted.stats()['misses'] == 1
+
+        # Crossing the cap trims the least recently accessed rows plus 10% headroom
+        time.sleep(0.01)
+        restarted.set('extra', _result('neutral', 0.0))
+        stats = restarted.stats()
+        assert stats['disk_evictions'] == 2 and stats['disk_entries'] == 9
+        survivors = SentimentCache(path, max_memory_entries=0)
+        assert survivors.get('old-0') is None and survivors.get('old-1') is None
+        assert survivors.get('old-3') is not None and survivors.get('extra') is not None
+
+        restarted.clear()
+        assert SentimentCache(path).stats()['disk_entries'] == 0
+
+if __name__ == "__main__":
+    test_keys_ignore_case_and_whitespace()
+    print("✅ Cache keys normalize text and include rating/method/model")
+    test_memory_tier_evicts_least_recently_used()
+    print("✅ Memory tier evicts the least recently used entry")
+    test_disk_tier_survives_restart_and_evicts_oldest()
+    print("✅ Disk tier survives a restart and evicts the oldest rows")
@@ -0,0 +1,93 @@
+"""
+Test script for the local -> LLM sentiment cascade
+Checks which local results are escalated, against the local fake OpenAI server
+"""
+from contextlib import contextmanager
+from types import SimpleNamespace
+import pytest
+from fake_openai_server import FakeOpenAIServer, fake_openai_app
+
+# Local polarity: strong positive (keywords), 0.0, 0.27 and -0.08
+CONFIDENT = 'Love these boots, absolutely amazing and a perfect fit'
+FLAT = 'They arrived on Tuesday in a brown box'
+MILD = 'The leather is nice and the laces are long'
+SLIGHT = 'Decent boots for the price, a little stiff'
+TEXTS = (CONFIDENT, FLAT, MILD, SLIGHT)
+
+@contextmanager
+def cascade_app():
+    """app.py in cascade mode against a fake OpenAI server (stopped on exit)"""
+    server = FakeOpenAIServer(latency=0.0).start()
+    try:
+        with fake_openai_app(server, SENTIMENT_MODE='cascade', SENTIMENT_ESCALATION_THRESHOLD='0.1') as app:
+            yield SimpleNamespace(app=app, server=server)
+    finally:
+        server.stop()
+
+@pytest.fixture(scope='module')
+def cascade():
+    with cascade_app() as env:
+        yield env
+
+def _escalated(cascade, threshold):
+    """Texts the batch cascade sent to the LLM, and how many LLM requests it made"""
+    cascade.app.sentiment_cache.clear()
+    cascade.server.reset_stats()
+    results = cascade.app.analyze_sentiment_batch([(text, None) for text in TEXTS], mode='cascade',
+                                                  escalation_threshold=threshold)
+    escalated = []
+    for text, result in zip(TEXTS, results):
+        assert result['tier'] == ('llm' if result.get('escalated') else 'local')
+        if result.get('escalated'):
+            assert result['escalation_reason'] == 'low_polarity'
+            escalated.append(text)
+    return escalated, cascade.server.stats().get('requests', 0)
+
+def test_polarity_threshold(cascade):
+    app = cascade.app
+    threshold = app.SENTIMENT_ESCALATION_THRESHOLD
+    assert app._escalation_reason({'polarity': threshold - 0.01}) == 'low_polarity'
+    assert app._escalation_reason({'polarity': -(threshold - 0.01)}) == 'low_polarity'
+    # The threshold itself is confident enough
+    assert app._escalation_reason({'polarity': threshold}) is None
+    assert app._escalation_reason({'polarity': -0.2}, threshold=0.25) == 'low_polarity'
+    assert app._escalation_reason({'polarity': 0.0}, threshold=0) is None
+
+def test_keyword_rating_and_error_reasons(cascade):
+    app = cascade.app
+    hits = lambda negative, positive: {'polarity': 0.5, 'keyword_hits': {'negative': negative, 'positive': positive}}
+    assert app._escalation_reason(hits(2, 4)) == 'keyword_conflict'
+    assert app._escalation_reason(hits(1, 4)) is None
+    assert app._escalation_reason(hits(0, 2)) is None
+    assert app._escalation_reason({'polarity': 0.5, 'sentiment': 'positive'}, rating=2) == 'rating_conflict'
+    assert app._escalation_reason({'polarity': -0.5, 'sentiment': 'negative'}, rating=4) == 'rating_conflict'
+    assert app._escalation_reason({'polarity': -0.5, 'sentiment': 'negative'}, rating=3) is None
+    assert app._escalation_reason({'method': 'error', 'polarity': 0.9}) == 'local_error'
+
+def test_batch_threshold_decides_escalations(cascade):
+    assert _escalated(cascade, None) == ([FLAT, SLIGHT], 1)  # SENTIMENT_ESCALATION_THRESHOLD (0.1)
+    assert _escalated(cascade, 0.05) == ([FLAT], 1)
+    assert _escalated(cascade, 0.3) == ([FLAT, MILD, SLIGHT], 1)
+    assert _escalated(cascade, 0) == ([], 0)
+    assert _escalated(cascade, 1.01) == (list(TEXTS), 1)
+
+def test_single_review_uses_configured_threshold(cascade):
+    app, server = cascade.app, cascade.server
+    app.sentiment_cache.clear()
+    server.reset_stats()
+    assert app.analyze_sentiment(MILD)['tier'] == 'local'
+    result = app.analyze_sentiment(FLAT)
+    assert result['tier'] == 'llm' and result['escalation_reason'] == 'low_polarity'
+    assert app.analyze_sentiment(FLAT, mode='local')['tier'] == 'local'
+    assert server.stats()['requests'] == 1
+
+if __name__ == "__main__":
+    with cascade_app() as env:
+        test_polarity_threshold(env)
+        print("✅ |polarity| below the threshold escalates")
+        test_keyword_rating_and_error_reasons(env)
+        print("✅ Keyword conflicts, rating conflicts and errors escalate")
+        test_batch_threshold_decides_escalations(env)
+        print("✅ Batch escalation threshold decides which reviews reach the LLM")
+        test_single_review_uses_configured_threshold(env)
+        print("✅ Single reviews use SENTIMENT_ESCALATION_THRESHOLD")
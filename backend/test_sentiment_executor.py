@@ -0,0 +1,101 @@
+"""
+Test script for the concurrent sentiment executor
+Runs against the local fake OpenAI server
+"""
+import asyncio
+import json
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+from openai import RateLimitError
+from fake_openai_server import FakeOpenAIServer
+from sentiment_executor import AsyncTokenBucket, ConcurrentSentimentExecutor, retry_after_seconds
+
+SYSTEM = 'You are a sentiment analyzer. Respond with JSON.'
+
+def _payload(text):
+    return {'model': 'gpt-4o-mini', 'messages': [{'role': 'system', 'content': SYSTEM},
+                                                 {'role': 'user', 'content': text}]}
+
+def _rate_limited(headers):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+def test_token_bucket_bursts_then_refills():
+    async def run():
+        bucket = AsyncTokenBucket(600, burst_seconds=0.5)  # 10/s, capacity 5
+        waits = [await bucket.acquire() for _ in range(5)]
+        start = time.monotonic()
+        waited = await bucket.acquire(2)
+        return waits, waited, time.monotonic() - start, await AsyncTokenBucket(60, burst_seconds=1).acquire(10)
+
+    waits, waited, elapsed, oversized = asyncio.run(run())
+    assert waits == [0.0] * 5
+    assert 0.15 <= waited <= 0.25 and 0.15 <= elapsed <= 0.4
+    # Requests larger than the bucket are capped to its capacity instead of waiting forever
+    assert oversized == 0.0
+
+def test_retry_after_headers():
+    assert retry_after_seconds(_rate_limited({'retry-after-ms': '250'})) == 0.25
+    assert retry_after_seconds(_rate_limited({'retry-after': '2'})) == 2.0
+    # The millisecond header is more precise and wins
+    assert retry_after_seconds(_rate_limited({'retry-after-ms': '1500', 'retry-after': '2'})) == 1.5
+    assert retry_after_seconds(_rate_limited({'retry-after-ms': 'soon', 'retry-after': '3'})) == 3.0
+    http_date = retry_after_seconds(_rate_limited({'retry-after': formatdate(time.time() + 30, usegmt=True)}))
+    assert 28 <= http_date <= 30
+    assert retry_after_seconds(_rate_limited({'retry-after': 'later'})) is None
+    assert retry_after_seconds(_rate_limited({})) is None
+    assert retry_after_seconds(RuntimeError('no response')) is None
+
+def test_429_backs_off_for_retry_after():
+    server = FakeOpenAIServer(latency=0.0, rate_limit_rate=1.0, retry_after=0.3).start()
+    try:
+        executor = ConcurrentSentimentExecutor('fake', base_url=server.base_url, max_retries=1)
+        start = time.perf_counter()
+        [result] = executor.map([_payload('Love them, great boots')])
+        elapsed = time.perf_counter() - start
+        assert isinstance(result, RateLimitError)
+        assert elapsed >= 0.3 and server.stats()['rate_limited'] == 2
+        stats = executor.stats()
+        assert stats['rate_limited'] == 2 and stats['retries'] == 1 and stats['failed'] == 1
+
+        # Intermittent 429s are retried until every request succeeds
+        server.rate_limit_rate, server.retry_after = 0.4, 0.05
+        server.reset_stats()
+        executor = ConcurrentSentimentExecutor('fake', base_url=server.base_url, max_retries=10)
+        results = executor.map([_payload('Love them, great boots')] * 10)
+        assert all(json.loads(r)['sentiment'] == 'positive' for r in results)
+        stats = executor.stats()
+        assert stats['succeeded'] == 10 and stats['failed'] == 0
+        assert stats['rate_limited'] == server.stats()['rate_limited'] > 0
+        assert stats['retries'] == stats['rate_limited']
+    finally:
+        server.stop()
+
+def test_results_keep_input_order():
+    # Jitter makes responses finish out of order
+    server = FakeOpenAIServer(latency=0.01, jitter=0.1).start()
+    try:
+        executor = ConcurrentSentimentExecutor('fake', base_url=server.base_url, max_in_flight=8)
+        texts = ['Love them, great boots', 'Terrible, fell apart', 'They arrived on Tuesday'] * 6
+        payloads = [_payload(text) for text in texts]
+        payloads[4] = {'messages': payloads[4]['messages']}  # No model: fails in the client
+        results = executor.map(payloads)
+
+        assert len(results) == len(payloads) and isinstance(results[4], Exception)
+        labels = [json.loads(r)['sentiment'] for i, r in enumerate(results) if i != 4]
+        expected = ['positive', 'negative', 'neutral'] * 6
+        del expected[4]
+        assert labels == expected
+        assert executor.stats()['peak_in_flight'] > 1
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    test_token_bucket_bursts_then_refills()
+    print("✅ Token bucket bursts to capacity, then refills at the rate")
+    test_retry_after_headers()
+    print("✅ retry-after-ms / retry-after headers parsed")
+    test_429_backs_off_for_retry_after()
+    print("✅ 429s back off for retry-after and are retried")
+    test_results_keep_input_order()
+    print("✅ Results keep input order")
@@ -0,0 +1,151 @@
+"""
+Test script for the HTTP Trustpilot fetcher, using saved pages (no network needed)
+"""
+import json
+import os
+import trustpilot_http
+import trustpilot_scraper
+from host_rate_limiter import HostRateLimiter
+from trustpilot_http import fetch_page, fetch_trustpilot_reviews, TrustpilotBlocked, TrustpilotParseError
+
+# Count tokens per site without making the tests wait
+trustpilot_http.host_limiter = HostRateLimiter({'trustpilot.com': (1000.0, 1000)})
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASE_URL = 'https://www.trustpilot.com/review/www.drmartens.com'
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+class FakeSession:
+    """Serves fixture pages by URL; anything else is a 404"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        return self.pages.get(url, FakeResponse(404))
+
+SEARCH_PAGES = {
+    f"{BASE_URL}?search=1460": FakeResponse(200, _fixture('trustpilot_search_page1.html')),
+    f"{BASE_URL}?search=1460&page=2": FakeResponse(200, _fixture('trustpilot_search_page2.html'))
+}
+
+def test_reads_embedded_reviews_across_pages():
+    http = FakeSession(SEARCH_PAGES)
+    reviews = fetch_trustpilot_reviews([BASE_URL], '1460', max_reviews=50, http=http)
+
+    assert http.requested == list(SEARCH_PAGES)
+    assert len(reviews) == 22  # 25 reviews, 3 too short to keep
+    first = reviews[0]
+    assert first == {
+        'author': 'Sarah M',
+        'rating': 5,
+        'title': "Best boots I've owned",
+        'text': "The 1460s took two weeks to break in but now they are the most comfortable boots I own.",
+        'date': '2024-05-01',
+        'verified': True,
+        'source': 'trustpilot',
+        'url': BASE_URL,
+        'review_url': 'https://www.trustpilot.com/reviews/61a00f0c1e2d3b4a5968778100'
+    }
+    # Short text falls back to the title; a blank display name becomes Anonymous
+    assert any(r['text'] == 'Worth every penny for the quality' for r in reviews)
+    assert any(r['author'] == 'Anonymous' for r in reviews)
+
+def _next_data_page(total_pages):
+    props = {'reviews': [], 'filters': {'pagination': {'totalPages': total_pages}}}
+    return FakeResponse(200, f'<script id="__NEXT_DATA__">{json.dumps({"props": {"pageProps": props}})}</script>')
+
+def test_bad_total_pages_is_a_parse_error():
+    assert fetch_page(BASE_URL, http=FakeSession({BASE_URL: _next_data_page('3')})) == ([], 3)
+    assert fetch_page(BASE_URL, http=FakeSession({BASE_URL: _next_data_page(None)})) == ([], 1)
+    for total_pages in ('many', [2], {'value': 2}):
+        try:
+            fetch_page(BASE_URL, http=FakeSession({BASE_URL: _next_data_page(total_pages)}))
+        except TrustpilotParseError:
+            continue
+        raise AssertionError(f"totalPages={total_pages!r} was accepted")
+
+def test_stops_at_max_reviews():
+    http = FakeSession(SEARCH_PAGES)
+    reviews = fetch_trustpilot_reviews([BASE_URL], '1460', max_reviews=5, http=http)
+    assert len(reviews) == 5
+    assert len(http.requested) == 1
+
+def test_keywords_and_regions_are_merged():
+    """Every keyword x regional URL is fetched; reviews seen on several of them are kept once"""
+    uk_url = 'https://uk.trustpilot.com/review/www.drmartens.com'
+    pages = dict(SEARCH_PAGES)
+    pages[f"{uk_url}?search=1460"] = SEARCH_PAGES[f"{BASE_URL}?search=1460"]
+    pages[f"{BASE_URL}?search=vegan"] = SEARCH_PAGES[f"{BASE_URL}?search=1460&page=2"]
+    http = FakeSession(pages)
+    trustpilot_http.host_limiter = HostRateLimiter({'trustpilot.com': (1000.0, 1000)})
+    streamed = []
+    reviews = fetch_trustpilot_reviews([BASE_URL, uk_url], ['1460', 'vegan'], max_reviews=100,
+                                       on_review=streamed.append, http=http)
+
+    assert set(pages) <= set(http.requested)
+    assert len(reviews) == 22 and streamed == reviews
+    # Every page request took a token from the shared trustpilot.com limit
+    assert trustpilot_http.host_limiter.stats()['trustpilot.com']['acquired'] == len(http.requested)
+    assert len({(r['author'], r['text'], r['date']) for r in reviews}) == 22
+
+def test_block_page_falls_back_to_browser():
+    blocked = FakeSession({f"{BASE_URL}?search=1460": FakeResponse(200, _fixture('trustpilot_blocked.html'))})
+    try:
+        fetch_trustpilot_reviews([BASE_URL], '1460', http=blocked)
+        assert False, "expected TrustpilotBlocked"
+    except TrustpilotBlocked:
+        pass
+
+    acquired = []
+
+    def acquire(host=None):
+        acquired.append(host)
+        raise RuntimeError("no browser in tests")
+
+    original_session, original_acquire = trustpilot_http.session, trustpilot_scraper.driver_pool.acquire
+    trustpilot_http.session = blocked
+    trustpilot_scraper.driver_pool.acquire = acquire
+    try:
+        assert trustpilot_scraper.scrape_trustpilot_reviews("Dr Martens 1460", max_retries=1) == []
+    finally:
+        trustpilot_http.session, trustpilot_scraper.driver_pool.acquire = original_session, original_acquire
+    assert acquired == [trustpilot_scraper.TRUSTPILOT_HOST]
+
+def test_http_success_skips_browser():
+    def acquire(host=None):
+        raise AssertionError("browser should not be used")
+
+    original_session, original_acquire = trustpilot_http.session, trustpilot_scraper.driver_pool.acquire
+    trustpilot_http.session = FakeSession(SEARCH_PAGES)
+    trustpilot_scraper.driver_pool.acquire = acquire
+    try:
+        streamed = []
+        reviews = trustpilot_scraper.scrape_trustpilot_reviews("Dr Martens 1460", max_reviews=10, on_review=streamed.append)
+    finally:
+        trustpilot_http.session, trustpilot_scraper.driver_pool.acquire = original_session, original_acquire
+    assert len(reviews) == 10 and streamed == reviews
+
+if __name__ == "__main__":
+    test_reads_embedded_reviews_across_pages()
+    print("✅ Embedded reviews across pages")
+    test_bad_total_pages_is_a_parse_error()
+    print("✅ A bad totalPages is a parse error")
+    test_stops_at_max_reviews()
+    print("✅ Stops at max_reviews")
+    test_keywords_and_regions_are_merged()
+    print("✅ Keywords and regions merged without duplicates")
+    test_block_page_falls_back_to_browser()
+    print("✅ Block page falls back to browser")
+    test_http_success_skips_browser()
+    print("✅ HTTP success skips browser")
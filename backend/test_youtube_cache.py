@@ -0,0 +1,75 @@
+"""
+Test script for the YouTube response cache and quota ledger (no API key needed)
+"""
+import httplib2
+from googleapiclient.errors import HttpError
+from youtube_cache import YouTubeQuotaExhausted, YouTubeResponseCache
+
+class FakeRequest:
+    """Returns body, or raises HttpError(status) when given one"""
+
+    def __init__(self, method='search', q='Dr Martens 1460', body=None, status=None):
+        self.methodId = f"youtube.{method}.list"
+        self.uri = f"https://youtube.googleapis.com/youtube/v3/{method}?q={q}&part=id&key=SECRET"
+        self.headers = {}
+        self.body = body or {'etag': 'etag-1', 'items': [{'id': 'vid0'}]}
+        self.status = status
+        self.executed = 0
+
+    def execute(self, http=None):
+        self.executed += 1
+        if self.status:
+            content = b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}' if self.status == 403 else b''
+            raise HttpError(httplib2.Response({'status': self.status}), content)
+        return self.body
+
+def _cache(ttl=0, daily_quota=10000):
+    return YouTubeResponseCache(':memory:', ttls={'youtube.search.list': ttl, 'youtube.commentThreads.list': ttl},
+                                daily_quota=daily_quota, reserve=0.1)
+
+def test_fresh_hit_and_etag_revalidation():
+    cache = _cache(ttl=3600)
+    assert cache.execute(FakeRequest())['items'] == [{'id': 'vid0'}]
+    repeat = FakeRequest()
+    assert cache.execute(repeat)['items'] == [{'id': 'vid0'}] and repeat.executed == 0
+
+    expired = _cache(ttl=0)
+    expired.execute(FakeRequest())
+    not_modified = FakeRequest(status=304)
+    assert expired.execute(not_modified)['items'] == [{'id': 'vid0'}]
+    assert not_modified.headers['If-None-Match'] == 'etag-1'
+    stats = expired.stats()
+    assert stats['revalidated'] == 1 and stats['quota_used'] == 200
+
+def test_serves_stale_near_quota_and_refuses_uncached():
+    cache = _cache(ttl=0, daily_quota=1000)
+    cache.execute(FakeRequest())  # 100 units
+    for page in range(800):
+        cache.execute(FakeRequest(method='commentThreads', q=f"page{page}"))
+    assert cache.remaining() == 100
+
+    # Only the reserve (100 units) left: expired search is served without a call
+    stale = FakeRequest(body={'etag': 'etag-2', 'items': []})
+    assert cache.execute(stale)['items'] == [{'id': 'vid0'}] and stale.executed == 0
+    # Uncached search still fits the remaining 100 units
+    cache.execute(FakeRequest(q='Dr Martens Jadon'))
+    try:
+        cache.execute(FakeRequest(q='Dr Martens 2976'))
+        assert False, "expected YouTubeQuotaExhausted"
+    except YouTubeQuotaExhausted:
+        pass
+    assert cache.stats()['stale_served'] == 1 and cache.stats()['quota_refusals'] == 1
+
+def test_quota_exceeded_serves_cached_and_exhausts_ledger():
+    cache = _cache(ttl=0)
+    cache.execute(FakeRequest())
+    assert cache.execute(FakeRequest(status=403))['items'] == [{'id': 'vid0'}]
+    assert cache.remaining() == 0
+
+if __name__ == "__main__":
+    test_fresh_hit_and_etag_revalidation()
+    print("✅ Fresh hits skip the API, expired entries revalidate by ETag")
+    test_serves_stale_near_quota_and_refuses_uncached()
+    print("✅ Stale data served near the quota limit")
+    test_quota_exceeded_serves_cached_and_exhausts_ledger()
+    print("✅ quotaExceeded serves cached data")
@@ -0,0 +1,118 @@
+"""
+Test script for the YouTube scraper's batched/concurrent API calls (no API key needed)
+"""
+import threading
+from urllib.parse import urlencode
+import youtube_scraper
+from client_registry import registry
+from youtube_cache import YouTubeResponseCache
+
+def _comment(video_id, idx):
+    return {'snippet': {'topLevelComment': {'snippet': {
+        'authorDisplayName': f"viewer{idx}",
+        'textDisplay': f"Comment {idx} on {video_id}: these boots took a month to break in",
+        'publishedAt': '2024-03-01T12:00:00Z',
+        'likeCount': idx
+    }}}}
+
+class FakeRequest:
+    def __init__(self, response, calls, name, params):
+        self.response = response
+        self.calls = calls
+        self.name = name
+        self.methodId = f"youtube.{name}.list"
+        self.uri = f"https://youtube.googleapis.com/youtube/v3/{name}?{urlencode(params)}"
+        self.headers = {}
+
+    def execute(self, http=None):
+        with self.calls['lock']:
+            self.calls[self.name] = self.calls.get(self.name, 0) + 1
+        return self.response
+
+class FakeYouTube:
+    """Three videos; each has two pages of 5 comments (one too short per page)"""
+
+    def __init__(self):
+        self.calls = {'lock': threading.Lock()}
+        self.video_ids = ['vid0', 'vid1', 'vid2']
+
+    def search(self):
+        return self
+
+    def videos(self):
+        return self
+
+    def commentThreads(self):
+        return self
+
+    def list(self, part, **kwargs):
+        if 'q' in kwargs:
+            return FakeRequest({'items': [{'id': {'videoId': v}} for v in self.video_ids]}, self.calls, 'search', kwargs)
+        if 'videoId' not in kwargs:
+            self.requested_ids = kwargs['id']
+            items = [{'id': v, 'snippet': {'title': f"{v} review", 'channelTitle': 'Boot Channel'},
+                      'statistics': {'viewCount': '1000', 'likeCount': '50'}} for v in kwargs['id'].split(',')]
+            return FakeRequest({'items': items}, self.calls, 'videos', kwargs)
+        video_id, page = kwargs['videoId'], 1 if kwargs.get('pageToken') is None else 2
+        items = [_comment(video_id, (page - 1) * 5 + i) for i in range(4)] + [
+            {'snippet': {'topLevelComment': {'snippet': {'authorDisplayName': 'x', 'textDisplay': 'nice',
+                                                         'publishedAt': '2024-03-01T00:00:00Z'}}}}]
+        response = {'items': items}
+        if page == 1:
+            response['nextPageToken'] = f"{video_id}-p2"
+        return FakeRequest(response, self.calls, 'commentThreads', {k: v for k, v in kwargs.items() if v is not None})
+
+def _run(max_reviews, cache=None):
+    fake = FakeYouTube()
+    original, original_cache = youtube_scraper.setup_youtube, youtube_scraper.youtube_cache
+    youtube_scraper.setup_youtube = lambda: fake
+    youtube_scraper.youtube_cache = cache or YouTubeResponseCache(':memory:', ttls={})
+    registry.invalidate('youtube')  # The registry builds through setup_youtube on next use
+    try:
+        streamed = []
+        reviews = youtube_scraper.scrape_youtube_reviews("Dr Martens 1460", max_reviews=max_reviews,
+                                                         on_review=streamed.append)
+    finally:
+        youtube_scraper.setup_youtube, youtube_scraper.youtube_cache = original, original_cache
+        registry.invalidate('youtube')
+    return fake, reviews, streamed
+
+def test_batches_video_details_and_follows_pages():
+    fake, reviews, streamed = _run(max_reviews=100)
+    assert fake.calls['videos'] == 1 and fake.requested_ids == 'vid0,vid1,vid2'
+    assert fake.calls['commentThreads'] == 6  # 2 pages x 3 videos
+    assert len(reviews) == 24 and sorted(map(id, streamed)) == sorted(map(id, reviews))
+    # Grouped by video in search order
+    assert [r['video_url'][-4:] for r in reviews] == ['vid0'] * 8 + ['vid1'] * 8 + ['vid2'] * 8
+    assert reviews[0]['video_title'] == 'vid0 review' and reviews[0]['video_views'] == 1000
+
+def test_stops_at_max_reviews():
+    fake, reviews, streamed = _run(max_reviews=6)
+    assert len(reviews) == 6 and sorted(map(id, streamed)) == sorted(map(id, reviews))
+    assert fake.calls['commentThreads'] == 3  # First pages already hold enough
+
+def test_comments_shared_fairly_between_videos():
+    # 7 = 2 per video plus one more from the top-ranked video, whichever video answers first
+    for _ in range(3):
+        _, reviews, _ = _run(max_reviews=7)
+        assert [r['video_url'][-4:] for r in reviews] == ['vid0'] * 3 + ['vid1'] * 2 + ['vid2'] * 2
+        assert [r['author'] for r in reviews[:3]] == ['viewer0', 'viewer1', 'viewer2']
+
+def test_repeat_query_served_from_cache():
+    cache = YouTubeResponseCache(':memory:', ttls={'youtube.search.list': 3600, 'youtube.videos.list': 3600,
+                                                   'youtube.commentThreads.list': 3600})
+    _, first, _ = _run(max_reviews=100, cache=cache)
+    fake, second, _ = _run(max_reviews=100, cache=cache)
+    assert len(fake.calls) == 1  # Only the lock: no API calls the second time
+    assert second == first
+    assert cache.stats()['quota_used'] == 100 + 1 + 6
+
+if __name__ == "__main__":
+    test_batches_video_details_and_follows_pages()
+    print("✅ One videos().list call, comment pages followed")
+    test_stops_at_max_reviews()
+    print("✅ Stops at max_reviews")
+    test_comments_shared_fairly_between_videos()
+    print("✅ Comments shared fairly between videos")
+    test_repeat_query_served_from_cache()
+    print("✅ Repeat query served from cache")
@@ -0,0 +1,260 @@
+"""
+Trustpilot HTTP Fetcher
+Trustpilot review pages are server-rendered Next.js pages that embed their
+review data in a <script id="__NEXT_DATA__"> JSON blob, so plain HTTP
+requests are enough to read them without a browser
+"""
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from urllib.parse import quote, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from host_rate_limiter import host_limiter
+
+TRUSTPILOT_HTTP_TIMEOUT = 10                                                     # Seconds per page request
+TRUSTPILOT_MAX_PAGES = int(os.getenv('TRUSTPILOT_MAX_PAGES', '25'))                # Pages per URL/keyword (20 reviews each)
+TRUSTPILOT_HTTP_MAX_PER_HOST = int(os.getenv('TRUSTPILOT_HTTP_MAX_PER_HOST', '4'))  # Concurrent requests per Trustpilot domain
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-GB,en;q=0.9'
+}
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+_BLOCK_MARKERS = ('captcha', 'cf-challenge', 'just a moment...', 'verify you are human', 'access denied')
+
+class TrustpilotBlocked(Exception):
+    """Trustpilot served a block/challenge page instead of reviews"""
+
+class TrustpilotParseError(Exception):
+    """The page did not contain the expected embedded review JSON"""
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=1)
+    session.mount('https://', adapter)
+    session.headers.update(_HEADERS)
+    return session
+
+# Shared keep-alive connection pool for all Trustpilot page requests
+session = _create_session()
+
+_host_lock = threading.Lock()
+_host_semaphores = {}
+
+def page_url(base_url, search_query, page=1):
+    """Review page URL for a ?search= query, with ?page=N after the first page"""
+    url = f"{base_url}?search={quote(search_query)}"
+    return url if page <= 1 else f"{url}&page={page}"
+
+def parse_next_data(html):
+    """
+    Extract the __NEXT_DATA__ page props from a Trustpilot page
+
+    Raises:
+        TrustpilotBlocked: A challenge/CAPTCHA page
+        TrustpilotParseError: No (valid) embedded JSON
+    """
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        lower = html[:20000].lower()
+        if any(marker in lower for marker in _BLOCK_MARKERS):
+            raise TrustpilotBlocked("challenge page")
+        raise TrustpilotParseError("no __NEXT_DATA__ script")
+    try:
+        return json.loads(match.group(1))['props']['pageProps']
+    except (ValueError, KeyError, TypeError) as e:
+        raise TrustpilotParseError(f"bad __NEXT_DATA__: {e}")
+
+def map_review(item, url):
+    """
+    Map one embedded review object to the dict scrape_trustpilot_reviews returns
+
+    Returns:
+        Review dict, or None if it has too little text (same rule as the browser path)
+    """
+    title = (item.get('title') or '').strip()
+    text = (item.get('text') or '').strip()
+    if len(text) < 20 and title:
+        text = title
+    if len(text) < 20:
+        return None
+
+    dates = item.get('dates') or {}
+    date = (dates.get('publishedDate') or dates.get('experiencedDate') or '')[:10]
+    consumer = item.get('consumer') or {}
+    verification = (item.get('labels') or {}).get('verification') or {}
+    rating = item.get('rating')
+    origin = urlparse(url)
+
+    return {
+        'author': (consumer.get('displayName') or '').strip() or "Anonymous",
+        'rating': int(rating) if rating is not None else None,
+        'title': title,
+        'text': text,
+        'date': date or datetime.now().strftime('%Y-%m-%d'),
+        'verified': bool(verification.get('isVerified')),
+        'source': 'trustpilot',
+        'url': url,
+        'review_url': f"{origin.scheme}://{origin.netloc}/reviews/{item['id']}" if item.get('id') else None
+    }
+
+def fetch_page(url, http=None):
+    """
+    Download and parse one review page
+
+    Returns:
+        (reviews, total_pages) where reviews are the raw embedded review objects,
+        or None when the page does not exist (404)
+
+    Raises:
+        TrustpilotBlocked, TrustpilotParseError
+    """
+    response = (http or session).get(url, timeout=TRUSTPILOT_HTTP_TIMEOUT)
+    if response.status_code == 404:
+        return None
+    if response.status_code in (403, 429, 503):
+        raise TrustpilotBlocked(f"HTTP {response.status_code}")
+    if response.status_code != 200:
+        raise TrustpilotParseError(f"HTTP {response.status_code}")
+
+    props = parse_next_data(response.text)
+    if 'reviews' not in props:
+        raise TrustpilotParseError("no reviews in page props")
+    pagination = (props.get('filters') or {}).get('pagination') or {}
+    try:
+        total_pages = int(pagination.get('totalPages') or 1)
+    except (ValueError, TypeError) as e:
+        raise TrustpilotParseError(f"bad totalPages: {e}")
+    return props['reviews'] or [], total_pages
+
+def _host_semaphore(host):
+    with _host_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(TRUSTPILOT_HTTP_MAX_PER_HOST)
+        return _host_semaphores[host]
+
+def _fetch_limited(url, http):
+    """fetch_page, holding one of the host's concurrency slots and a token from its rate limit"""
+    host = urlparse(url).netloc
+    with _host_semaphore(host):
+        host_limiter.acquire(host)
+        return fetch_page(url, http)
+
+def _review_key(item):
+    """Trustpilot review id (the same review shows up on regional domains and several keywords)"""
+    return item.get('id') or ((item.get('consumer') or {}).get('displayName'), item.get('text'))
+
+def fetch_trustpilot_reviews(base_urls, search_queries, max_reviews=50, on_review=None, http=None,
+                             max_pages=TRUSTPILOT_MAX_PAGES):
+    """
+    Fetch keyword-matched Trustpilot reviews over plain HTTP
+
+    Page 1 of every (regional URL, keyword) pair is requested concurrently;
+    as soon as a pair's page 1 reports how many pages it has, the further
+    pages needed to reach max_reviews are queued (more are added later if
+    duplicates leave the result short). Requests are limited per host,
+    results are merged and de-duplicated by review id, and queued pages are
+    cancelled once max_reviews unique reviews have been collected.
+
+    Args:
+        base_urls: Trustpilot company page URLs (regional domains)
+        search_queries: Keyword(s) passed to Trustpilot's ?search= filter
+        max_reviews: Maximum number of reviews to return
+        on_review: Optional callback called with each review as soon as it is parsed
+        http: requests.Session-like object (default: the shared session)
+        max_pages: Most pages read per (URL, keyword) pair
+
+    Returns:
+        List of unique review dictionaries (may be empty when no page has matches)
+
+    Raises:
+        TrustpilotBlocked, TrustpilotParseError, requests.RequestException: Nothing
+            could be read over HTTP; the caller should fall back to the browser
+    """
+    if isinstance(search_queries, str):
+        search_queries = [search_queries]
+    pairs = [(base_url, query) for query in search_queries for base_url in base_urls]
+    hosts = {urlparse(base_url).netloc for base_url in base_urls}
+
+    reviews = []
+    seen = set()
+    errors = []
+    executor = ThreadPoolExecutor(max_workers=max(1, TRUSTPILOT_HTTP_MAX_PER_HOST * len(hosts)),
+                                  thread_name_prefix='trustpilot-http')
+    pending = {}
+    next_pages = {}  # (base_url, query) -> [next page, last page, reviews per page]
+
+    def submit(base_url, query, page):
+        pending[executor.submit(_fetch_limited, page_url(base_url, query, page), http)] = (base_url, query, page)
+
+    def submit_more(pair):
+        """Queue just enough further pages of pair to fill the remaining max_reviews"""
+        state = next_pages[pair]
+        count = -(-(max_reviews - len(reviews)) // state[2])
+        while count > 0 and state[0] <= state[1]:
+            submit(pair[0], pair[1], state[0])
+            state[0] += 1
+            count -= 1
+
+    try:
+        for base_url, query in pairs:
+            submit(base_url, query, 1)
+        while pending and len(reviews) < max_reviews:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                base_url, query, page = pending.pop(future)
+                try:
+                    result = future.result()
+                except (TrustpilotBlocked, TrustpilotParseError, requests.RequestException) as e:
+                    print(f"   ⚠️ {base_url} '{query}' page {page}: {str(e)[:100]}")
+                    errors.append(e)
+                    continue
+                if result is None:
+                    if page == 1:
+                        print(f"   ⚠️ 404 for {page_url(base_url, query)}")
+                    continue
+
+                items, total_pages = result
+                added = 0
+                for item in items:
+                    if len(reviews) >= max_reviews:
+                        break
+                    key = _review_key(item)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    review = map_review(item, base_url)
+                    if review is None:
+                        continue
+                    reviews.append(review)
+                    added += 1
+                    if on_review:
+                        on_review(review)
+                print(f"   📄 {urlparse(base_url).netloc} '{query}' page {page}/{total_pages}: "
+                      f"{len(items)} reviews, {added} new ({len(reviews)} total)")
+                # Queued after counting this page, so a page that fills max_reviews queues nothing
+                if page == 1 and items:
+                    next_pages[(base_url, query)] = [2, min(total_pages, max_pages), len(items)]
+                    submit_more((base_url, query))
+
+            # Duplicates and too-short reviews left us short: read further pages
+            if not pending and len(reviews) < max_reviews:
+                for pair in next_pages:
+                    submit_more(pair)
+
+        # Enough reviews: drop pages that haven't started yet
+        for future in pending:
+            future.cancel()
+    finally:
+        # Also drops queued pages when on_review raises (e.g., the stream's client went away)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not reviews and errors:
+        raise errors[0]
+    return reviews
@@ -8,10 +8,20 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import os
 import time
 import re
 from datetime import datetime
 from urllib.parse import quote
+import requests
+from driver_pool import get_pool
+from bulk_extract import extract_trustpilot_cards
+from trustpilot_http import fetch_trustpilot_reviews, TrustpilotBlocked, TrustpilotParseError
+from page_readiness import (PERFORMANCE_LOGGING, load_page, wait_until, wait_for_selector,
+                            wait_for_mutations, scroll_and_wait)
+
+TRUSTPILOT_HTTP_FETCH = os.getenv('TRUSTPILOT_HTTP_FETCH', 'true').lower() not in ('0', 'false', 'no')  # Browser only as fallback
+TRUSTPILOT_BULK_EXTRACT = os.getenv('TRUSTPILOT_BULK_EXTRACT', 'true').lower() not in ('0', 'false', 'no')  # One-script card extraction
 
 def setup_driver():
     """Setup Chrome driver with options"""
@@ -23,6 +33,7 @@ def setup_driver():
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.set_capability('goog:loggingPrefs', PERFORMANCE_LOGGING)
     
     driver = webdriver.Chrome(options=chrome_options)
     driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -35,7 +46,255 @@ def setup_driver():
     
     return driver
 
-def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
+# Warm browsers shared by all Trustpilot scrapes
+driver_pool = get_pool('trustpilot', setup_driver)
+TRUSTPILOT_HOST = 'trustpilot.com'
+
+# Trustpilot company pages per brand - try multiple regions
+TRUSTPILOT_BRAND_URLS = {
+    'dr martens': [
+        'https://www.trustpilot.com/review/www.drmartens.com',
+        'https://uk.trustpilot.com/review/www.drmartens.com'
+    ],
+    'dr. martens': [
+        'https://www.trustpilot.com/review/www.drmartens.com',
+        'https://uk.trustpilot.com/review/www.drmartens.com'
+    ],
+    'drmartens': [
+        'https://www.trustpilot.com/review/www.drmartens.com',
+        'https://uk.trustpilot.com/review/www.drmartens.com'
+    ],
+    'timberland': [
+        'https://www.trustpilot.com/review/www.timberland.com',
+        'https://uk.trustpilot.com/review/www.timberland.co.uk'
+    ],
+    'solovair': [
+        'https://uk.trustpilot.com/review/www.solovair.co.uk',
+        'https://www.trustpilot.com/review/www.solovair.co.uk'
+    ],
+    'red wing': [
+        'https://www.trustpilot.com/review/www.redwingshoes.com',
+        'https://uk.trustpilot.com/review/www.redwingshoes.com'
+    ],
+    'redwing': [
+        'https://www.trustpilot.com/review/www.redwingshoes.com',
+        'https://uk.trustpilot.com/review/www.redwingshoes.com'
+    ],
+    'birkenstock': [
+        'https://www.trustpilot.com/review/www.birkenstock.com',
+        'https://uk.trustpilot.com/review/www.birkenstock.co.uk'
+    ],
+    'clarks': [
+        'https://www.trustpilot.com/review/www.clarks.com',
+        'https://uk.trustpilot.com/review/www.clarks.co.uk'
+    ],
+    'ugg': [
+        'https://www.trustpilot.com/review/www.ugg.com',
+        'https://uk.trustpilot.com/review/www.ugg.co.uk'
+    ],
+    'converse': [
+        'https://www.trustpilot.com/review/www.converse.com',
+        'https://uk.trustpilot.com/review/www.converse.com'
+    ],
+    'vans': [
+        'https://www.trustpilot.com/review/www.vans.com',
+        'https://uk.trustpilot.com/review/www.vans.co.uk'
+    ],
+    'blundstone': [
+        'https://www.trustpilot.com/review/www.blundstone.com',
+        'https://au.trustpilot.com/review/www.blundstone.com.au'
+    ],
+    'thursday': [
+        'https://www.trustpilot.com/review/thursdayboots.com',
+    ],
+}
+
+# Common product identifiers; the first one found in the product name becomes the ?search= keyword
+PRODUCT_KEYWORDS = [
+    '1460', '1461', '2976', 'jadon', 'sinclair', 'chelsea', 'jadons',
+    '6 inch', '6-inch', '6in', 'premium', 'yellow boot', 'wheat',
+    'classic', 'original', 'vegan', 'leather', 'smooth', 'nappa',
+    'chuck taylor', 'old skool', 'arizona', 'boston', 'captain',
+    '558', 'iron ranger', 'platform', 'oxford'
+]
+
+def _read_review_card(driver, review_elem):
+    """
+    Per-element extraction of one review card (fallback when bulk extraction fails)
+    
+    Returns:
+        Dict with rating, title, text, author, date, verified (same shape as
+        bulk_extract.extract_trustpilot_cards), or None if the card can't be read
+    """
+    try:
+        # Scroll element into view
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", review_elem)
+        
+        # Try to expand "Read more" button, waiting only until the card stops changing
+        try:
+            read_more = review_elem.find_elements(By.CSS_SELECTOR, 
+                "button[class*='show-more'], button[class*='ShowMore'], button[data-show-more-trigger]")
+            if read_more:
+                wait_for_mutations(driver, "extra[0].click();", target=review_elem, args=[read_more[0]],
+                                   first_change_timeout=0.5, quiet=0.1, timeout=2,
+                                   name='trustpilot_read_more')
+        except:
+            pass
+        
+        # Extract rating (default to None if not found)
+        rating = None
+        try:
+            rating_elem = review_elem.find_element(By.CSS_SELECTOR, 'div[data-service-review-rating]')
+            rating_img = rating_elem.find_element(By.TAG_NAME, 'img')
+            rating_alt = rating_img.get_attribute('alt')
+            if rating_alt and 'Rated' in rating_alt:
+                rating = int(rating_alt.split()[1])
+        except:
+            try:
+                star_images = review_elem.find_elements(By.CSS_SELECTOR, 'img[alt*="star"]')
+                filled = [s for s in star_images if 'filled' in s.get_attribute('src').lower() or 'full' in s.get_attribute('src').lower()]
+                if filled:
+                    rating = len(filled)
+            except:
+                pass
+        
+        # Extract title
+        title = ""
+        title_selectors = [
+            'h2[data-service-review-title-typography]',
+            'h2[class*="title"]',
+            'h3[class*="title"]',
+            '[data-service-review-title]'
+        ]
+        
+        for selector in title_selectors:
+            try:
+                title_elem = review_elem.find_element(By.CSS_SELECTOR, selector)
+                title = title_elem.text.strip()
+                if title and len(title) > 3:
+                    break
+            except:
+                continue
+        
+        # If no title found, try h2/h3 tags
+        if not title:
+            try:
+                headings = review_elem.find_elements(By.CSS_SELECTOR, 'h2, h3')
+                for h in headings:
+                    t = h.text.strip()
+                    if t and len(t) > 3:
+                        title = t
+                        break
+            except:
+                pass
+        
+        # Extract review text - MULTIPLE METHODS
+        text = ""
+        
+        # Method 1: Known text selectors
+        text_selectors = [
+            'p[data-service-review-text-typography]',
+            'div[data-service-review-text]',
+            'p[class*="typography_body"]',
+            '[data-review-content-body]'
+        ]
+        
+        for selector in text_selectors:
+            try:
+                text_elems = review_elem.find_elements(By.CSS_SELECTOR, selector)
+                if text_elems:
+                    texts = [t.text.strip() for t in text_elems if len(t.text.strip()) > 10]
+                    if texts:
+                        text = ' '.join(texts)
+                        break
+            except:
+                continue
+        
+        # Method 2: All <p> tags
+        if not text or len(text) < 20:
+            try:
+                paragraphs = review_elem.find_elements(By.TAG_NAME, 'p')
+                para_texts = []
+                for p in paragraphs:
+                    p_text = p.text.strip()
+                    if (len(p_text) > 15 and 
+                        'Date of experience' not in p_text and
+                        'Report' not in p_text):
+                        para_texts.append(p_text)
+                if para_texts:
+                    text = ' '.join(para_texts)
+            except:
+                pass
+        
+        # Method 3: Full element text with filtering
+        if not text or len(text) < 20:
+            try:
+                all_text = review_elem.text.strip()
+                lines = all_text.split('\n')
+                content_lines = []
+                for line in lines:
+                    line = line.strip()
+                    if (len(line) > 15 and
+                        'Date of experience' not in line and
+                        'Report' not in line and
+                        'Helpful' not in line and
+                        not line.isdigit()):
+                        content_lines.append(line)
+                
+                if content_lines:
+                    text = ' '.join(content_lines[:5])  # Take first 5 meaningful lines
+            except:
+                pass
+        
+        # Extract author
+        author = None
+        author_selectors = [
+            'span[data-consumer-name-typography]',
+            'a[data-consumer-profile-link]',
+            '[data-consumer-name]'
+        ]
+        
+        for selector in author_selectors:
+            try:
+                author_elem = review_elem.find_element(By.CSS_SELECTOR, selector)
+                author = author_elem.text.strip()
+                if author:
+                    break
+            except:
+                continue
+        
+        # Extract date
+        date = None
+        try:
+            time_elem = review_elem.find_element(By.CSS_SELECTOR, 'time')
+            date_str = time_elem.get_attribute('datetime')
+            if date_str:
+                date = date_str[:10]
+        except:
+            pass
+        
+        # Extract verification
+        verified = False
+        try:
+            verified_badge = review_elem.find_elements(By.CSS_SELECTOR, 
+                'div[data-service-review-verification-badge], [data-verification-badge]')
+            verified = len(verified_badge) > 0
+        except:
+            pass
+        
+        return {
+            'rating': rating,
+            'title': title,
+            'text': text,
+            'author': author,
+            'date': date,
+            'verified': verified
+        }
+    except Exception as e:
+        print(f"⚠️ Error reading review card: {str(e)[:100]}")
+        return None
+
+def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2, on_review=None):
     """
     Scrape reviews from Trustpilot using direct URL search parameter
     Only returns reviews that match the product-specific keywords
@@ -44,13 +303,62 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
         product_name: Product name to search for (e.g., "Dr Martens 1460", "Timberland 6 inch")
         max_reviews: Maximum number of reviews to scrape
         max_retries: Number of retry attempts if scraping fails
+        on_review: Optional callback called with each review as soon as it is scraped
     
     Returns:
         List of review dictionaries (only product-specific reviews)
     """
     driver = None
+    attempt_failed = False
     reviews = []
     
+    # Determine the brand/company from the product name
+    product_lower = product_name.lower()
+    
+    # Find matching brand URLs
+    brand_urls_to_try = []
+    brand_found = None
+    for brand, urls in TRUSTPILOT_BRAND_URLS.items():
+        if brand in product_lower:
+            brand_urls_to_try = urls
+            brand_found = brand
+            break
+    
+    if not brand_urls_to_try:
+        print(f"⚠️ No Trustpilot page found for brand in: {product_name}")
+        print(f"ℹ️ Supported brands: Dr Martens, Timberland, Solovair, Red Wing, Birkenstock, Clarks, UGG, Converse, Vans, Blundstone, Thursday Boots")
+        return []
+    
+    # Extract product-specific keywords for search
+    search_keywords = [keyword for keyword in PRODUCT_KEYWORDS if keyword in product_lower]
+    
+    # Debug output
+    print(f"📝 DEBUG: Product name: '{product_name}'")
+    print(f"📝 DEBUG: Product lowercase: '{product_lower}'")
+    print(f"📝 DEBUG: Keywords found: {search_keywords}")
+    
+    # IMPORTANT: Only search if we have specific product keywords
+    if not search_keywords:
+        print(f"⚠️ No specific product keywords found in '{product_name}'")
+        print(f"⚠️ Will not return general brand reviews. Returning empty list.")
+        return []
+    
+    search_query = search_keywords[0]  # Use the most specific keyword
+    print(f"🔎 Searching Trustpilot with keyword: '{search_query}'")
+    print(f"📝 DEBUG: Brand URLs to try: {brand_urls_to_try}")
+    
+    # Review pages are server-rendered: read the embedded JSON over plain HTTP first
+    if TRUSTPILOT_HTTP_FETCH:
+        try:
+            fetch_start = time.time()
+            # Every matched keyword and regional URL, pages fetched in parallel
+            reviews = fetch_trustpilot_reviews(brand_urls_to_try, search_keywords, max_reviews, on_review)
+            print(f"✅ Fetched {len(reviews)} Trustpilot reviews over HTTP in {time.time() - fetch_start:.1f}s")
+            return reviews
+        except (TrustpilotBlocked, TrustpilotParseError, requests.RequestException) as e:
+            print(f"⚠️ HTTP fetch failed ({str(e)[:100]}) - falling back to browser")
+            reviews = []
+    
     # Retry logic wrapper
     for attempt in range(max_retries):
         try:
@@ -60,118 +368,12 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
             
             print(f"🔍 Scraping Trustpilot for: {product_name}")
             
-            driver = setup_driver()
-            
-            # Determine the brand/company from the product name
-            product_lower = product_name.lower()
-            
-            # Map brands to their Trustpilot URLs - try multiple regions
-            brand_urls = {
-                'dr martens': [
-                    'https://www.trustpilot.com/review/www.drmartens.com',
-                    'https://uk.trustpilot.com/review/www.drmartens.com'
-                ],
-                'dr. martens': [
-                    'https://www.trustpilot.com/review/www.drmartens.com',
-                    'https://uk.trustpilot.com/review/www.drmartens.com'
-                ],
-                'drmartens': [
-                    'https://www.trustpilot.com/review/www.drmartens.com',
-                    'https://uk.trustpilot.com/review/www.drmartens.com'
-                ],
-                'timberland': [
-                    'https://www.trustpilot.com/review/www.timberland.com',
-                    'https://uk.trustpilot.com/review/www.timberland.co.uk'
-                ],
-                'solovair': [
-                    'https://uk.trustpilot.com/review/www.solovair.co.uk',
-                    'https://www.trustpilot.com/review/www.solovair.co.uk'
-                ],
-                'red wing': [
-                    'https://www.trustpilot.com/review/www.redwingshoes.com',
-                    'https://uk.trustpilot.com/review/www.redwingshoes.com'
-                ],
-                'redwing': [
-                    'https://www.trustpilot.com/review/www.redwingshoes.com',
-                    'https://uk.trustpilot.com/review/www.redwingshoes.com'
-                ],
-                'birkenstock': [
-                    'https://www.trustpilot.com/review/www.birkenstock.com',
-                    'https://uk.trustpilot.com/review/www.birkenstock.co.uk'
-                ],
-                'clarks': [
-                    'https://www.trustpilot.com/review/www.clarks.com',
-                    'https://uk.trustpilot.com/review/www.clarks.co.uk'
-                ],
-                'ugg': [
-                    'https://www.trustpilot.com/review/www.ugg.com',
-                    'https://uk.trustpilot.com/review/www.ugg.co.uk'
-                ],
-                'converse': [
-                    'https://www.trustpilot.com/review/www.converse.com',
-                    'https://uk.trustpilot.com/review/www.converse.com'
-                ],
-                'vans': [
-                    'https://www.trustpilot.com/review/www.vans.com',
-                    'https://uk.trustpilot.com/review/www.vans.co.uk'
-                ],
-                'blundstone': [
-                    'https://www.trustpilot.com/review/www.blundstone.com',
-                    'https://au.trustpilot.com/review/www.blundstone.com.au'
-                ],
-                'thursday': [
-                    'https://www.trustpilot.com/review/thursdayboots.com',
-                ],
-            }
-            
-            # Find matching brand URLs
-            brand_urls_to_try = []
-            brand_found = None
-            for brand, urls in brand_urls.items():
-                if brand in product_lower:
-                    brand_urls_to_try = urls
-                    brand_found = brand
-                    break
-            
-            if not brand_urls_to_try:
-                print(f"⚠️ No Trustpilot page found for brand in: {product_name}")
-                print(f"ℹ️ Supported brands: Dr Martens, Timberland, Solovair, Red Wing, Birkenstock, Clarks, UGG, Converse, Vans, Blundstone, Thursday Boots")
-                return []
-            
-            # Extract product-specific keywords for search
-            search_keywords = []
-            
-            # Common product identifiers
-            keywords_to_extract = [
-            '1460', '1461', '2976', 'jadon', 'sinclair', 'chelsea', 'jadons',
-            '6 inch', '6-inch', '6in', 'premium', 'yellow boot', 'wheat',
-            'classic', 'original', 'vegan', 'leather', 'smooth', 'nappa',
-            'chuck taylor', 'old skool', 'arizona', 'boston', 'captain',
-            '558', 'iron ranger', 'platform', 'oxford'
-        ]
-        
-            for keyword in keywords_to_extract:
-                if keyword in product_lower:
-                    search_keywords.append(keyword)
-            
-            # Debug output
-            print(f"📝 DEBUG: Product name: '{product_name}'")
-            print(f"📝 DEBUG: Product lowercase: '{product_lower}'")
-            print(f"📝 DEBUG: Keywords found: {search_keywords}")
-            
-            # IMPORTANT: Only search if we have specific product keywords
-            if not search_keywords:
-                print(f"⚠️ No specific product keywords found in '{product_name}'")
-                print(f"⚠️ Will not return general brand reviews. Returning empty list.")
-                return []
-            
-            search_query = search_keywords[0]  # Use the most specific keyword
-            print(f"🔎 Searching Trustpilot with keyword: '{search_query}'")
-            print(f"📝 DEBUG: Brand URLs to try: {brand_urls_to_try}")
+            driver = driver_pool.acquire(TRUSTPILOT_HOST)
             
             # Try each brand URL until we find one with reviews
             trustpilot_url = None
             review_elements = []
+            card_selector = None
             
             for url_idx, base_url in enumerate(brand_urls_to_try):
                 try:
@@ -179,26 +381,23 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
                     search_url = f"{base_url}?search={quote(search_query)}"
                     
                     print(f"🌐 Trying URL {url_idx + 1}/{len(brand_urls_to_try)}: {search_url}")
-                    driver.get(search_url)
                     
-                    # Wait for page to load - increased wait time
+                    # Wait for the page to finish loading (network idle) instead of a fixed delay
                     print(f"   ⏳ Waiting for page to load...")
-                    time.sleep(8)  # Increased from 6 to 8 seconds
+                    load_page(driver, search_url, timeout=8, name='trustpilot_page')
                     
                     # Check if page loaded successfully
                     current_title = driver.title.lower()
                     if "404" in current_title or "not found" in current_title:
                         print(f"   ⚠️ 404 error - trying next URL...")
-                        time.sleep(3)
                         continue
                     
                     # Check for CAPTCHA or bot detection
                     if "captcha" in current_title or "verify" in current_title:
                         print(f"   ⚠️ CAPTCHA detected - waiting 10 seconds...")
-                        time.sleep(10)
+                        time.sleep(10)  # Back off before retrying, not a readiness wait
                         # Try to reload
-                        driver.get(search_url)
-                        time.sleep(8)
+                        load_page(driver, search_url, timeout=8, name='trustpilot_page')
                     
                     # Accept cookies if present
                     try:
@@ -206,15 +405,13 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
                             EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
                         )
                         cookie_button.click()
-                        time.sleep(2)
+                        wait_until(driver, EC.invisibility_of_element_located((By.ID, "onetrust-accept-btn-handler")),
+                                   timeout=2, name='trustpilot_cookie_banner')
                         print(f"   ✅ Accepted cookies")
                     except:
                         print(f"   ℹ️ No cookie banner found")
                         pass
                     
-                    # Additional wait for dynamic content
-                    time.sleep(3)
-                    
                     # Try multiple selectors for review cards
                     selectors_to_try = [
                         'article[data-service-review-card-paper]',
@@ -226,23 +423,25 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
                         'div[data-service-review]'
                     ]
                     
+                    # Wait for review cards to render
+                    wait_for_selector(driver, selectors_to_try, timeout=10, name='trustpilot_cards')
+                    
                     print(f"   🔍 Searching for review elements...")
                     for selector in selectors_to_try:
                         review_elements = driver.find_elements(By.CSS_SELECTOR, selector)
                         if review_elements and len(review_elements) > 0:
                             print(f"   ✅ Found {len(review_elements)} review elements using selector: {selector}")
                             trustpilot_url = base_url
+                            card_selector = selector
                             break
                     
                     if review_elements and len(review_elements) > 0:
                         break  # Found working URL with reviews
                     else:
                         print(f"   ⚠️ No reviews found with any selector - trying next URL...")
-                        time.sleep(3)
                         
                 except Exception as e:
                     print(f"   ⚠️ Error with URL: {str(e)[:100]}")
-                    time.sleep(3)
                     continue
             
             if not trustpilot_url or not review_elements:
@@ -264,19 +463,14 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
             
             # Scroll to load more reviews
             print(f"🔄 Scrolling to load more reviews...")
-            last_height = driver.execute_script("return document.body.scrollHeight")
             pages_loaded = 0
             max_pages = 5
             
             while pages_loaded < max_pages and len(reviews) < max_reviews:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                # Stops as soon as the scroll stops adding content
+                if not scroll_and_wait(driver, name='trustpilot_scroll'):
                     break
                 
-                last_height = new_height
                 pages_loaded += 1
                 
                 # Refresh review elements after scrolling
@@ -284,6 +478,7 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
                     new_elements = driver.find_elements(By.CSS_SELECTOR, selector)
                     if new_elements and len(new_elements) > len(review_elements):
                         review_elements = new_elements
+                        card_selector = selector
                         print(f"   📊 Loaded {len(review_elements)} total reviews")
                         break
             
@@ -291,132 +486,29 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
             
             reviews_extracted = 0
             
-            for idx, review_elem in enumerate(review_elements):
+            # Read every card in one script round trip; fall back to per-element reads
+            card_fields = None
+            if TRUSTPILOT_BULK_EXTRACT:
+                try:
+                    extract_start = time.time()
+                    card_fields = extract_trustpilot_cards(driver, card_selector, len(review_elements))
+                    print(f"⚡ Bulk-extracted {len(card_fields)} cards in {time.time() - extract_start:.2f}s")
+                except Exception as e:
+                    print(f"⚠️ Bulk extraction failed, reading cards one by one: {str(e)[:100]}")
+                    card_fields = None
+            if card_fields is None:
+                card_fields = (_read_review_card(driver, review_elem) for review_elem in review_elements)
+            
+            for idx, fields in enumerate(card_fields):
                 if len(reviews) >= max_reviews:
                     break
                 
                 try:
-                    # Scroll element into view
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", review_elem)
-                    time.sleep(0.3)
-                    
-                    # Try to expand "Read more" button
-                    try:
-                        read_more = review_elem.find_elements(By.CSS_SELECTOR, 
-                            "button[class*='show-more'], button[class*='ShowMore'], button[data-show-more-trigger]")
-                        if read_more:
-                            try:
-                                driver.execute_script("arguments[0].click();", read_more[0])
-                                time.sleep(0.5)
-                            except:
-                                pass
-                    except:
-                        pass
-                    
-                    # Extract rating (default to None if not found)
-                    rating = None
-                    try:
-                        rating_elem = review_elem.find_element(By.CSS_SELECTOR, 'div[data-service-review-rating]')
-                        rating_img = rating_elem.find_element(By.TAG_NAME, 'img')
-                        rating_alt = rating_img.get_attribute('alt')
-                        if rating_alt and 'Rated' in rating_alt:
-                            rating = int(rating_alt.split()[1])
-                    except:
-                        try:
-                            star_images = review_elem.find_elements(By.CSS_SELECTOR, 'img[alt*="star"]')
-                            filled = [s for s in star_images if 'filled' in s.get_attribute('src').lower() or 'full' in s.get_attribute('src').lower()]
-                            if filled:
-                                rating = len(filled)
-                        except:
-                            pass
-                    
-                    # Extract title
-                    title = ""
-                    title_selectors = [
-                        'h2[data-service-review-title-typography]',
-                        'h2[class*="title"]',
-                        'h3[class*="title"]',
-                        '[data-service-review-title]'
-                    ]
-                    
-                    for selector in title_selectors:
-                        try:
-                            title_elem = review_elem.find_element(By.CSS_SELECTOR, selector)
-                            title = title_elem.text.strip()
-                            if title and len(title) > 3:
-                                break
-                        except:
-                            continue
-                    
-                    # If no title found, try h2/h3 tags
-                    if not title:
-                        try:
-                            headings = review_elem.find_elements(By.CSS_SELECTOR, 'h2, h3')
-                            for h in headings:
-                                t = h.text.strip()
-                                if t and len(t) > 3:
-                                    title = t
-                                    break
-                        except:
-                            pass
-                    
-                    # Extract review text - MULTIPLE METHODS
-                    text = ""
-                    
-                    # Method 1: Known text selectors
-                    text_selectors = [
-                        'p[data-service-review-text-typography]',
-                        'div[data-service-review-text]',
-                        'p[class*="typography_body"]',
-                        '[data-review-content-body]'
-                    ]
-                    
-                    for selector in text_selectors:
-                        try:
-                            text_elems = review_elem.find_elements(By.CSS_SELECTOR, selector)
-                            if text_elems:
-                                texts = [t.text.strip() for t in text_elems if len(t.text.strip()) > 10]
-                                if texts:
-                                    text = ' '.join(texts)
-                                    break
-                        except:
-                            continue
-                    
-                    # Method 2: All <p> tags
-                    if not text or len(text) < 20:
-                        try:
-                            paragraphs = review_elem.find_elements(By.TAG_NAME, 'p')
-                            para_texts = []
-                            for p in paragraphs:
-                                p_text = p.text.strip()
-                                if (len(p_text) > 15 and 
-                                    'Date of experience' not in p_text and
-                                    'Report' not in p_text):
-                                    para_texts.append(p_text)
-                            if para_texts:
-                                text = ' '.join(para_texts)
-                        except:
-                            pass
-                    
-                    # Method 3: Full element text with filtering
-                    if not text or len(text) < 20:
-                        try:
-                            all_text = review_elem.text.strip()
-                            lines = all_text.split('\n')
-                            content_lines = []
-                            for line in lines:
-                                line = line.strip()
-                                if (len(line) > 15 and
-                                    'Date of experience' not in line and
-                                    'Report' not in line and
-                                    'Helpful' not in line and
-                                    not line.isdigit()):
-                                    content_lines.append(line)
-                            
-                            if content_lines:
-                                text = ' '.join(content_lines[:5])  # Take first 5 meaningful lines
-                        except:
-                            pass
+                    if fields is None:
+                        continue
+                    rating = fields['rating']
+                    title = fields['title'] or ""
+                    text = fields['text'] or ""
                     
                     # Use title as fallback
                     if (not text or len(text) < 20) and title:
@@ -435,52 +527,18 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
                         print(f"        Text: '{text[:100]}...'")
                         print(f"        Rating: {rating}/5")
                     
-                    # Extract author
-                    author = "Anonymous"
-                    author_selectors = [
-                        'span[data-consumer-name-typography]',
-                        'a[data-consumer-profile-link]',
-                        '[data-consumer-name]'
-                    ]
-                    
-                    for selector in author_selectors:
-                        try:
-                            author_elem = review_elem.find_element(By.CSS_SELECTOR, selector)
-                            author = author_elem.text.strip()
-                            if author:
-                                break
-                        except:
-                            continue
-                    
-                    # Extract date
-                    date = datetime.now().strftime('%Y-%m-%d')
-                    try:
-                        time_elem = review_elem.find_element(By.CSS_SELECTOR, 'time')
-                        date_str = time_elem.get_attribute('datetime')
-                        if date_str:
-                            date = date_str[:10]
-                    except:
-                        pass
-                    
-                    # Extract verification
-                    verified = False
-                    try:
-                        verified_badge = review_elem.find_elements(By.CSS_SELECTOR, 
-                            'div[data-service-review-verification-badge], [data-verification-badge]')
-                        verified = len(verified_badge) > 0
-                    except:
-                        pass
-                    
                     reviews.append({
-                        'author': author,
+                        'author': fields['author'] if fields['author'] is not None else "Anonymous",
                         'rating': rating,
                         'title': title,
                         'text': text,
-                        'date': date,
-                        'verified': verified,
+                        'date': fields['date'] or datetime.now().strftime('%Y-%m-%d'),
+                        'verified': bool(fields['verified']),
                         'source': 'trustpilot',
                         'url': trustpilot_url
                     })
+                    if on_review:
+                        on_review(reviews[-1])
                     
                     reviews_extracted += 1
                     
@@ -509,20 +567,17 @@ def scrape_trustpilot_reviews(product_name, max_reviews=50, max_retries=2):
                 return reviews  # Success! Exit retry loop
             
         except Exception as e:
+            attempt_failed = True
             print(f"❌ Error on attempt {attempt + 1}: {str(e)[:200]}")
             if attempt < max_retries - 1:
                 print(f"   Will retry after cleanup...")
             
         finally:
-            # Always clean up driver
+            # Return the browser to the pool; a failed attempt gets a fresh one on retry
             if driver:
-                try:
-                    print(f"🔄 Closing browser session (attempt {attempt + 1})...")
-                    driver.quit()
-                    time.sleep(3)  # Increased cleanup time
-                except Exception as e:
-                    print(f"⚠️ Error closing driver: {e}")
+                driver_pool.release(driver, discard=attempt_failed)
                 driver = None  # Reset for next retry
+            attempt_failed = False
     
     # If we get here, all retries failed
     print(f"❌ Failed to scrape Trustpilot after {max_retries} attempts")
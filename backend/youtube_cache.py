@@ -0,0 +1,239 @@
+"""
+YouTube API Response Cache
+TTL cache for YouTube Data API responses (search, video details, comment
+threads) stored in SQLite, with ETag revalidation and a daily quota ledger.
+When the day's quota runs low, cached responses are served stale instead
+of spending units (or failing once the quota is gone).
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlparse
+from zoneinfo import ZoneInfo
+from googleapiclient.errors import HttpError
+
+# Quota units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'youtube.search.list': 100,
+    'youtube.videos.list': 1,
+    'youtube.commentThreads.list': 1
+}
+
+# The API's daily quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+class YouTubeQuotaExhausted(Exception):
+    """No quota left for a call and nothing cached to serve instead"""
+
+def _quota_day():
+    return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+def request_cache_key(request):
+    """Method id + query parameters (minus the API key) of a googleapiclient request"""
+    params = sorted((name, value) for name, value in parse_qsl(urlparse(request.uri).query) if name != 'key')
+    return json.dumps([request.methodId, params])
+
+class YouTubeResponseCache:
+    """
+    SQLite-backed response cache with per-method TTLs and a quota ledger
+
+    Args:
+        db_path: SQLite file (created if missing)
+        ttls: {method id: seconds a response stays fresh}
+        daily_quota: Quota units available per day
+        reserve: Fraction of the daily quota kept back; once only the reserve
+            is left, anything cached is served stale
+        max_entries: Cached responses kept on disk (oldest evicted first)
+    """
+
+    def __init__(self, db_path, ttls, daily_quota=10000, reserve=0.1, max_entries=20000):
+        self.ttls = ttls
+        self.daily_quota = daily_quota
+        self.reserve_units = int(daily_quota * reserve)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._memory = {}  # Used when the disk tier is unavailable
+        self._counters = {
+            'fresh_hits': 0,
+            'revalidated': 0,
+            'stale_served': 0,
+            'fetched': 0,
+            'quota_refusals': 0
+        }
+        self._day = _quota_day()
+        self._used = 0
+
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS youtube_responses (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_youtube_responses_fetched ON youtube_responses(fetched_at)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS youtube_quota (
+                    day TEXT PRIMARY KEY,
+                    units INTEGER NOT NULL
+                )
+            """)
+            self._conn.commit()
+            row = self._conn.execute("SELECT units FROM youtube_quota WHERE day = ?", (self._day,)).fetchone()
+            self._used = row[0] if row else 0
+        except sqlite3.Error as e:
+            print(f"⚠️ YouTube cache disk tier unavailable, using memory only: {e}")
+            self._conn = None
+
+    def execute(self, request, http=None):
+        """
+        Run a googleapiclient request through the cache
+
+        Fresh entries are returned without a call. Expired entries are
+        revalidated with If-None-Match (a 304 keeps the cached body), or
+        served stale when the quota is down to its reserve.
+
+        Raises:
+            YouTubeQuotaExhausted: Over budget with nothing cached
+            HttpError: From the API, when there is no cached response to fall back on
+        """
+        method = request.methodId
+        cost = QUOTA_COSTS.get(method, 1)
+        key = request_cache_key(request)
+        entry = self._load(key)
+        now = time.time()
+
+        if entry is not None:
+            if now - entry['fetched_at'] < self.ttls.get(method, 0):
+                self._count('fresh_hits')
+                return entry['body']
+            if self.remaining() - cost < self.reserve_units:
+                self._count('stale_served')
+                return entry['body']
+        elif self.remaining() < cost:
+            self._count('quota_refusals')
+            raise YouTubeQuotaExhausted(f"{method} needs {cost} units, {self.remaining()} left today")
+
+        if entry is not None and entry['etag']:
+            request.headers['If-None-Match'] = entry['etag']
+        self._charge(cost)
+        try:
+            body = request.execute(http=http)
+        except HttpError as e:
+            if e.resp.status == 304 and entry is not None:
+                self._store(key, entry['body'], entry['etag'])
+                self._count('revalidated')
+                return entry['body']
+            if e.resp.status == 403 and b'quotaExceeded' in (e.content or b''):
+                self._exhaust()
+            if entry is not None:
+                print(f"⚠️ YouTube {method} failed, serving cached response: {str(e)[:100]}")
+                self._count('stale_served')
+                return entry['body']
+            raise
+
+        self._store(key, body, body.get('etag'))
+        self._count('fetched')
+        return body
+
+    def remaining(self):
+        """Quota units left today"""
+        with self._lock:
+            self._roll_day()
+            return max(0, self.daily_quota - self._used)
+
+    def stats(self):
+        """Hit/revalidation counters and today's quota ledger"""
+        with self._lock:
+            self._roll_day()
+            counters = dict(self._counters)
+            counters['quota_day'] = self._day
+            counters['quota_used'] = self._used
+            counters['quota_remaining'] = max(0, self.daily_quota - self._used)
+        counters['daily_quota'] = self.daily_quota
+        lookups = counters['fresh_hits'] + counters['revalidated'] + counters['stale_served'] + counters['fetched']
+        counters['served_from_cache'] = round(
+            (counters['fresh_hits'] + counters['revalidated'] + counters['stale_served']) / lookups, 3
+        ) if lookups else 0
+        return counters
+
+    def _load(self, key):
+        with self._lock:
+            if self._conn is None:
+                entry = self._memory.get(key)
+                return dict(entry) if entry else None
+            try:
+                row = self._conn.execute(
+                    "SELECT body, etag, fetched_at FROM youtube_responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ YouTube cache read failed: {e}")
+                return None
+        if row is None:
+            return None
+        return {'body': json.loads(row[0]), 'etag': row[1], 'fetched_at': row[2]}
+
+    def _store(self, key, body, etag):
+        with self._lock:
+            now = time.time()
+            if self._conn is None:
+                self._memory[key] = {'body': body, 'etag': etag, 'fetched_at': now}
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO youtube_responses (key, body, etag, fetched_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(body), etag, now)
+                )
+                self._conn.execute("""
+                    DELETE FROM youtube_responses WHERE key IN (
+                        SELECT key FROM youtube_responses ORDER BY fetched_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ YouTube cache write failed: {e}")
+
+    def _charge(self, units):
+        """Record quota spent on a call (before it is made, so concurrent callers see it)"""
+        with self._lock:
+            self._roll_day()
+            self._used += units
+            self._save_ledger()
+
+    def _exhaust(self):
+        """The API says the quota is gone, whatever our ledger thinks"""
+        with self._lock:
+            self._roll_day()
+            self._used = max(self._used, self.daily_quota)
+            self._save_ledger()
+
+    def _roll_day(self):
+        """Start a new ledger at the quota reset (lock held)"""
+        day = _quota_day()
+        if day != self._day:
+            self._day = day
+            self._used = 0
+
+    def _save_ledger(self):
+        """Persist today's usage (lock held)"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO youtube_quota (day, units) VALUES (?, ?)", (self._day, self._used)
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ YouTube quota ledger write failed: {e}")
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
@@ -3,13 +3,44 @@ YouTube Video Review Scraper using YouTube Data API v3
 Extracts video comments and metadata for product reviews
 """
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httplib2
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from datetime import datetime
+from client_registry import get_client, register_client, report_client_failure
+from youtube_cache import YouTubeQuotaExhausted, YouTubeResponseCache
 
 load_dotenv()
 
+YOUTUBE_MAX_WORKERS = int(os.getenv('YOUTUBE_MAX_WORKERS', '5'))  # Concurrent commentThreads requests
+
+# Cached API responses and the daily quota ledger (search.list costs 100 units, the rest 1)
+youtube_cache = YouTubeResponseCache(
+    os.getenv('YOUTUBE_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'youtube_cache.db')),
+    ttls={
+        'youtube.search.list': int(os.getenv('YOUTUBE_CACHE_TTL_SEARCH', '21600')),
+        'youtube.videos.list': int(os.getenv('YOUTUBE_CACHE_TTL_VIDEOS', '3600')),
+        'youtube.commentThreads.list': int(os.getenv('YOUTUBE_CACHE_TTL_COMMENTS', '1800'))
+    },
+    daily_quota=int(os.getenv('YOUTUBE_DAILY_QUOTA', '10000')),
+    reserve=float(os.getenv('YOUTUBE_QUOTA_RESERVE', '0.1'))
+)
+
+_thread_local = threading.local()
+
+def _thread_http():
+    """One httplib2.Http per worker thread (googleapiclient requests can't share one across threads)"""
+    if not hasattr(_thread_local, 'http'):
+        _thread_local.http = httplib2.Http(timeout=30)
+    return _thread_local.http
+
+def _execute(request):
+    """Execute through the response cache, on this thread's connection"""
+    return youtube_cache.execute(request, http=_thread_http())
+
 def setup_youtube():
     """Initialize YouTube API client"""
     api_key = os.getenv('YOUTUBE_API_KEY')
@@ -17,34 +48,39 @@ def setup_youtube():
     if not api_key:
         raise ValueError("YouTube API key not found in .env file")
     
-    return build('youtube', 'v3', developerKey=api_key)
+    # Bundled discovery document: no network round trip to build the client
+    return build('youtube', 'v3', developerKey=api_key, static_discovery=True, cache_discovery=False)
+
+# One client per process, shared by all requests (built on first use)
+register_client('youtube', lambda: setup_youtube())
 
-def scrape_youtube_reviews(query, max_reviews=50):
+def scrape_youtube_reviews(query, max_reviews=50, on_review=None):
     """
     Search YouTube for product review videos and extract comments
     
     Args:
         query: Search term (e.g., "Dr Martens 1460 boots review")
         max_reviews: Maximum number of comments to collect
+        on_review: Optional callback called with each review as soon as it is scraped
     
     Returns:
         List of review dictionaries with video metadata and comments
     """
     try:
-        youtube = setup_youtube()
+        youtube = get_client('youtube')
         reviews = []
         
         print(f"🎥 Searching YouTube for: {query}")
         
         # Search for relevant videos
-        search_response = youtube.search().list(
+        search_response = _execute(youtube.search().list(
             q=query + " review",
             part='id,snippet',
             type='video',
             maxResults=10,  # Get top 10 videos
             order='relevance',
             relevanceLanguage='en'
-        ).execute()
+        ))
         
         video_ids = []
         for item in search_response.get('items', []):
@@ -56,74 +92,120 @@ def scrape_youtube_reviews(query, max_reviews=50):
         
         print(f"✅ Found {len(video_ids)} YouTube videos")
         
-        # Get comments from each video
-        comments_collected = 0
-        for video_id in video_ids:
-            if comments_collected >= max_reviews:
-                break
-            
+        # One videos().list call for every video's title/channel/statistics
+        video_response = _execute(youtube.videos().list(
+            part='snippet,statistics',
+            id=','.join(video_ids),
+            maxResults=len(video_ids)
+        ))
+        videos = {}
+        for video_info in video_response.get('items', []):
+            videos[video_info['id']] = {
+                'video_title': video_info['snippet']['title'],
+                'video_url': f"https://www.youtube.com/watch?v={video_info['id']}",
+                'channel': video_info['snippet']['channelTitle'],
+                'video_views': int(video_info['statistics'].get('viewCount', 0)),
+                'video_likes': int(video_info['statistics'].get('likeCount', 0))
+            }
+        video_ids = [video_id for video_id in video_ids if video_id in videos]
+        if not video_ids:
+            return reviews
+        
+        # Comment threads for all videos concurrently, shared fairly between the videos
+        def fetch_comments(video_id, page_token):
+            """One page of a video's comment threads; returns (comments long enough to keep, next page token)"""
             try:
-                # Get video details
-                video_response = youtube.videos().list(
-                    part='snippet,statistics',
-                    id=video_id
-                ).execute()
-                
-                if not video_response['items']:
-                    continue
-                
-                video_info = video_response['items'][0]
-                video_title = video_info['snippet']['title']
-                video_url = f"https://www.youtube.com/watch?v={video_id}"
-                channel_title = video_info['snippet']['channelTitle']
-                view_count = int(video_info['statistics'].get('viewCount', 0))
-                like_count = int(video_info['statistics'].get('likeCount', 0))
-                
-                # Get comments from this video
-                comments_response = youtube.commentThreads().list(
+                comments_response = _execute(youtube.commentThreads().list(
                     part='snippet',
                     videoId=video_id,
-                    maxResults=min(10, max_reviews - comments_collected),
+                    maxResults=min(100, max_reviews),
                     order='relevance',
-                    textFormat='plainText'
-                ).execute()
-                
-                for item in comments_response.get('items', []):
-                    comment = item['snippet']['topLevelComment']['snippet']
-                    
-                    # Only include comments with meaningful length
-                    comment_text = comment['textDisplay']
-                    if len(comment_text) < 30:
-                        continue
-                    
-                    reviews.append({
-                        'author': comment['authorDisplayName'],
-                        'text': comment_text,
-                        'date': comment['publishedAt'][:10],
-                        'rating': 0,  # YouTube doesn't have star ratings
-                        'likes': comment.get('likeCount', 0),
-                        'video_title': video_title,
-                        'video_url': video_url,
-                        'channel': channel_title,
-                        'video_views': view_count,
-                        'video_likes': like_count,
-                        'source': 'youtube'
-                    })
-                    
-                    comments_collected += 1
-                    if comments_collected >= max_reviews:
-                        break
-                
+                    textFormat='plainText',
+                    pageToken=page_token
+                ))
+            except YouTubeQuotaExhausted as e:
+                print(f"⚠️ Skipping comments for video {video_id}: {e}")
+                return [], None
             except HttpError as e:
                 if 'commentsDisabled' in str(e):
                     print(f"⚠️ Comments disabled for video {video_id}")
                 else:
                     print(f"❌ Error fetching comments for video {video_id}: {e}")
-                continue
+                return [], None
+            
+            page = []
+            for item in comments_response.get('items', []):
+                comment = item['snippet']['topLevelComment']['snippet']
+                
+                # Only include comments with meaningful length
+                comment_text = comment['textDisplay']
+                if len(comment_text) < 30:
+                    continue
+                
+                page.append({
+                    'comment_id': item.get('id'),
+                    'author': comment['authorDisplayName'],
+                    'text': comment_text,
+                    'date': comment['publishedAt'][:10],
+                    'rating': 0,  # YouTube doesn't have star ratings
+                    'likes': comment.get('likeCount', 0),
+                    **videos[video_id],
+                    'source': 'youtube'
+                })
+            return page, comments_response.get('nextPageToken')
+        
+        comments = {video_id: [] for video_id in video_ids}
+        # Every video's first max_reviews // len(video_ids) comments are kept whatever the
+        # others return, so they can be streamed as soon as they arrive
+        fair_share = max_reviews // len(video_ids)
+        lock = threading.Lock()
+        
+        def fetch_page(video_id, page_token):
+            page, next_token = fetch_comments(video_id, page_token)
+            with lock:
+                kept = len(comments[video_id])
+                comments[video_id].extend(page)
+                if on_review:
+                    for review in page[:max(0, fair_share - kept)]:
+                        on_review(review)
+            return next_token
+        
+        # First page of every video, then further pages of the top-ranked videos until there are enough
+        next_pages = {video_id: None for video_id in video_ids}  # Video -> page token still to read, in rank order
+        first_round = True
+        with ThreadPoolExecutor(max_workers=min(YOUTUBE_MAX_WORKERS, len(video_ids))) as executor:
+            while next_pages and (first_round or sum(map(len, comments.values())) < max_reviews):
+                batch = list(next_pages.items())
+                if not first_round:
+                    batch = batch[:YOUTUBE_MAX_WORKERS]
+                first_round = False
+                futures = [executor.submit(fetch_page, video_id, page_token) for video_id, page_token in batch]
+                for (video_id, _), future in zip(batch, futures):
+                    next_token = future.result()
+                    if next_token:
+                        next_pages[video_id] = next_token
+                    else:
+                        del next_pages[video_id]
+        
+        # Round-robin in rank order (each video's first comment, then each one's second, ...),
+        # returned grouped by video as in the search results
+        selected = sorted(((index, rank, review) for rank, video_id in enumerate(video_ids)
+                           for index, review in enumerate(comments[video_id])), key=lambda entry: entry[:2])
+        selected = sorted(selected[:max_reviews], key=lambda entry: (entry[1], entry[0]))
+        reviews = [review for _, _, review in selected]
+        if on_review:
+            for index, _, review in selected:
+                if index >= fair_share:
+                    on_review(review)
         
         print(f"✅ Successfully scraped {len(reviews)} YouTube comments")
         return reviews
         
+    except HttpError as e:
+        print(f"❌ Error scraping YouTube: {e}")
+        if e.resp.status in (401, 403):
+            report_client_failure('youtube')  # Rebuild with the current key next time
+        return []
     except Exception as e:
         print(f"❌ Error scraping YouTube: {e}")
         import traceback